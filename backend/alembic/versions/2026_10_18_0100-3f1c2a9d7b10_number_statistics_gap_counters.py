@@ -0,0 +1,57 @@
+"""number statistics gap counters
+
+Adds the running counters used by incremental statistics updates
+(average_delay = gap_sum / gap_count) and recovers them from the stored
+frequency and average, like the Django migration 0002. Columns already
+present (databases created from the current models) are left alone.
+
+Revision ID: 3f1c2a9d7b10
+Revises:
+Create Date: 2026-10-18 01:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+COLUMNS = ('gap_sum', 'gap_count')
+
+
+def _missing_columns():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('number_statistics'):
+        return []
+    existing = {column['name'] for column in inspector.get_columns('number_statistics')}
+    return [name for name in COLUMNS if name not in existing]
+
+
+def upgrade() -> None:
+    missing = _missing_columns()
+    if not missing:
+        return
+    for name in missing:
+        op.add_column(
+            'number_statistics',
+            sa.Column(name, sa.Integer(), nullable=False, server_default='0'),
+        )
+
+    # gap_count = frequency - 1 appearances apart; gap_sum = average * count
+    op.execute(
+        """
+        UPDATE number_statistics
+        SET gap_count = CASE WHEN frequency > 1 THEN frequency - 1 ELSE 0 END,
+            gap_sum = CAST(ROUND(COALESCE(average_delay, 0)
+                * CASE WHEN frequency > 1 THEN frequency - 1 ELSE 0 END) AS INTEGER)
+        """
+    )
+
+
+def downgrade() -> None:
+    for name in COLUMNS:
+        op.drop_column('number_statistics', name)
@@ -0,0 +1,81 @@
+"""number masks
+
+Adds the bitmask words stored next to the numbers JSON of draws and user
+combinations and backfills them for existing rows, like the Django
+migration 0003. Rows are recomputed in batches with the same encoder the
+models use, so bitmask filters also see data written before this change.
+
+Revision ID: 8e4d6b2c5a31
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-18 01:10:00
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+from lottery_engine import encode_words
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4d6b2c5a31'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+TABLES = ('draw', 'user_combination')
+COLUMNS = ('numbers_mask_low', 'numbers_mask_high')
+BATCH_SIZE = 1000
+
+
+def backfill_masks(connection, table_name: str) -> None:
+    """Recompute both mask words of every row of a table"""
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer),
+        sa.column('numbers', sa.JSON),
+        sa.column('numbers_mask_low', sa.BigInteger),
+        sa.column('numbers_mask_high', sa.BigInteger),
+    )
+    rows = connection.execute(sa.select(table.c.id, table.c.numbers)).all()
+    statement = (
+        table.update()
+        .where(table.c.id == sa.bindparam('row_id'))
+        .values(
+            numbers_mask_low=sa.bindparam('low'),
+            numbers_mask_high=sa.bindparam('high'),
+        )
+    )
+    for start in range(0, len(rows), BATCH_SIZE):
+        params = []
+        for row_id, numbers in rows[start:start + BATCH_SIZE]:
+            if isinstance(numbers, str):
+                numbers = json.loads(numbers)
+            low, high = encode_words(numbers or [])
+            params.append({'row_id': row_id, 'low': low, 'high': high})
+        connection.execute(statement, params)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    for table_name in TABLES:
+        if not inspector.has_table(table_name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table_name)}
+        missing = [name for name in COLUMNS if name not in existing]
+        if not missing:
+            continue
+        for name in missing:
+            op.add_column(
+                table_name,
+                sa.Column(name, sa.BigInteger(), nullable=False, server_default='0'),
+            )
+        backfill_masks(connection, table_name)
+
+
+def downgrade() -> None:
+    for table_name in TABLES:
+        for name in COLUMNS:
+            op.drop_column(table_name, name)
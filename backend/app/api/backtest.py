@@ -0,0 +1,39 @@
+"""
+Endpoints da API de Backtesting
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.workers import WorkerPoolError
+from app.db.session import get_db
+from app.services import BacktestService
+from app.schemas import BacktestRequest, BacktestResponse
+
+router = APIRouter()
+
+
+@router.post("/", response_model=BacktestResponse)
+async def run_backtest(
+    request: BacktestRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Avaliar estratégias de geração contra o histórico de sorteios
+    
+    The replay runs on the CPU worker pool (and fans out to its own
+    processes); 429 when the pool is saturated, 504 on timeout.
+    """
+    try:
+        return await BacktestService.run_backtest(
+            db=db,
+            lottery_type=request.lottery_type,
+            numbers_count=request.numbers_count,
+            games_per_contest=request.games_per_contest,
+            strategies=request.strategies,
+            warmup=request.warmup,
+            seed=request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except WorkerPoolError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,23 +1,39 @@
 """
 Endpoints da API de Conferidor
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.workers import WorkerPoolError
 from app.db.session import get_db
 from app.services import ResultCheckerService
-from app.schemas import CheckerRequest, CheckerResponse
+from app.services.checker import InvalidCombinationError
+from app.schemas import (
+    CheckerRequest,
+    CheckerResponse,
+    BetOddsResponse,
+    BatchCheckerRequest,
+    BatchCheckerResponse,
+    HistoryCheckerRequest,
+    HistoryCheckerResponse,
+)
+from typing import List, Optional
+import json
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 
 @router.post("/check", response_model=CheckerResponse)
 async def check_combination(
     request: CheckerRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Conferir combinação contra resultados de sorteios"""
     try:
-        result = ResultCheckerService.check_combination(
+        result = await ResultCheckerService.check_combination(
             db=db,
             lottery_type=request.lottery_type,
             numbers=request.numbers,
@@ -26,3 +42,116 @@ async def check_combination(
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _read_ndjson_combinations(request: Request) -> List[List[int]]:
+    """Ler combinações de um corpo NDJSON (uma lista ou {"numbers": [...]} por linha)"""
+    combinations = []
+    buffer = b""
+    
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                combinations.append(_parse_ndjson_line(line))
+        if len(combinations) > settings.CHECKER_MAX_BATCH_SIZE:
+            raise HTTPException(status_code=413, detail="Lote de combinações muito grande")
+    
+    if buffer.strip():
+        combinations.append(_parse_ndjson_line(buffer))
+    
+    return combinations
+
+
+def _parse_ndjson_line(line: bytes) -> List[int]:
+    try:
+        item = json.loads(line)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Linha NDJSON inválida")
+    
+    numbers = item.get("numbers") if isinstance(item, dict) else item
+    if not isinstance(numbers, list) or not all(isinstance(n, int) and not isinstance(n, bool) for n in numbers):
+        raise HTTPException(status_code=400, detail="Cada linha deve conter uma lista de números")
+    return numbers
+
+
+@router.post("/check-batch", response_model=BatchCheckerResponse)
+async def check_batch(
+    request: Request,
+    lottery_type: Optional[str] = None,
+    contest_number: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Conferir um lote de combinações contra um único sorteio
+    
+    Aceita JSON (BatchCheckerRequest) ou NDJSON (Content-Type
+    application/x-ndjson, uma combinação por linha, com lottery_type e
+    contest_number na query string).
+    """
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        if not lottery_type:
+            raise HTTPException(status_code=400, detail="lottery_type é obrigatório para NDJSON")
+        combinations = await _read_ndjson_combinations(request)
+    else:
+        try:
+            payload = BatchCheckerRequest.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+        lottery_type = payload.lottery_type
+        contest_number = payload.contest_number
+        combinations = payload.combinations
+    
+    if not combinations:
+        raise HTTPException(status_code=400, detail="Nenhuma combinação enviada")
+    if len(combinations) > settings.CHECKER_MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail="Lote de combinações muito grande")
+    
+    try:
+        return await ResultCheckerService.check_batch(
+            db=db,
+            lottery_type=lottery_type,
+            combinations=combinations,
+            contest_number=contest_number
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except WorkerPoolError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/check-history", response_model=HistoryCheckerResponse)
+async def check_history(
+    request: HistoryCheckerRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Conferir combinações contra todos os sorteios da loteria"""
+    try:
+        return await ResultCheckerService.check_history(
+            db=db,
+            lottery_type=request.lottery_type,
+            combinations=request.combinations
+        )
+    except InvalidCombinationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except WorkerPoolError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/odds/{lottery_type}", response_model=BetOddsResponse)
+async def get_bet_odds(
+    lottery_type: str,
+    bet_size: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Probabilidades exatas de cada faixa de prêmio para um tamanho de aposta"""
+    try:
+        return await ResultCheckerService.bet_odds(db, lottery_type, bet_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,89 +1,113 @@
 """
 Endpoints da API de Combinações de Usuário
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select
 from app.db.session import get_db
 from app.models import UserCombination
-from app.schemas import UserCombination as UserCombinationSchema, UserCombinationCreate
-from typing import List
+from app.schemas import (
+    UserCombination as UserCombinationSchema,
+    UserCombinationCreate,
+    RankedUserCombination,
+)
+from lottery_engine import rank_combination
+from typing import List, Literal, Union
+
+CombinationEncoding = Literal["numbers", "rank"]
+
+
+def _encode(combination: UserCombination, encoding: CombinationEncoding):
+    """Serializar a combinação com os números em lista ou como rank"""
+    if encoding == "numbers":
+        return combination
+    return RankedUserCombination(
+        id=combination.id,
+        lottery_type=combination.lottery_type,
+        name=combination.name or "",
+        rank=rank_combination(combination.numbers),
+        numbers_count=len(combination.numbers),
+        is_favorite=bool(combination.is_favorite),
+        session_key=combination.session_key,
+        created_at=combination.created_at,
+    )
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[UserCombinationSchema])
+@router.get("/", response_model=List[Union[UserCombinationSchema, RankedUserCombination]])
 async def list_combinations(
     lottery_type: str = None,
     session_key: str = None,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    encoding: CombinationEncoding = Query("numbers"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Listar combinações do usuário"""
-    query = db.query(UserCombination)
+    query = select(UserCombination)
     
     if lottery_type:
-        query = query.filter(UserCombination.lottery_type == lottery_type)
+        query = query.where(UserCombination.lottery_type == lottery_type)
     
     if session_key:
-        query = query.filter(UserCombination.session_key == session_key)
+        query = query.where(UserCombination.session_key == session_key)
     
-    combinations = query.order_by(desc(UserCombination.created_at)).limit(limit).all()
-    return combinations
+    combinations = (await db.scalars(
+        query.order_by(desc(UserCombination.created_at)).limit(limit)
+    )).all()
+    return [_encode(combination, encoding) for combination in combinations]
 
 
 @router.post("/", response_model=UserCombinationSchema)
 async def create_combination(
     combination: UserCombinationCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Criar uma nova combinação de usuário"""
     db_combination = UserCombination(**combination.model_dump())
     db.add(db_combination)
-    db.commit()
-    db.refresh(db_combination)
+    await db.commit()
+    await db.refresh(db_combination)
     return db_combination
 
 
-@router.get("/{combination_id}", response_model=UserCombinationSchema)
-async def get_combination(combination_id: int, db: Session = Depends(get_db)):
+@router.get("/{combination_id}", response_model=Union[UserCombinationSchema, RankedUserCombination])
+async def get_combination(
+    combination_id: int,
+    encoding: CombinationEncoding = Query("numbers"),
+    db: AsyncSession = Depends(get_db)
+):
     """Obter combinação específica"""
-    combination = db.query(UserCombination).filter(
-        UserCombination.id == combination_id
-    ).first()
+    combination = await db.get(UserCombination, combination_id)
     
     if not combination:
         raise HTTPException(status_code=404, detail="Combinação não encontrada")
     
-    return combination
+    return _encode(combination, encoding)
 
 
 @router.delete("/{combination_id}")
-async def delete_combination(combination_id: int, db: Session = Depends(get_db)):
+async def delete_combination(combination_id: int, db: AsyncSession = Depends(get_db)):
     """Excluir uma combinação"""
-    combination = db.query(UserCombination).filter(
-        UserCombination.id == combination_id
-    ).first()
+    combination = await db.get(UserCombination, combination_id)
     
     if not combination:
         raise HTTPException(status_code=404, detail="Combinação não encontrada")
     
-    db.delete(combination)
-    db.commit()
+    await db.delete(combination)
+    await db.commit()
     return {"message": "Combinação excluída com sucesso"}
 
 
 @router.put("/{combination_id}/favorite")
-async def toggle_favorite(combination_id: int, db: Session = Depends(get_db)):
+async def toggle_favorite(combination_id: int, db: AsyncSession = Depends(get_db)):
     """Alternar status de favorito"""
-    combination = db.query(UserCombination).filter(
-        UserCombination.id == combination_id
-    ).first()
+    combination = await db.get(UserCombination, combination_id)
     
     if not combination:
         raise HTTPException(status_code=404, detail="Combinação não encontrada")
     
     combination.is_favorite = not combination.is_favorite
-    db.commit()
-    db.refresh(combination)
+    await db.commit()
+    await db.refresh(combination)
     return combination
@@ -1,11 +1,26 @@
 """
 Endpoints da API de Gerador
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.workers import WorkerPoolBusy, WorkerPoolError, cpu_pool
 from app.db.session import get_db
-from app.services import CombinationGeneratorService
-from app.schemas import GeneratorRequest, GeneratorResponse
+from app.services import CombinationGeneratorService, WheelGeneratorService
+from app.core.config import settings
+from app.schemas import (
+    GeneratorRequest,
+    GeneratorResponse,
+    CountRequest,
+    CountResponse,
+    BulkGeneratorRequest,
+    WheelRequest,
+    WheelResponse,
+)
+from lottery_engine import rank_combinations
+from typing import AsyncIterator, Iterator, List, Literal, Optional
+import numpy as np
 
 router = APIRouter()
 
@@ -13,11 +28,16 @@ router = APIRouter()
 @router.post("/generate", response_model=GeneratorResponse)
 async def generate_combinations(
     request: GeneratorRequest,
-    db: Session = Depends(get_db)
+    encoding: Literal["numbers", "rank"] = Query("numbers"),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Gerar combinações de loteria"""
+    """Gerar combinações de loteria
+    
+    With ?encoding=rank each game is returned as its colex rank; the game
+    size is metadata.numbers_per_game.
+    """
     try:
-        result = CombinationGeneratorService.generate_combinations(
+        result = await CombinationGeneratorService.generate_combinations(
             db=db,
             lottery_type=request.lottery_type,
             numbers_count=request.numbers_count,
@@ -25,11 +45,149 @@ async def generate_combinations(
             fixed_numbers=request.fixed_numbers,
             include_frequent=request.include_frequent,
             include_delayed=request.include_delayed,
-            mix_strategy=request.mix_strategy
+            mix_strategy=request.mix_strategy,
+            mode=request.mode,
+            filters=request.filters.model_dump() if request.filters else None,
+            weighting=request.weighting
         )
+        if encoding == "rank":
+            result["combinations"] = rank_combinations(result["combinations"]).tolist()
+            result["metadata"]["encoding"] = "rank"
         return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except WorkerPoolError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/count", response_model=CountResponse)
+async def count_combinations(
+    request: CountRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Contar quantas combinações atendem aos filtros (soma, ímpares, sequência)"""
+    try:
+        return await CombinationGeneratorService.count_combinations(
+            db=db,
+            lottery_type=request.lottery_type,
+            numbers_count=request.numbers_count,
+            fixed_numbers=request.fixed_numbers,
+            filters=request.filters.model_dump() if request.filters else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _format_ndjson(batch: np.ndarray) -> str:
+    return "".join(f"[{','.join(map(str, game))}]\n" for game in batch.tolist())
+
+
+def _format_csv(batch: np.ndarray) -> str:
+    return "".join(",".join(map(str, game)) + "\n" for game in batch.tolist())
+
+
+# Wait before retrying a chunk of a started stream while the CPU pool is saturated
+BULK_RETRY_SECONDS = 0.05
+
+
+def _next_chunk(batches: Iterator[np.ndarray], output: str) -> Optional[str]:
+    """Generate and format the next batch (None when exhausted)"""
+    batch = next(batches, None)
+    if batch is None:
+        return None
+    return _format_csv(batch) if output == "csv" else _format_ndjson(batch)
+
+
+async def _pull_chunk(batches: Iterator[np.ndarray], output: str) -> Optional[str]:
+    # The iterator cannot be pickled: always on a pool thread, even with a process pool
+    while True:
+        try:
+            return await cpu_pool.run(_next_chunk, batches, output, in_thread=True)
+        except WorkerPoolBusy:
+            # Mid-stream a 429 is no longer possible: slow the stream down instead
+            await asyncio.sleep(BULK_RETRY_SECONDS)
+
+
+async def _stream_games(
+    batches: Iterator[np.ndarray],
+    first: Optional[str],
+    output: str,
+    numbers_count: int
+) -> AsyncIterator[str]:
+    if output == "csv":
+        yield ",".join(f"n{i}" for i in range(1, numbers_count + 1)) + "\n"
+    chunk = first
+    while chunk is not None:
+        yield chunk
+        chunk = await _pull_chunk(batches, output)
+
+
+@router.post("/bulk")
+async def generate_bulk(
+    request: BulkGeneratorRequest,
+    output: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Gerar um grande volume de jogos distintos, transmitidos em NDJSON ou CSV
+    
+    Each batch is generated and formatted on the CPU worker pool. The first
+    one is computed before the response starts, so a saturated pool answers
+    429; later batches wait for a free slot.
+    """
+    if request.games_count > settings.GENERATOR_MAX_BULK_GAMES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Máximo de {settings.GENERATOR_MAX_BULK_GAMES} jogos por requisição"
+        )
+    
+    try:
+        batches = await CombinationGeneratorService.generate_bulk(
+            db=db,
+            lottery_type=request.lottery_type,
+            numbers_count=request.numbers_count,
+            games_count=request.games_count,
+            fixed_numbers=request.fixed_numbers,
+            include_frequent=request.include_frequent,
+            include_delayed=request.include_delayed,
+            mix_strategy=request.mix_strategy,
+            seed=request.seed
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    first = await cpu_pool.run(_next_chunk, batches, output, in_thread=True)
+    media_type = "text/csv" if output == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_games(batches, first, output, request.numbers_count),
+        media_type=media_type
+    )
+
+
+@router.post("/wheel", response_model=WheelResponse)
+async def generate_wheel(
+    request: WheelRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Gerar um fechamento com garantia de acertos
+    
+    The solver runs on the CPU worker pool; 429 when the pool is saturated,
+    504 on timeout.
+    """
+    try:
+        return await WheelGeneratorService.generate_wheel(
+            db=db,
+            lottery_type=request.lottery_type,
+            numbers=request.numbers,
+            guarantee=request.guarantee,
+            if_drawn=request.if_drawn,
+            numbers_per_game=request.numbers_per_game
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except WorkerPoolError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -38,11 +196,11 @@ async def generate_combinations(
 async def validate_combination(
     lottery_type: str,
     numbers: List[int],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Validar uma combinação"""
     try:
-        result = CombinationGeneratorService.validate_combination(
+        result = await CombinationGeneratorService.validate_combination(
             db=db,
             lottery_type=lottery_type,
             numbers=numbers
@@ -1,30 +1,47 @@
 """
 Endpoints da API de Loterias
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.responses import cached_json
+from app.core.security import require_admin_key
+from app.db.session import get_db, get_session_factory
 from app.models import LotteryConfiguration, Draw
-from app.schemas import LotteryConfig
-from typing import List
-from sqlalchemy import desc
+from app.schemas import Draw as DrawSchema, DrawPage, LotteryConfig
+from app.services import DrawIngestService, ExportService
+from lottery_engine import (
+    EXPORT_DATASETS,
+    ExportWriter,
+    IngestError,
+    decode_cursor,
+    keyset_page,
+    scan_descending,
+)
+from typing import List, Literal, Optional
+from sqlalchemy import desc, select
 
 router = APIRouter()
 
+# Largest page served by list_draws
+MAX_DRAWS_PAGE = 100
+
 
 @router.get("/", response_model=List[LotteryConfig])
-async def list_lotteries(db: Session = Depends(get_db)):
+async def list_lotteries(request: Request, db: AsyncSession = Depends(get_db)):
     """Listar todas as configurações de loterias"""
-    lotteries = db.query(LotteryConfiguration).all()
-    return lotteries
+    async def build():
+        return (await db.scalars(select(LotteryConfiguration))).all()
+    
+    return await cached_json(request, build, response_model=List[LotteryConfig])
 
 
 @router.get("/{lottery_type}", response_model=LotteryConfig)
-async def get_lottery(lottery_type: str, db: Session = Depends(get_db)):
+async def get_lottery(lottery_type: str, db: AsyncSession = Depends(get_db)):
     """Obter configuração específica de uma loteria"""
-    lottery = db.query(LotteryConfiguration).filter(
-        LotteryConfiguration.lottery_type == lottery_type
-    ).first()
+    lottery = await db.scalar(
+        select(LotteryConfiguration).where(LotteryConfiguration.lottery_type == lottery_type)
+    )
     
     if not lottery:
         raise HTTPException(status_code=404, detail="Loteria não encontrada")
@@ -32,47 +49,140 @@ async def get_lottery(lottery_type: str, db: Session = Depends(get_db)):
     return lottery
 
 
-@router.get("/{lottery_type}/draws")
+@router.get("/{lottery_type}/draws", response_model=DrawPage)
 async def list_draws(
     lottery_type: str,
-    limit: int = 20,
-    offset: int = 0,
-    db: Session = Depends(get_db)
+    limit: int = Query(20, ge=1, le=MAX_DRAWS_PAGE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
-    """Listar sorteios de uma loteria"""
-    draws = db.query(Draw).filter(
-        Draw.lottery_type == lottery_type
-    ).order_by(desc(Draw.contest_number)).offset(offset).limit(limit).all()
+    """Listar sorteios de uma loteria, paginados por cursor
+    
+    Each page is a range scan on idx_lottery_contest from the cursor's
+    contest, so deep pages cost the same as the first one. Pass the
+    ``next`` / ``prev`` token of a page as ``cursor`` to move on.
+    """
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return draws
+    query = select(Draw).where(Draw.lottery_type == lottery_type)
+    if scan_descending(position):
+        if position is not None:
+            query = query.where(Draw.contest_number < position.contest)
+        query = query.order_by(desc(Draw.contest_number))
+    else:
+        query = query.where(Draw.contest_number > position.contest).order_by(Draw.contest_number)
+    
+    rows = (await db.scalars(query.limit(limit + 1))).all()
+    page = keyset_page(rows, limit, position)
+    return {"items": page.items, "next": page.next_cursor, "prev": page.prev_cursor}
 
 
-@router.get("/{lottery_type}/draws/latest")
-async def get_latest_draw(lottery_type: str, db: Session = Depends(get_db)):
+@router.get("/{lottery_type}/draws/latest", response_model=DrawSchema)
+async def get_latest_draw(request: Request, lottery_type: str, db: AsyncSession = Depends(get_db)):
     """Obter último sorteio de uma loteria"""
-    draw = db.query(Draw).filter(
-        Draw.lottery_type == lottery_type
-    ).order_by(desc(Draw.contest_number)).first()
-    
-    if not draw:
-        raise HTTPException(status_code=404, detail="Nenhum sorteio encontrado")
+    async def build():
+        draw = await db.scalar(
+            select(Draw).where(
+                Draw.lottery_type == lottery_type
+            ).order_by(desc(Draw.contest_number)).limit(1)
+        )
+        
+        if not draw:
+            raise HTTPException(status_code=404, detail="Nenhum sorteio encontrado")
+        
+        return draw
     
-    return draw
+    return await cached_json(request, build, lottery_type=lottery_type, response_model=DrawSchema)
 
 
-@router.get("/{lottery_type}/draws/{contest_number}")
+@router.get("/{lottery_type}/draws/{contest_number}", response_model=DrawSchema)
 async def get_draw(
     lottery_type: str,
     contest_number: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Obter sorteio específico por número do concurso"""
-    draw = db.query(Draw).filter(
-        Draw.lottery_type == lottery_type,
-        Draw.contest_number == contest_number
-    ).first()
+    draw = await db.scalar(
+        select(Draw).where(
+            Draw.lottery_type == lottery_type,
+            Draw.contest_number == contest_number
+        )
+    )
     
     if not draw:
         raise HTTPException(status_code=404, detail="Sorteio não encontrado")
     
     return draw
+
+
+@router.get("/{lottery_type}/export/{dataset}")
+async def export_dataset(
+    lottery_type: str,
+    dataset: Literal["draws", "statistics"],
+    output: Literal["csv", "ndjson", "parquet", "arrow"] = Query("csv", alias="format"),
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory)
+):
+    """Exportar o histórico completo de sorteios ou as estatísticas de uma loteria
+    
+    The body is streamed in chunks read from a server-side cursor, so memory
+    stays constant whatever the history size. Parquet and Arrow need the
+    optional pyarrow package (501 without it).
+    """
+    exists = await db.scalar(
+        select(LotteryConfiguration.id).where(LotteryConfiguration.lottery_type == lottery_type)
+    )
+    if not exists:
+        raise HTTPException(status_code=404, detail="Loteria não encontrada")
+    
+    try:
+        writer = ExportWriter(EXPORT_DATASETS[dataset], output)
+    except ImportError:
+        raise HTTPException(status_code=501, detail=f"Formato {output} indisponível: instale o pacote pyarrow")
+    
+    filename = f"{lottery_type.lower()}_{dataset}.{output}"
+    return StreamingResponse(
+        ExportService.stream(session_factory, lottery_type, dataset, writer),
+        media_type=writer.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/{lottery_type}/draws/import", dependencies=[Depends(require_admin_key)])
+async def import_draws(
+    lottery_type: str,
+    file: UploadFile = File(...),
+    source: Literal["csv", "xlsx"] = Query("csv", alias="format"),
+    strict: bool = True,
+    db: AsyncSession = Depends(get_db)
+):
+    """Importar sorteios de um arquivo oficial de resultados (CSV ou XLSX)
+    
+    Requires the X-API-Key header to match ADMIN_API_KEY (401; 403 while no
+    key is configured). Rows are validated and upserted in batches inside
+    one transaction, then the statistics are refreshed incrementally. With
+    strict=true (default) any invalid row rejects the whole file (400 with
+    the row errors); with strict=false invalid rows are skipped and
+    reported. XLSX needs the optional openpyxl package (501 without it).
+    """
+    exists = await db.scalar(
+        select(LotteryConfiguration.id).where(LotteryConfiguration.lottery_type == lottery_type)
+    )
+    if not exists:
+        raise HTTPException(status_code=404, detail="Loteria não encontrada")
+    
+    try:
+        return await DrawIngestService.ingest(db, lottery_type, file.file, source, strict=strict)
+    except IngestError as e:
+        raise HTTPException(status_code=400, detail={
+            "message": str(e),
+            "error_count": e.report.error_count,
+            "errors": [{"line": line, "message": message} for line, message in e.report.errors],
+        })
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Formato xlsx indisponível: instale o pacote openpyxl")
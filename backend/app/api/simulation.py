@@ -0,0 +1,46 @@
+"""
+Endpoints da API de Simulação
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.workers import WorkerPoolError
+from app.db.session import get_db
+from app.services import SimulationService
+from app.core.config import settings
+from app.schemas import SimulationRequest, SimulationResponse
+
+router = APIRouter()
+
+
+@router.post("/", response_model=SimulationResponse)
+async def simulate(
+    request: SimulationRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Simular sorteios aleatórios contra um conjunto de jogos
+    
+    The simulation runs on the CPU worker pool (and fans out to its own
+    processes); 429 when the pool is saturated, 504 on timeout.
+    """
+    if request.draws > settings.SIMULATION_MAX_DRAWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Máximo de {settings.SIMULATION_MAX_DRAWS} sorteios por requisição"
+        )
+    
+    try:
+        return await SimulationService.simulate(
+            db=db,
+            lottery_type=request.lottery_type,
+            combinations=request.combinations,
+            draws=request.draws,
+            seed=request.seed,
+            prize_values=request.prize_values,
+            ticket_cost=request.ticket_cost
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except WorkerPoolError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,8 +1,9 @@
 """
 Endpoints da API de Estatísticas
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.responses import cached_json
 from app.db.session import get_db
 from app.services import StatisticsService
 from app.schemas import NumberStatistics
@@ -13,42 +14,60 @@ router = APIRouter()
 
 @router.get("/{lottery_type}", response_model=List[NumberStatistics])
 async def get_statistics(
+    request: Request,
     lottery_type: str,
     limit: int = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Obter estatísticas de uma loteria"""
-    stats = StatisticsService.get_statistics(db, lottery_type, limit)
-    return stats
+    return await cached_json(
+        request,
+        lambda: StatisticsService.get_statistics(db, lottery_type, limit),
+        lottery_type=lottery_type,
+        params={"limit": limit},
+        response_model=List[NumberStatistics],
+    )
 
 
 @router.get("/{lottery_type}/frequent", response_model=List[NumberStatistics])
 async def get_most_frequent(
+    request: Request,
     lottery_type: str,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Obter números mais frequentes"""
-    stats = StatisticsService.get_most_frequent(db, lottery_type, limit)
-    return stats
+    return await cached_json(
+        request,
+        lambda: StatisticsService.get_most_frequent(db, lottery_type, limit),
+        lottery_type=lottery_type,
+        params={"limit": limit},
+        response_model=List[NumberStatistics],
+    )
 
 
 @router.get("/{lottery_type}/delayed", response_model=List[NumberStatistics])
 async def get_most_delayed(
+    request: Request,
     lottery_type: str,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Obter números mais atrasados"""
-    stats = StatisticsService.get_most_delayed(db, lottery_type, limit)
-    return stats
+    return await cached_json(
+        request,
+        lambda: StatisticsService.get_most_delayed(db, lottery_type, limit),
+        lottery_type=lottery_type,
+        params={"limit": limit},
+        response_model=List[NumberStatistics],
+    )
 
 
 @router.post("/{lottery_type}/calculate")
-async def calculate_statistics(lottery_type: str, db: Session = Depends(get_db)):
+async def calculate_statistics(lottery_type: str, db: AsyncSession = Depends(get_db)):
     """Recalcular estatísticas de uma loteria"""
     try:
-        StatisticsService.calculate_statistics(db, lottery_type)
+        await StatisticsService.calculate_statistics(db, lottery_type)
         return {"message": f"Estatísticas calculadas para {lottery_type}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
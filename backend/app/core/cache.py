@@ -0,0 +1,42 @@
+"""
+Armazenamento de cache compartilhado entre os workers
+Redis quando REDIS_URL está definido; caso contrário, memória do processo
+"""
+import inspect
+from typing import Any, Optional, Union
+from app.core.config import settings
+from lottery_engine import AsyncRedisStore, MemoryStore
+
+
+def create_cache_store(url: Optional[str] = None) -> Union[AsyncRedisStore, MemoryStore]:
+    """Criar o store de cache para a URL dada (memória do processo quando vazia)"""
+    if not url:
+        return MemoryStore()
+    
+    # Optional dependency: only needed when a shared cache is configured
+    from redis.asyncio import Redis
+    return AsyncRedisStore(Redis.from_url(url), prefix=settings.CACHE_KEY_PREFIX)
+
+
+# Shared by every cache in the API
+cache_store = create_cache_store(settings.REDIS_URL)
+
+
+async def close_cache_store() -> None:
+    """Fechar as conexões com o Redis (no-op para o store em memória)"""
+    if isinstance(cache_store, AsyncRedisStore):
+        await cache_store.close()
+
+
+async def _resolve(value: Any) -> Any:
+    return await value if inspect.isawaitable(value) else value
+
+
+async def cache_get(key: str, default: Any = None) -> Any:
+    """Ler uma chave do store, seja ele síncrono (memória) ou assíncrono (Redis)"""
+    return await _resolve(cache_store.get(key, default))
+
+
+async def cache_set(key: str, value: Any, timeout: Optional[float] = None) -> None:
+    """Gravar uma chave no store, seja ele síncrono (memória) ou assíncrono (Redis)"""
+    await _resolve(cache_store.set(key, value, timeout))
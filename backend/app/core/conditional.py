@@ -0,0 +1,91 @@
+"""
+Requisições condicionais (ETag / Last-Modified) para as rotas de leitura
+O 304 é decidido pela versão dos dados no cache, antes de qualquer consulta ao banco
+"""
+import re
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+from app.core.cache import cache_get
+from app.core.config import settings
+from lottery_engine import validators_key
+
+# Read routes whose responses only change with the lottery's data version
+CONDITIONAL_ROUTES = [
+    re.compile(rf"^{settings.API_V1_STR}/statistics/(?P<lottery_type>[^/]+)(/frequent|/delayed)?/?$"),
+    re.compile(rf"^{settings.API_V1_STR}/lotteries/(?P<lottery_type>[^/]+)/draws(/[^/]+)?/?$"),
+]
+
+
+def _lottery_type(path: str) -> Optional[str]:
+    for route in CONDITIONAL_ROUTES:
+        match = route.match(path)
+        if match:
+            return match.group("lottery_type")
+    return None
+
+
+def _opaque(etag: str) -> str:
+    """Weak comparison: ignore the W/ prefix"""
+    return etag.strip().removeprefix("W/")
+
+
+def is_not_modified(
+    validators: Dict[str, str],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str]
+) -> bool:
+    """Avaliar If-None-Match (prioritário) ou If-Modified-Since contra os validadores (RFC 9110)"""
+    if if_none_match is not None:
+        tags = [tag for tag in if_none_match.split(",") if tag.strip()]
+        return any(tag.strip() == "*" or _opaque(tag) == _opaque(validators["etag"]) for tag in tags)
+
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return parsedate_to_datetime(validators["last_modified"]) <= since
+
+    return False
+
+
+class ConditionalGetMiddleware:
+    """Middleware ASGI que responde 304 para dados inalterados
+
+    Validators are published with the statistics cache. Until a lottery has
+    them (no statistics yet, or a cold cache) requests go through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        lottery_type = _lottery_type(scope["path"])
+        validators = await cache_get(validators_key(lottery_type)) if lottery_type else None
+        if validators is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Reused by the response cache as the data version of this request
+        scope.setdefault("state", {})["validators"] = validators
+        validator_headers: List[tuple] = [
+            (b"etag", validators["etag"].encode("latin-1")),
+            (b"last-modified", validators["last_modified"].encode("latin-1")),
+        ]
+        headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+        if is_not_modified(validators, headers.get("if-none-match"), headers.get("if-modified-since")):
+            await send({"type": "http.response.start", "status": 304, "headers": validator_headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_validators(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message = {**message, "headers": [*message.get("headers", []), *validator_headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_validators)
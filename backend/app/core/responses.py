@@ -0,0 +1,125 @@
+"""
+Cache de respostas pré-serializadas para as rotas de leitura mais acessadas
+Guarda os bytes finais (JSON e versões comprimidas) por rota, parâmetros e versão dos dados
+"""
+import gzip
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.cache import cache_get, cache_set
+from lottery_engine import CACHE_TTLS, validators_key
+
+try:
+    # Optional dependency: brotli is offered only when installed
+    import brotli
+except ImportError:
+    brotli = None
+
+# Smaller bodies are not worth compressing
+MINIMUM_COMPRESS_SIZE = 500
+
+# Encodings in order of preference
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {
+    **({"br": brotli.compress} if brotli is not None else {}),
+    "gzip": lambda body: gzip.compress(body, compresslevel=9, mtime=0),
+}
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def _render(content: Any, response_model: Any = None) -> bytes:
+    """Serializar como o FastAPI faria: validação pelo response_model e JSONResponse"""
+    if response_model is not None:
+        adapter = _adapters.get(response_model)
+        if adapter is None:
+            adapter = _adapters[response_model] = TypeAdapter(response_model)
+        content = adapter.dump_python(
+            adapter.validate_python(content, from_attributes=True), mode="json"
+        )
+    else:
+        content = jsonable_encoder(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def encode_body(body: bytes) -> Dict[str, bytes]:
+    """Corpo em todas as codificações suportadas ("identity" sempre presente)"""
+    encoded = {"identity": body}
+    if len(body) >= MINIMUM_COMPRESS_SIZE:
+        for encoding, compress in COMPRESSORS.items():
+            encoded[encoding] = compress(body)
+    return encoded
+
+
+def choose_encoding(encoded: Dict[str, bytes], accept_encoding: str) -> str:
+    """Melhor codificação disponível aceita pelo cliente"""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name.strip().lower())
+    for encoding in COMPRESSORS:
+        if encoding in encoded and (encoding in accepted or "*" in accepted):
+            return encoding
+    return "identity"
+
+
+def _response(encoded: Dict[str, bytes], request: Request) -> Response:
+    encoding = choose_encoding(encoded, request.headers.get("accept-encoding", ""))
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=encoded[encoding], media_type="application/json", headers=headers)
+
+
+async def _data_version(request: Request, lottery_type: str) -> Optional[str]:
+    # Already read by ConditionalGetMiddleware for the routes it covers
+    validators = getattr(request.state, "validators", None)
+    if validators is None:
+        validators = await cache_get(validators_key(lottery_type))
+    return validators["etag"] if validators is not None else None
+
+
+async def cached_json(
+    request: Request,
+    build: Callable[[], Awaitable[Any]],
+    *,
+    lottery_type: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    response_model: Any = None
+) -> Response:
+    """Responder com bytes prontos do cache, montando-os com `build` em caso de falta
+
+    Lottery routes are keyed by the lottery's data version (its ETag), so a
+    recompute moves them to fresh keys; until a lottery has a version its
+    responses are built every time. Routes without a lottery are cached for a
+    short fixed time. Exceptions from ``build`` (e.g. 404) are not cached.
+
+    Args:
+        request: Incoming request (path and Accept-Encoding)
+        build: Coroutine producing the response content
+        lottery_type: Lottery whose data the response depends on
+        params: Query parameters that change the response
+        response_model: Model used to validate and serialize the content once
+    """
+    query = urlencode(sorted((params or {}).items()))
+    if lottery_type is not None:
+        version = await _data_version(request, lottery_type)
+        timeout = CACHE_TTLS["responses"]
+    else:
+        version, timeout = "static", CACHE_TTLS["static_responses"]
+
+    key = f"responses:{request.url.path}?{query}@{version}"
+    encoded = await cache_get(key) if version is not None else None
+    if encoded is None:
+        encoded = encode_body(_render(await build(), response_model))
+        if version is not None:
+            await cache_set(key, encoded, timeout)
+
+    return _response(encoded, request)
@@ -0,0 +1,27 @@
+"""
+Autenticação dos endpoints administrativos
+Chave de API enviada no cabeçalho X-API-Key e comparada com ADMIN_API_KEY
+"""
+import secrets
+from typing import Optional
+from fastapi import HTTPException, Security
+from fastapi.security import APIKeyHeader
+from app.core.config import settings
+
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+
+async def require_admin_key(api_key: Optional[str] = Security(api_key_header)) -> None:
+    """Dependency for endpoints that write official data
+
+    Without ADMIN_API_KEY configured the endpoints are disabled (403), so
+    data can only be loaded with the management commands.
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=403, detail="Operação administrativa desativada neste servidor")
+    if not api_key or not secrets.compare_digest(api_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Chave de API inválida ou ausente",
+            headers={"WWW-Authenticate": "X-API-Key"},
+        )
@@ -0,0 +1,155 @@
+"""
+Pool de execução para trabalho pesado de CPU
+Mantém o event loop livre: as tarefas rodam em threads ou processos, com fila limitada e timeout
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from lottery_engine import configure_processes
+
+POOL_KINDS = ("thread", "process")
+
+
+class WorkerPoolError(Exception):
+    """Falha de admissão ou de execução no pool, com o status HTTP correspondente"""
+    status_code = 503
+
+
+class WorkerPoolBusy(WorkerPoolError):
+    """Pool e fila cheios: o cliente deve tentar novamente mais tarde"""
+    status_code = 429
+
+
+class WorkerTaskTimeout(WorkerPoolError):
+    """A tarefa não terminou dentro do tempo limite"""
+    status_code = 504
+
+
+class WorkerPool:
+    """Executor limitado para chamadas síncronas e pesadas de CPU
+
+    At most ``size`` tasks run at once and ``queue_depth`` more may wait;
+    beyond that ``run`` fails fast with ``WorkerPoolBusy`` instead of letting
+    requests pile up. A task that times out keeps its slot until it actually
+    stops (threads cannot be interrupted), so saturation reflects real load.
+
+    With ``kind="process"`` the function and its arguments must be picklable
+    (module-level functions, plain data and NumPy arrays).
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        size: Optional[int] = None,
+        queue_depth: int = 32,
+        timeout: float = 60.0
+    ):
+        if kind not in POOL_KINDS:
+            raise ValueError(f"Tipo de pool desconhecido: {kind} (use {', '.join(POOL_KINDS)})")
+        self.kind = kind
+        self.size = size or os.cpu_count() or 1
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._threads: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def capacity(self) -> int:
+        """Tarefas aceitas ao mesmo tempo (executando + na fila)"""
+        return self.size + self.queue_depth
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _executor(self, in_thread: bool) -> Executor:
+        with self._lock:
+            if self.kind == "process" and not in_thread:
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(max_workers=self.size)
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="cpu-worker")
+            return self._threads
+
+    def _release(self, _future: Optional[Future] = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        in_thread: bool = False,
+        cancellable: bool = False,
+        **kwargs: Any
+    ) -> Any:
+        """Executar `func(*args, **kwargs)` no pool e aguardar o resultado
+
+        Args:
+            func: Synchronous callable
+            timeout: Seconds to wait (default: the pool's timeout)
+            in_thread: Run on a thread even in a process pool, for tasks
+                that fan out to their own worker processes or work on
+                objects that cannot be pickled (live iterators)
+            cancellable: Pass `cancel=threading.Event()` to `func` and set it
+                when the caller stops waiting (timeout or cancellation),
+                so the task can stop between chunks and free its slot
+
+        Raises:
+            WorkerPoolBusy: No free slot in the pool or its queue
+            WorkerTaskTimeout: The task did not finish in time
+        """
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                raise WorkerPoolBusy("Servidor ocupado; tente novamente em instantes")
+            self._in_flight += 1
+
+        cancel = threading.Event() if cancellable else None
+        if cancel is not None:
+            kwargs["cancel"] = cancel
+        try:
+            future = self._executor(in_thread).submit(func, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            # Only frees the slot if the task had not started yet
+            future.cancel()
+            raise WorkerTaskTimeout("Tempo limite de processamento excedido")
+        finally:
+            # A running cancellable task stops at its next check
+            if cancel is not None and not future.done():
+                cancel.set()
+
+    def shutdown(self) -> None:
+        """Encerrar os executores, descartando tarefas ainda na fila"""
+        with self._lock:
+            executors = [self._processes, self._threads]
+            self._processes = self._threads = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Shared by every CPU-bound service call
+cpu_pool = WorkerPool(
+    kind=settings.WORKER_POOL_KIND,
+    size=settings.WORKER_POOL_SIZE,
+    queue_depth=settings.WORKER_QUEUE_DEPTH,
+    timeout=settings.WORKER_TASK_TIMEOUT_SECONDS,
+)
+
+# Processes the backtest and simulation engines fan out to, shared across requests
+configure_processes(settings.PROCESS_POOL_SIZE)
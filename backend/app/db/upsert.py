@@ -0,0 +1,65 @@
+"""
+Bulk upsert helper shared by the statistics and ingestion services
+"""
+from typing import Any, Dict, List, Sequence
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Dialects whose INSERT supports ON CONFLICT DO UPDATE
+UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+async def upsert_rows(
+    db: AsyncSession,
+    model,
+    rows: List[Dict[str, Any]],
+    index_elements: Sequence[str],
+    update_fields: Sequence[str],
+    touch: str = None
+) -> None:
+    """Inserir ou atualizar linhas pela chave única `index_elements` (sem commit)
+
+    PostgreSQL and SQLite use one INSERT ... ON CONFLICT DO UPDATE. Other
+    dialects read the ids of the keys already stored, then run one bulk
+    INSERT for the new rows and one bulk UPDATE by primary key for the rest.
+    `touch` names a timestamp column set to now() on update.
+    """
+    if not rows:
+        return
+
+    insert = UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(model).values(rows)
+        set_ = {field: stmt.excluded[field] for field in update_fields}
+        if touch:
+            set_[touch] = func.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[getattr(model, field) for field in index_elements],
+            set_=set_,
+        )
+        await db.execute(stmt)
+        return
+
+    # Portable path: narrow the lookup with one IN per key column, match exactly in Python
+    columns = [getattr(model, field) for field in index_elements]
+    query = select(model.id, *columns)
+    for column, field in zip(columns, index_elements):
+        query = query.where(column.in_({row[field] for row in rows}))
+    existing = {tuple(found[1:]): found[0] for found in await db.execute(query)}
+
+    new_rows, changed_rows = [], []
+    for row in rows:
+        key = tuple(row[field] for field in index_elements)
+        if key in existing:
+            changed_rows.append({"id": existing[key], **{field: row[field] for field in update_fields}})
+        else:
+            new_rows.append(row)
+    if new_rows:
+        await db.execute(model.__table__.insert(), new_rows)
+    if changed_rows:
+        # Bulk UPDATE by primary key; onupdate columns (`touch`) are refreshed by the ORM
+        await db.execute(update(model), changed_rows)
@@ -1,15 +1,32 @@
 """
 FastAPI main application for Lotofácil Web
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from app.core.cache import close_cache_store
+from app.core.conditional import ConditionalGetMiddleware
 from app.core.config import settings
-from app.api import lotteries, statistics, generator, checker, combinations
+from app.core.workers import WorkerPoolBusy, WorkerPoolError, cpu_pool
+from app.api import lotteries, statistics, generator, checker, combinations, backtest, simulation
+from lottery_engine import shutdown_processes
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Encerrar os pools de CPU e o cache junto com a aplicação"""
+    yield
+    cpu_pool.shutdown()
+    shutdown_processes()
+    await close_cache_store()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="API moderna para análise de loterias e geração de números",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -21,12 +38,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 304 Not Modified for statistics and draws whose data version has not changed
+app.add_middleware(ConditionalGetMiddleware)
+
+
+@app.exception_handler(WorkerPoolError)
+async def worker_pool_error_handler(request: Request, exc: WorkerPoolError):
+    """Pool de CPU saturado (429) ou tarefa expirada (504)"""
+    headers = {"Retry-After": "1"} if isinstance(exc, WorkerPoolBusy) else None
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)}, headers=headers)
+
+
 # Include routers
 app.include_router(lotteries.router, prefix="/api/lotteries", tags=["lotteries"])
 app.include_router(statistics.router, prefix="/api/statistics", tags=["statistics"])
 app.include_router(generator.router, prefix="/api/generator", tags=["generator"])
 app.include_router(checker.router, prefix="/api/checker", tags=["checker"])
 app.include_router(combinations.router, prefix="/api/combinations", tags=["combinations"])
+app.include_router(backtest.router, prefix="/api/backtest", tags=["backtest"])
+app.include_router(simulation.router, prefix="/api/simulation", tags=["simulation"])
 
 
 @app.get("/")
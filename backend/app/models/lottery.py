@@ -2,13 +2,39 @@
 Modelos SQLAlchemy para aplicação de loteria
 Migrados dos modelos Django
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, Text, Numeric, Index, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Boolean, Date, DateTime, Text, Numeric, Index, ForeignKey, JSON
+from sqlalchemy import and_
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.db.session import Base
+from lottery_engine import encode_words, join_mask
 import enum
 
 
+class NumbersMaskMixin:
+    """Bitmask das dezenas (bit n-1 = número n) mantida junto à coluna JSON"""
+    numbers_mask_low = Column(BigInteger, nullable=False, default=0, server_default="0")
+    numbers_mask_high = Column(BigInteger, nullable=False, default=0, server_default="0")
+    
+    @validates("numbers")
+    def _update_numbers_mask(self, key, numbers):
+        self.numbers_mask_low, self.numbers_mask_high = encode_words(numbers or [])
+        return numbers
+    
+    @property
+    def numbers_mask(self) -> int:
+        return join_mask(self.numbers_mask_low or 0, self.numbers_mask_high or 0)
+    
+    @classmethod
+    def contains_numbers(cls, numbers):
+        """SQL filter for rows containing all ``numbers`` (bitwise AND, no JSON parsing)"""
+        low, high = encode_words(numbers)
+        return and_(
+            cls.numbers_mask_low.op("&")(low) == low,
+            cls.numbers_mask_high.op("&")(high) == high,
+        )
+
+
 class LotteryType(str, enum.Enum):
     """Tipos de loteria suportados pelo sistema"""
     MEGA_SENA = "MEGA_SENA"
@@ -35,7 +61,7 @@ class LotteryConfiguration(Base):
         return f"<LotteryConfiguration {self.lottery_type}>"
 
 
-class Draw(Base):
+class Draw(NumbersMaskMixin, Base):
     """Resultados históricos de sorteios/concursos"""
     __tablename__ = "draw"
     
@@ -73,6 +99,9 @@ class NumberStatistics(Base):
     delay = Column(Integer, default=0)
     max_delay = Column(Integer, default=0)
     average_delay = Column(Float, default=0.0)
+    # Running counters for incremental updates (average_delay = gap_sum / gap_count)
+    gap_sum = Column(Integer, default=0, nullable=False, server_default="0")
+    gap_count = Column(Integer, default=0, nullable=False, server_default="0")
     last_updated = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     __table_args__ = (
@@ -85,7 +114,7 @@ class NumberStatistics(Base):
         return f"<NumberStatistics {self.lottery_type} Number {self.number}>"
 
 
-class UserCombination(Base):
+class UserCombination(NumbersMaskMixin, Base):
     """Combinações salvas pelo usuário"""
     __tablename__ = "user_combination"
     
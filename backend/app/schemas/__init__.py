@@ -4,13 +4,30 @@ from app.schemas.lottery import (
     LotteryConfigCreate,
     Draw,
     DrawCreate,
+    DrawPage,
     NumberStatistics,
     UserCombination,
     UserCombinationCreate,
+    RankedUserCombination,
+    CombinationFilters,
     GeneratorRequest,
     GeneratorResponse,
+    CountRequest,
+    CountResponse,
+    BulkGeneratorRequest,
+    WheelRequest,
+    WheelResponse,
+    BacktestRequest,
+    BacktestResponse,
+    SimulationRequest,
+    SimulationResponse,
     CheckerRequest,
     CheckerResponse,
+    BetOddsResponse,
+    BatchCheckerRequest,
+    BatchCheckerResponse,
+    HistoryCheckerRequest,
+    HistoryCheckerResponse,
 )
 
 __all__ = [
@@ -18,11 +35,28 @@ __all__ = [
     "LotteryConfigCreate",
     "Draw",
     "DrawCreate",
+    "DrawPage",
     "NumberStatistics",
     "UserCombination",
     "UserCombinationCreate",
+    "RankedUserCombination",
+    "CombinationFilters",
     "GeneratorRequest",
     "GeneratorResponse",
+    "CountRequest",
+    "CountResponse",
+    "BulkGeneratorRequest",
+    "WheelRequest",
+    "WheelResponse",
+    "BacktestRequest",
+    "BacktestResponse",
+    "SimulationRequest",
+    "SimulationResponse",
     "CheckerRequest",
     "CheckerResponse",
+    "BetOddsResponse",
+    "BatchCheckerRequest",
+    "BatchCheckerResponse",
+    "HistoryCheckerRequest",
+    "HistoryCheckerResponse",
 ]
@@ -1,8 +1,8 @@
 """
 Pydantic schemas for API request/response validation
 """
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, StrictInt
+from typing import Dict, List, Literal, Optional, Union
 from datetime import date, datetime
 from decimal import Decimal
 
@@ -53,6 +53,13 @@ class Draw(DrawBase):
         from_attributes = True
 
 
+class DrawPage(BaseModel):
+    """Página de sorteios (mais recente primeiro) com cursores opacos"""
+    items: List[Draw]
+    next: Optional[str] = None
+    prev: Optional[str] = None
+
+
 class NumberStatisticsBase(BaseModel):
     lottery_type: str
     number: int
@@ -91,22 +98,150 @@ class UserCombination(UserCombinationBase):
         from_attributes = True
 
 
+class RankedUserCombination(BaseModel):
+    """Combinação com os números codificados pelo rank colexicográfico"""
+    id: int
+    lottery_type: str
+    name: str = ""
+    rank: int
+    numbers_count: int
+    is_favorite: bool = False
+    session_key: Optional[str] = None
+    created_at: datetime
+
+
+class CombinationFilters(BaseModel):
+    min_sum: Optional[int] = None
+    max_sum: Optional[int] = None
+    min_odd: Optional[int] = None
+    max_odd: Optional[int] = None
+    min_primes: Optional[int] = None
+    max_primes: Optional[int] = None
+    max_run: Optional[int] = None
+    min_per_row: Optional[int] = None
+    max_per_row: Optional[int] = None
+    min_per_column: Optional[int] = None
+    max_per_column: Optional[int] = None
+    excluded_numbers: List[int] = []
+
+
 class GeneratorRequest(BaseModel):
     lottery_type: str
-    numbers_count: int = Field(ge=6, le=20)
+    numbers_count: int = Field(ge=5, le=20)
     games_count: int = Field(ge=1, le=50)
     fixed_numbers: Optional[List[int]] = None
     include_frequent: bool = False
     include_delayed: bool = False
     mix_strategy: bool = True
+    mode: Literal["pool", "space", "weighted", "constrained"] = "pool"
+    filters: Optional[CombinationFilters] = None
+    weighting: Literal["frequency", "delay", "mixed"] = "mixed"
+
+
+class CountRequest(BaseModel):
+    lottery_type: str
+    numbers_count: int = Field(ge=5, le=20)
+    fixed_numbers: Optional[List[int]] = None
+    filters: Optional[CombinationFilters] = None
+
+
+class CountResponse(BaseModel):
+    lottery_type: str
+    numbers_per_game: int
+    matching_combinations: int
+    total_combinations: int
+
+
+class BulkGeneratorRequest(BaseModel):
+    lottery_type: str
+    numbers_count: int = Field(ge=5, le=20)
+    games_count: int = Field(ge=1)
+    fixed_numbers: Optional[List[int]] = None
+    include_frequent: bool = False
+    include_delayed: bool = False
+    mix_strategy: bool = True
+    seed: Optional[int] = None
 
 
 class GeneratorResponse(BaseModel):
     lottery_type: str
+    # Lists of numbers, or one colex rank per game with ?encoding=rank
+    combinations: Union[List[List[int]], List[int]]
+    metadata: dict
+
+
+class WheelRequest(BaseModel):
+    lottery_type: str
+    numbers: List[int] = Field(min_length=1)
+    guarantee: int = Field(ge=1)
+    if_drawn: Optional[int] = None
+    numbers_per_game: Optional[int] = None
+
+
+class WheelResponse(BaseModel):
+    lottery_type: str
+    numbers: List[int]
     combinations: List[List[int]]
     metadata: dict
 
 
+class BacktestRequest(BaseModel):
+    lottery_type: str
+    numbers_count: Optional[int] = None
+    games_per_contest: int = Field(default=10, ge=1, le=1000)
+    strategies: Optional[List[str]] = None
+    warmup: int = Field(default=1, ge=1)
+    seed: Optional[int] = Field(default=None, ge=0)
+
+
+class StrategyResult(BaseModel):
+    games: int
+    mean_hits: float
+    hit_histogram: Dict[int, int]
+    prize_tiers: Dict[str, int]
+    winners: int
+
+
+class BacktestResponse(BaseModel):
+    lottery_type: str
+    numbers_count: int
+    games_per_contest: int
+    contests: int
+    first_contest: Optional[int] = None
+    last_contest: Optional[int] = None
+    seed: int
+    strategies: Dict[str, StrategyResult]
+
+
+class SimulationRequest(BaseModel):
+    lottery_type: str
+    combinations: List[List[int]] = Field(min_length=1, max_length=1000)
+    draws: int = Field(default=1_000_000, ge=1)
+    seed: Optional[int] = Field(default=None, ge=0)
+    # Prize per winning ticket, by tier name (e.g. "11 acertos")
+    prize_values: Optional[Dict[str, float]] = None
+    ticket_cost: Optional[float] = Field(default=None, gt=0)
+
+
+class TierOdds(BaseModel):
+    winning_tickets_per_contest: float
+    contest_probability: float
+
+
+class SimulationResponse(BaseModel):
+    lottery_type: str
+    total_tickets: int
+    draws: int
+    seed: int
+    hit_histogram: Dict[int, int]
+    best_histogram: Dict[int, int]
+    prize_tiers: Dict[str, int]
+    winners: int
+    odds: Dict[str, TierOdds]
+    expected_prize: Optional[float] = None
+    expected_return: Optional[float] = None
+
+
 class CheckerRequest(BaseModel):
     lottery_type: str
     numbers: List[int]
@@ -122,3 +257,68 @@ class CheckerResponse(BaseModel):
     matches: List[int]
     match_count: int
     is_winner: bool
+    # Winning sub-games per tier, for bets larger than the base game
+    sub_game_tiers: Optional[Dict[str, int]] = None
+
+
+class TierProbability(BaseModel):
+    hits: int
+    probability: float
+    one_in: Optional[float] = None
+    expected_sub_games: float
+
+
+class BetOddsResponse(BaseModel):
+    lottery_type: str
+    bet_size: int
+    game_size: int
+    sub_games: int
+    total_draws: int
+    hit_probabilities: Dict[int, float]
+    tiers: Dict[str, TierProbability]
+
+
+class BatchCheckerRequest(BaseModel):
+    lottery_type: str
+    contest_number: Optional[int] = None
+    combinations: List[List[StrictInt]] = Field(min_length=1)
+
+
+class BatchCheckerResponse(BaseModel):
+    found: bool
+    contest_number: Optional[int] = None
+    draw_date: Optional[date] = None
+    drawn_numbers: Optional[List[int]] = None
+    total_tickets: int
+    hits: List[int]
+    hit_histogram: Dict[int, int]
+    prize_tiers: Dict[str, int]
+    winners: int
+
+
+class HistoryCheckerRequest(BaseModel):
+    lottery_type: str
+    combinations: List[List[StrictInt]] = Field(min_length=1, max_length=20)
+
+
+class PrizeContest(BaseModel):
+    contest_number: int
+    draw_date: date
+    hits: int
+    tier: str
+
+
+class HistoryCheckResult(BaseModel):
+    numbers: List[int]
+    hit_histogram: Dict[int, int]
+    prize_tiers: Dict[str, int]
+    winners: int
+    prize_contests: List[PrizeContest]
+    best_hits: int
+    best_contests: List[int]
+
+
+class HistoryCheckerResponse(BaseModel):
+    lottery_type: str
+    total_draws: int
+    results: List[HistoryCheckResult]
@@ -2,9 +2,19 @@
 from app.services.statistics import StatisticsService
 from app.services.generator import CombinationGeneratorService
 from app.services.checker import ResultCheckerService
+from app.services.wheels import WheelGeneratorService
+from app.services.backtest import BacktestService
+from app.services.simulation import SimulationService
+from app.services.export import ExportService
+from app.services.ingest import DrawIngestService
 
 __all__ = [
     "StatisticsService",
     "CombinationGeneratorService",
     "ResultCheckerService",
+    "WheelGeneratorService",
+    "BacktestService",
+    "SimulationService",
+    "ExportService",
+    "DrawIngestService",
 ]
@@ -0,0 +1,71 @@
+"""
+Serviço de backtesting de estratégias
+Reproduz o histórico concurso a concurso e confere os jogos de cada estratégia
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.workers import cpu_pool
+from app.services.history import get_draw_history
+from lottery_engine import STRATEGIES, run_backtest, summarize_backtest
+from typing import List, Optional, Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BacktestService:
+    """Serviço para backtesting de estratégias de geração"""
+    
+    @staticmethod
+    async def run_backtest(
+        db: AsyncSession,
+        lottery_type: str,
+        numbers_count: Optional[int] = None,
+        games_per_contest: int = 10,
+        strategies: Optional[List[str]] = None,
+        warmup: int = 1,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Avaliar estratégias contra cada próximo sorteio do histórico
+        
+        Statistics as of each contest drive the strategy's pool; its games
+        are scored against the following draw.
+        """
+        history = await get_draw_history(db, lottery_type)
+        numbers_count = numbers_count or history.numbers_to_pick
+        
+        min_numbers = history.min_bet_numbers or history.numbers_to_pick
+        max_numbers = history.max_bet_numbers or history.numbers_to_pick
+        if not min_numbers <= numbers_count <= max_numbers:
+            raise ValueError(f"Jogos de {numbers_count} números não são permitidos em {lottery_type}")
+        
+        logger.info(
+            f"Backtest de {lottery_type}: {len(history)} sorteios, "
+            f"{games_per_contest} jogos de {numbers_count} por concurso"
+        )
+        # run_backtest fans out to the shared process pool: only the coordination takes a slot here
+        result = await cpu_pool.run(
+            run_backtest,
+            history.contest_numbers,
+            history.matrix,
+            numbers_count,
+            games_per_contest=games_per_contest,
+            strategies=strategies or STRATEGIES,
+            seed=seed,
+            warmup=warmup,
+            workers=workers or settings.BACKTEST_WORKERS,
+            in_thread=True,
+            cancellable=True
+        )
+        
+        return {
+            "lottery_type": lottery_type,
+            "numbers_count": numbers_count,
+            "games_per_contest": games_per_contest,
+            "contests": result["steps"],
+            "first_contest": result["first_contest"],
+            "last_contest": result["last_contest"],
+            "seed": result["seed"],
+            "strategies": summarize_backtest(lottery_type, result)
+        }
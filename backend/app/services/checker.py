@@ -2,21 +2,56 @@
 Serviço de conferidor de resultados
 Migrado dos serviços Django
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from app.models import Draw
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.workers import cpu_pool
+from app.services.history import get_draw_history
+from lottery_engine import (
+    bet_odds,
+    count_hits,
+    decode_mask,
+    encode_mask,
+    masks_from_numbers,
+    score_bet,
+    summarize_history,
+    summarize_hits,
+)
 from typing import List, Dict, Any, Optional
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class InvalidCombinationError(ValueError):
+    """Uma combinação enviada não é um jogo válido para a loteria"""
+
+
+def _validate_combinations(lottery_type: str, history, combinations: List[List[int]]) -> None:
+    min_numbers = history.min_bet_numbers or history.numbers_to_pick
+    max_numbers = history.max_bet_numbers or history.numbers_to_pick
+    
+    for numbers in combinations:
+        if any(isinstance(n, bool) or not isinstance(n, int) for n in numbers):
+            raise InvalidCombinationError(f"Números inválidos: {numbers}")
+        if len(numbers) != len(set(numbers)):
+            raise InvalidCombinationError(f"Números duplicados encontrados: {numbers}")
+        if any(n < 1 or n > history.total_numbers for n in numbers):
+            raise InvalidCombinationError(f"Números fora do intervalo (1-{history.total_numbers}): {numbers}")
+        if not min_numbers <= len(numbers) <= max_numbers:
+            raise InvalidCombinationError(f"Jogos de {len(numbers)} números não são permitidos em {lottery_type}")
+
+
+def _ticket_hits(combinations: List[List[int]], draw_masks: np.ndarray) -> np.ndarray:
+    # Worker task: encoding the tickets is as CPU-bound as scoring them
+    return count_hits(masks_from_numbers(combinations), draw_masks)
+
+
 class ResultCheckerService:
     """Serviço para conferir combinações contra resultados de sorteios"""
     
     @staticmethod
-    def check_combination(
-        db: Session,
+    async def check_combination(
+        db: AsyncSession,
         lottery_type: str,
         numbers: List[int],
         contest_number: Optional[int] = None
@@ -24,18 +59,15 @@ class ResultCheckerService:
         """Conferir combinação contra um sorteio específico ou o último sorteio"""
         logger.info(f"Conferindo combinação para {lottery_type}")
         
-        # Get the draw
-        if contest_number:
-            draw = db.query(Draw).filter(
-                Draw.lottery_type == lottery_type,
-                Draw.contest_number == contest_number
-            ).first()
-        else:
-            draw = db.query(Draw).filter(
-                Draw.lottery_type == lottery_type
-            ).order_by(desc(Draw.contest_number)).first()
-        
-        if not draw:
+        # Get the draw from the in-memory history snapshot
+        try:
+            history = await get_draw_history(db, lottery_type)
+        except ValueError:
+            history = None
+        
+        index = history.index_of(contest_number or None) if history is not None else None
+        
+        if index is None:
             return {
                 "found": False,
                 "contest_number": None,
@@ -47,29 +79,140 @@ class ResultCheckerService:
                 "is_winner": False
             }
         
-        # Calculate matches
-        drawn_numbers = draw.numbers
-        matches = [num for num in numbers if num in drawn_numbers]
+        # Calculate matches (popcount of the AND of both bitmasks)
+        matches = decode_mask(history.mask(index) & encode_mask(numbers))
         match_count = len(matches)
         
-        # Determine if winner (this depends on lottery rules)
-        # For Lotofácil: 11+ matches wins
-        # For Mega-Sena: 4+ matches wins (quadra), 5+ (quina), 6 (sena)
-        is_winner = False
-        if lottery_type == "LOTOFACIL":
-            is_winner = match_count >= 11
-        elif lottery_type == "MEGA_SENA":
-            is_winner = match_count >= 4
-        elif lottery_type == "QUINA":
-            is_winner = match_count >= 2
+        # Bets above the base game are scored as all their sub-games, in closed form
+        bet_size = len(set(numbers))
+        sub_game_tiers = score_bet(lottery_type, bet_size, match_count, history.numbers_to_pick)
         
         return {
             "found": True,
-            "contest_number": draw.contest_number,
-            "draw_date": draw.draw_date,
-            "drawn_numbers": sorted(drawn_numbers),
+            "contest_number": int(history.contest_numbers[index]),
+            "draw_date": history.draw_date(index),
+            "drawn_numbers": history.drawn_numbers(index),
             "user_numbers": sorted(numbers),
-            "matches": sorted(matches),
+            "matches": matches,
             "match_count": match_count,
-            "is_winner": is_winner
+            "is_winner": any(sub_game_tiers.values()),
+            "sub_game_tiers": sub_game_tiers if bet_size > history.numbers_to_pick else None
+        }
+    
+    @staticmethod
+    async def check_batch(
+        db: AsyncSession,
+        lottery_type: str,
+        combinations: List[List[int]],
+        contest_number: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Conferir várias combinações contra um único sorteio
+        
+        The draw is looked up once and every ticket is scored with a
+        vectorized popcount of its bitmask AND the draw's bitmask.
+        """
+        logger.info(f"Conferindo {len(combinations)} combinações para {lottery_type}")
+        
+        try:
+            history = await get_draw_history(db, lottery_type)
+        except ValueError:
+            history = None
+        
+        if history is not None:
+            _validate_combinations(lottery_type, history, combinations)
+        index = history.index_of(contest_number or None) if history is not None else None
+        
+        if index is None:
+            return {
+                "found": False,
+                "contest_number": None,
+                "draw_date": None,
+                "drawn_numbers": None,
+                "total_tickets": len(combinations),
+                "hits": [],
+                "hit_histogram": {},
+                "prize_tiers": {},
+                "winners": 0
+            }
+        
+        hits = await cpu_pool.run(_ticket_hits, combinations, history.masks[index])
+        max_hits = max(history.numbers_to_pick, int(hits.max(initial=0)))
+        bet_sizes = np.array([len(numbers) for numbers in combinations])
+        
+        return {
+            "found": True,
+            "contest_number": int(history.contest_numbers[index]),
+            "draw_date": history.draw_date(index),
+            "drawn_numbers": history.drawn_numbers(index),
+            "total_tickets": len(combinations),
+            "hits": hits.tolist(),
+            **summarize_hits(lottery_type, hits, max_hits, bet_sizes, history.numbers_to_pick)
+        }
+    
+    @staticmethod
+    async def check_history(
+        db: AsyncSession,
+        lottery_type: str,
+        combinations: List[List[int]]
+    ) -> Dict[str, Any]:
+        """Conferir combinações contra todo o histórico de uma loteria
+        
+        One vectorized pass over the in-memory history matrix scores every
+        combination against every draw.
+        """
+        logger.info(f"Conferindo {len(combinations)} combinações no histórico de {lottery_type}")
+        
+        history = await get_draw_history(db, lottery_type)
+        _validate_combinations(lottery_type, history, combinations)
+        
+        # (draws, tickets) hit matrix
+        hits = await cpu_pool.run(_ticket_hits, combinations, history.masks)
+        
+        results = []
+        for ticket, numbers in enumerate(combinations):
+            ticket_hits = hits[:, ticket]
+            max_hits = max(history.numbers_to_pick, int(ticket_hits.max(initial=0)))
+            summary = summarize_history(
+                lottery_type, history.contest_numbers, ticket_hits, max_hits,
+                len(numbers), history.numbers_to_pick
+            )
+            prize_contests = []
+            for index in summary["prize_contests"]:
+                # Highest tier reached by any of the bet's sub-games
+                sub_game_tiers = score_bet(lottery_type, len(numbers), int(ticket_hits[index]), history.numbers_to_pick)
+                tier = next((name for name, count in sub_game_tiers.items() if count), None)
+                if tier is not None:
+                    prize_contests.append({
+                        "contest_number": int(history.contest_numbers[index]),
+                        "draw_date": history.draw_date(index),
+                        "hits": int(ticket_hits[index]),
+                        "tier": tier,
+                    })
+            summary["prize_contests"] = prize_contests
+            results.append({"numbers": sorted(numbers), **summary})
+        
+        return {
+            "lottery_type": lottery_type,
+            "total_draws": len(history),
+            "results": results
+        }
+    
+    @staticmethod
+    async def bet_odds(
+        db: AsyncSession,
+        lottery_type: str,
+        bet_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Probabilidades exatas de cada faixa para uma aposta de `bet_size` números"""
+        history = await get_draw_history(db, lottery_type)
+        bet_size = bet_size or history.numbers_to_pick
+        
+        min_numbers = history.min_bet_numbers or history.numbers_to_pick
+        max_numbers = history.max_bet_numbers or history.numbers_to_pick
+        if not min_numbers <= bet_size <= max_numbers:
+            raise ValueError(f"Apostas de {bet_size} números não são permitidas em {lottery_type}")
+        
+        return {
+            "lottery_type": lottery_type,
+            **bet_odds(lottery_type, history.total_numbers, history.numbers_to_pick, bet_size)
         }
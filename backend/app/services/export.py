@@ -0,0 +1,48 @@
+"""
+Serviço de exportação de sorteios e estatísticas
+Lê com cursor no servidor (yield_per) e codifica em blocos, com memória constante
+"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.models import Draw, NumberStatistics
+from lottery_engine import EXPORT_CHUNK_ROWS, EXPORT_DATASETS, ExportWriter
+from typing import AsyncIterator
+
+# Model and export order of each dataset
+EXPORT_MODELS = {
+    "draws": (Draw, Draw.contest_number),
+    "statistics": (NumberStatistics, NumberStatistics.number),
+}
+
+
+class ExportService:
+    """Serviço para exportação em massa (CSV, NDJSON, Parquet, Arrow)"""
+    
+    @staticmethod
+    async def stream(
+        session_factory: async_sessionmaker[AsyncSession],
+        lottery_type: str,
+        dataset: str,
+        writer: ExportWriter,
+        chunk_rows: int = EXPORT_CHUNK_ROWS
+    ) -> AsyncIterator[bytes]:
+        """Transmitir um dataset inteiro de uma loteria, um bloco de linhas por vez
+        
+        Runs in its own session: a streamed body outlives the request's
+        dependencies. Rows are fetched ``chunk_rows`` at a time from a
+        server-side cursor and encoded as they arrive.
+        """
+        model, order = EXPORT_MODELS[dataset]
+        columns = [getattr(model, name) for name, _ in EXPORT_DATASETS[dataset]]
+        
+        async with session_factory() as session:
+            result = await session.stream(
+                select(*columns)
+                .where(model.lottery_type == lottery_type)
+                .order_by(order)
+                .execution_options(yield_per=chunk_rows)
+            )
+            async for partition in result.partitions():
+                yield writer.write([tuple(row) for row in partition])
+        
+        yield writer.close()
@@ -2,82 +2,344 @@
 Serviço de geração de combinações
 Migrado dos serviços Django
 """
-from sqlalchemy.orm import Session
-from app.models import LotteryConfiguration
-from app.services.statistics import StatisticsService
-from typing import List, Optional, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.workers import cpu_pool
+from app.services.history import get_draw_history
+from app.services.space import get_combination_space
+from lottery_engine import (
+    AliasTable,
+    CountingFilters,
+    DrawHistory,
+    SpaceFilters,
+    constrained_sampler,
+    iter_unique_games,
+)
+from lottery_engine.space import NUMBERS_TO_PICK as SPACE_NUMBERS_TO_PICK
+from lottery_engine.space import TOTAL_NUMBERS as SPACE_TOTAL_NUMBERS
+from typing import Iterator, List, Optional, Dict, Any, Tuple
+from math import comb
+import numpy as np
 import random
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Worker tasks: module-level and picklable, so they also run in a process pool
+
+def _pool_games(pool: List[int], numbers_count: int, games_count: int, fixed_numbers: List[int]) -> List[List[int]]:
+    # Own generator: forked workers would otherwise share the parent's random state
+    rng = random.Random()
+    combinations = []
+    for _ in range(games_count):
+        combination = set(fixed_numbers)
+        remaining = numbers_count - len(combination)
+        
+        # Filter pool to exclude fixed numbers
+        available = [n for n in pool if n not in combination]
+        
+        # Randomly select remaining numbers
+        if remaining > 0 and available:
+            selected = rng.sample(available, min(remaining, len(available)))
+            combination.update(selected)
+        
+        combinations.append(sorted(list(combination)))
+    return combinations
+
+
+def _weighted_games(table: AliasTable, games_count: int, numbers_count: int, fixed_numbers: List[int]) -> List[List[int]]:
+    return table.sample_games(np.random.default_rng(), games_count, numbers_count, fixed_numbers).tolist()
+
+
+def _constrained_count(total_numbers: int, numbers_count: int, filters: CountingFilters) -> int:
+    return constrained_sampler(total_numbers, numbers_count, filters).count
+
+
+def _constrained_games(
+    total_numbers: int, numbers_count: int, filters: CountingFilters, games_count: int
+) -> Tuple[List[List[int]], int]:
+    sampler = constrained_sampler(total_numbers, numbers_count, filters)
+    return sampler.sample(games_count).tolist(), sampler.count
+
+
+def _space_games(filters: SpaceFilters, games_count: int) -> Tuple[List[List[int]], int]:
+    space = get_combination_space()
+    selected = space.select(filters)
+    return space.sample(selected, games_count).tolist(), int(selected.sum())
+
+
 class CombinationGeneratorService:
     """Serviço para geração de combinações de loteria"""
     
     @staticmethod
-    def generate_combinations(
-        db: Session,
+    async def generate_combinations(
+        db: AsyncSession,
         lottery_type: str,
         numbers_count: int,
         games_count: int,
         fixed_numbers: Optional[List[int]] = None,
         include_frequent: bool = False,
         include_delayed: bool = False,
-        mix_strategy: bool = True
+        mix_strategy: bool = True,
+        mode: str = "pool",
+        filters: Optional[Dict[str, Any]] = None,
+        weighting: str = "mixed"
     ) -> Dict[str, Any]:
         """Gerar combinações de loteria baseadas em filtros"""
         logger.info(f"Gerando {games_count} combinações para {lottery_type}")
         
-        # Get lottery configuration
-        config = db.query(LotteryConfiguration).filter(
-            LotteryConfiguration.lottery_type == lottery_type
-        ).first()
+        if mode == "space":
+            return await CombinationGeneratorService.sample_from_space(
+                lottery_type, numbers_count, games_count, fixed_numbers, filters
+            )
+        if mode == "weighted":
+            return await CombinationGeneratorService.sample_weighted(
+                db, lottery_type, numbers_count, games_count, fixed_numbers, weighting
+            )
+        if mode == "constrained":
+            return await CombinationGeneratorService.sample_constrained(
+                db, lottery_type, numbers_count, games_count, fixed_numbers, filters
+            )
         
-        if not config:
-            raise ValueError(f"Configuração não encontrada para {lottery_type}")
+        # Lottery configuration and statistics come from the in-memory snapshot
+        history = await get_draw_history(db, lottery_type)
         
-        # Validate numbers_count
-        if numbers_count < (config.min_bet_numbers or config.numbers_to_pick):
-            raise ValueError(f"Mínimo de números: {config.min_bet_numbers or config.numbers_to_pick}")
-        if numbers_count > (config.max_bet_numbers or config.numbers_to_pick):
-            raise ValueError(f"Máximo de números: {config.max_bet_numbers or config.numbers_to_pick}")
+        CombinationGeneratorService._validate_numbers_count(history, numbers_count)
+        pool = CombinationGeneratorService._build_pool(
+            history, include_frequent, include_delayed, mix_strategy
+        )
         
-        # Build number pool
+        # Generate combinations
+        fixed_numbers = fixed_numbers or []
+        combinations = await cpu_pool.run(_pool_games, pool, numbers_count, games_count, fixed_numbers)
+        
+        return {
+            "lottery_type": lottery_type,
+            "combinations": combinations,
+            "metadata": {
+                "numbers_per_game": numbers_count,
+                "total_games": len(combinations),
+                "fixed_numbers": fixed_numbers,
+                "include_frequent": include_frequent,
+                "include_delayed": include_delayed,
+            }
+        }
+    
+    @staticmethod
+    def _validate_numbers_count(history: DrawHistory, numbers_count: int) -> None:
+        if numbers_count < (history.min_bet_numbers or history.numbers_to_pick):
+            raise ValueError(f"Mínimo de números: {history.min_bet_numbers or history.numbers_to_pick}")
+        if numbers_count > (history.max_bet_numbers or history.numbers_to_pick):
+            raise ValueError(f"Máximo de números: {history.max_bet_numbers or history.numbers_to_pick}")
+    
+    @staticmethod
+    def _validate_fixed_numbers(total_numbers: int, fixed_numbers: Optional[List[int]]) -> None:
+        invalid = [n for n in fixed_numbers or [] if n < 1 or n > total_numbers]
+        if invalid:
+            raise ValueError(f"Números fixos fora do intervalo (1-{total_numbers}): {invalid}")
+    
+    @staticmethod
+    def _validate_excluded_numbers(total_numbers: int, excluded_numbers: Optional[List[int]]) -> None:
+        invalid = [n for n in excluded_numbers or [] if n < 1 or n > total_numbers]
+        if invalid:
+            raise ValueError(f"Números excluídos fora do intervalo (1-{total_numbers}): {invalid}")
+    
+    @staticmethod
+    def _build_pool(
+        history: DrawHistory,
+        include_frequent: bool,
+        include_delayed: bool,
+        mix_strategy: bool
+    ) -> List[int]:
+        """Montar o conjunto de números de onde os jogos são sorteados"""
         pool = set()
         
         if include_frequent:
-            frequent = StatisticsService.get_most_frequent(db, lottery_type, limit=20)
-            pool.update([stat.number for stat in frequent])
+            pool.update(history.ranked_numbers("frequency", 20))
         
         if include_delayed:
-            delayed = StatisticsService.get_most_delayed(db, lottery_type, limit=20)
-            pool.update([stat.number for stat in delayed])
+            pool.update(history.ranked_numbers("delay", 20))
         
         if mix_strategy or not pool:
             # Add random numbers from the full range
-            all_numbers = list(range(1, config.total_numbers + 1))
+            all_numbers = list(range(1, history.total_numbers + 1))
             pool.update(all_numbers)
         
-        pool = list(pool)
+        return sorted(pool)
+    
+    @staticmethod
+    async def generate_bulk(
+        db: AsyncSession,
+        lottery_type: str,
+        numbers_count: int,
+        games_count: int,
+        fixed_numbers: Optional[List[int]] = None,
+        include_frequent: bool = False,
+        include_delayed: bool = False,
+        mix_strategy: bool = True,
+        seed: Optional[int] = None
+    ) -> Iterator[np.ndarray]:
+        """Gerar um grande volume de jogos distintos em lotes
+        
+        Validation happens up front; the returned iterator yields
+        (games, numbers_count) arrays so callers can stream them out.
+        """
+        logger.info(f"Gerando {games_count} combinações em lote para {lottery_type}")
+        
+        history = await get_draw_history(db, lottery_type)
+        CombinationGeneratorService._validate_numbers_count(history, numbers_count)
+        
+        CombinationGeneratorService._validate_fixed_numbers(history.total_numbers, fixed_numbers)
+        
+        pool = CombinationGeneratorService._build_pool(
+            history, include_frequent, include_delayed, mix_strategy
+        )
+        return iter_unique_games(
+            pool, numbers_count, games_count, fixed_numbers or [], np.random.default_rng(seed)
+        )
+    
+    @staticmethod
+    async def sample_weighted(
+        db: AsyncSession,
+        lottery_type: str,
+        numbers_count: int,
+        games_count: int,
+        fixed_numbers: Optional[List[int]] = None,
+        weighting: str = "mixed"
+    ) -> Dict[str, Any]:
+        """Sortear jogos com pesos derivados das estatísticas
+        
+        The alias table is cached on the history snapshot, so it is built
+        once per lottery and data version and every draw is O(1).
+        """
+        history = await get_draw_history(db, lottery_type)
+        CombinationGeneratorService._validate_numbers_count(history, numbers_count)
+        CombinationGeneratorService._validate_fixed_numbers(history.total_numbers, fixed_numbers)
+        
+        fixed_numbers = fixed_numbers or []
+        table = history.alias_table(weighting)
+        combinations = await cpu_pool.run(_weighted_games, table, games_count, numbers_count, fixed_numbers)
+        
+        return {
+            "lottery_type": lottery_type,
+            "combinations": combinations,
+            "metadata": {
+                "numbers_per_game": numbers_count,
+                "total_games": len(combinations),
+                "fixed_numbers": fixed_numbers,
+                "mode": "weighted",
+                "weighting": weighting,
+            }
+        }
+    
+    @staticmethod
+    async def _counting_filters(
+        db: AsyncSession,
+        lottery_type: str,
+        numbers_count: int,
+        fixed_numbers: Optional[List[int]],
+        filters: Optional[Dict[str, Any]]
+    ) -> Tuple[int, CountingFilters]:
+        """Validar os filtros do modo constrained para o sampler DP"""
+        history = await get_draw_history(db, lottery_type)
+        CombinationGeneratorService._validate_numbers_count(history, numbers_count)
+        CombinationGeneratorService._validate_fixed_numbers(history.total_numbers, fixed_numbers)
+        
+        filters = {key: value for key, value in (filters or {}).items() if value not in (None, [])}
+        CombinationGeneratorService._validate_excluded_numbers(history.total_numbers, filters.get("excluded_numbers"))
+        supported = set(CountingFilters.__dataclass_fields__) - {"fixed_numbers"}
+        unsupported = sorted(set(filters) - supported)
+        if unsupported:
+            raise ValueError(f"Filtros não suportados no modo constrained: {unsupported}")
+        
+        counting_filters = CountingFilters(**{
+            **filters,
+            "fixed_numbers": tuple(sorted(set(fixed_numbers or []))),
+            "excluded_numbers": tuple(sorted(set(filters.get("excluded_numbers", ())))),
+        })
+        return history.total_numbers, counting_filters
+    
+    @staticmethod
+    async def count_combinations(
+        db: AsyncSession,
+        lottery_type: str,
+        numbers_count: int,
+        fixed_numbers: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Contar exatamente as combinações que atendem aos filtros"""
+        total_numbers, counting_filters = await CombinationGeneratorService._counting_filters(
+            db, lottery_type, numbers_count, fixed_numbers, filters
+        )
+        count = await cpu_pool.run(_constrained_count, total_numbers, numbers_count, counting_filters)
+        return {
+            "lottery_type": lottery_type,
+            "numbers_per_game": numbers_count,
+            "matching_combinations": count,
+            "total_combinations": comb(total_numbers, numbers_count),
+        }
+    
+    @staticmethod
+    async def sample_constrained(
+        db: AsyncSession,
+        lottery_type: str,
+        numbers_count: int,
+        games_count: int,
+        fixed_numbers: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Sortear jogos distintos, exatamente uniformes entre os que atendem aos filtros
+        
+        Walks dynamic-programming count tables instead of rejecting random
+        games, so tight filters cost nothing extra.
+        """
+        total_numbers, counting_filters = await CombinationGeneratorService._counting_filters(
+            db, lottery_type, numbers_count, fixed_numbers, filters
+        )
+        combinations, count = await cpu_pool.run(
+            _constrained_games, total_numbers, numbers_count, counting_filters, games_count
+        )
+        
+        return {
+            "lottery_type": lottery_type,
+            "combinations": combinations,
+            "metadata": {
+                "numbers_per_game": numbers_count,
+                "total_games": len(combinations),
+                "fixed_numbers": fixed_numbers or [],
+                "mode": "constrained",
+                "matching_combinations": count,
+            }
+        }
+    
+    @staticmethod
+    async def sample_from_space(
+        lottery_type: str,
+        numbers_count: int,
+        games_count: int,
+        fixed_numbers: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Sortear combinações uniformemente entre as que atendem aos filtros
+        
+        Indexes into the precomputed combination space instead of retrying
+        random games until one passes the filters.
+        """
+        if lottery_type != "LOTOFACIL" or numbers_count != SPACE_NUMBERS_TO_PICK:
+            raise ValueError("O modo space só está disponível para a Lotofácil com 15 números")
         
-        # Generate combinations
-        combinations = []
         fixed_numbers = fixed_numbers or []
+        excluded_numbers = (filters or {}).get("excluded_numbers") or []
+        # Space masks are 25-bit words: anything outside 1-25 must not reach them
+        CombinationGeneratorService._validate_fixed_numbers(SPACE_TOTAL_NUMBERS, fixed_numbers)
+        CombinationGeneratorService._validate_excluded_numbers(SPACE_TOTAL_NUMBERS, excluded_numbers)
+        space_filters = SpaceFilters(**{
+            **(filters or {}),
+            "fixed_numbers": tuple(fixed_numbers),
+            "excluded_numbers": tuple(excluded_numbers),
+        })
         
-        for _ in range(games_count):
-            combination = set(fixed_numbers)
-            remaining = numbers_count - len(combination)
-            
-            # Filter pool to exclude fixed numbers
-            available = [n for n in pool if n not in combination]
-            
-            # Randomly select remaining numbers
-            if remaining > 0 and available:
-                selected = random.sample(available, min(remaining, len(available)))
-                combination.update(selected)
-            
-            combinations.append(sorted(list(combination)))
+        combinations, matching = await cpu_pool.run(_space_games, space_filters, games_count)
         
         return {
             "lottery_type": lottery_type,
@@ -86,23 +348,21 @@ class CombinationGeneratorService:
                 "numbers_per_game": numbers_count,
                 "total_games": len(combinations),
                 "fixed_numbers": fixed_numbers,
-                "include_frequent": include_frequent,
-                "include_delayed": include_delayed,
+                "mode": "space",
+                "matching_combinations": matching,
             }
         }
     
     @staticmethod
-    def validate_combination(
-        db: Session,
+    async def validate_combination(
+        db: AsyncSession,
         lottery_type: str,
         numbers: List[int]
     ) -> Dict[str, Any]:
         """Validar uma combinação"""
-        config = db.query(LotteryConfiguration).filter(
-            LotteryConfiguration.lottery_type == lottery_type
-        ).first()
-        
-        if not config:
+        try:
+            history = await get_draw_history(db, lottery_type)
+        except ValueError:
             return {
                 "valid": False,
                 "errors": [f"Configuração não encontrada para {lottery_type}"],
@@ -113,16 +373,16 @@ class CombinationGeneratorService:
         warnings = []
         
         # Check number count
-        if len(numbers) < (config.min_bet_numbers or config.numbers_to_pick):
-            errors.append(f"Mínimo de {config.min_bet_numbers or config.numbers_to_pick} números necessários")
+        if len(numbers) < (history.min_bet_numbers or history.numbers_to_pick):
+            errors.append(f"Mínimo de {history.min_bet_numbers or history.numbers_to_pick} números necessários")
         
-        if len(numbers) > (config.max_bet_numbers or config.numbers_to_pick):
-            errors.append(f"Máximo de {config.max_bet_numbers or config.numbers_to_pick} números permitidos")
+        if len(numbers) > (history.max_bet_numbers or history.numbers_to_pick):
+            errors.append(f"Máximo de {history.max_bet_numbers or history.numbers_to_pick} números permitidos")
         
         # Check number range
         for num in numbers:
-            if num < 1 or num > config.total_numbers:
-                errors.append(f"Número {num} está fora do intervalo (1-{config.total_numbers})")
+            if num < 1 or num > history.total_numbers:
+                errors.append(f"Número {num} está fora do intervalo (1-{history.total_numbers})")
         
         # Check for duplicates
         if len(numbers) != len(set(numbers)):
@@ -0,0 +1,72 @@
+"""
+Snapshots de histórico de sorteios em memória
+Compartilhados pelos serviços de estatísticas, gerador e conferidor
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.models import Draw, LotteryConfiguration
+from lottery_engine import AsyncHistoryRegistry, DrawHistory
+import logging
+
+logger = logging.getLogger(__name__)
+
+CONFIG_COLUMNS = [
+    LotteryConfiguration.lottery_type,
+    LotteryConfiguration.total_numbers,
+    LotteryConfiguration.numbers_to_pick,
+    LotteryConfiguration.min_bet_numbers,
+    LotteryConfiguration.max_bet_numbers,
+]
+
+
+async def _get_config(db: AsyncSession, lottery_type: str):
+    result = await db.execute(
+        select(*CONFIG_COLUMNS).where(LotteryConfiguration.lottery_type == lottery_type)
+    )
+    config = result.first()
+    
+    if not config:
+        raise ValueError(f"Configuração não encontrada para {lottery_type}")
+    
+    return config
+
+
+async def _history_version(lottery_type: str, db: AsyncSession):
+    """Identify the current draw data (and configuration) of a lottery"""
+    result = await db.execute(
+        select(
+            func.count(Draw.id),
+            func.max(Draw.contest_number),
+            func.max(func.coalesce(Draw.updated_at, Draw.created_at)),
+        ).where(Draw.lottery_type == lottery_type)
+    )
+    return (tuple(result.one()), tuple(await _get_config(db, lottery_type)))
+
+
+async def _load_history(lottery_type: str, version, db: AsyncSession) -> DrawHistory:
+    """Load every draw of a lottery into a new snapshot"""
+    logger.info(f"Carregando histórico de sorteios para {lottery_type}")
+    config = await _get_config(db, lottery_type)
+    result = await db.execute(
+        select(Draw.contest_number, Draw.draw_date, Draw.numbers)
+        .where(Draw.lottery_type == lottery_type)
+        .order_by(Draw.contest_number)
+    )
+    return DrawHistory.from_rows(dict(config._mapping), version, result.all())
+
+
+draw_histories = AsyncHistoryRegistry(
+    load=_load_history,
+    version=_history_version,
+    revalidate_after=settings.DRAW_HISTORY_REVALIDATE_SECONDS,
+)
+
+
+async def get_draw_history(db: AsyncSession, lottery_type: str) -> DrawHistory:
+    """Obter o snapshot atual do histórico de uma loteria
+    
+    Raises:
+        ValueError: If the lottery is not configured
+    """
+    return await draw_histories.get(lottery_type, db)
@@ -0,0 +1,129 @@
+"""
+Serviço de importação em massa de sorteios
+Lê arquivos oficiais de resultados (CSV/XLSX) em fluxo e grava em lotes numa única transação
+"""
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.workers import cpu_pool
+from app.db.upsert import upsert_rows
+from app.models import Draw, LotteryConfiguration
+from app.services.history import draw_histories
+from app.services.statistics import StatisticsService
+from lottery_engine import (
+    INGEST_BATCH_ROWS,
+    IngestError,
+    IngestReport,
+    encode_words,
+    iter_draw_batches,
+    read_result_rows,
+)
+from typing import IO, Any, Dict, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _next_batch(batches: Iterator[List[Dict[str, Any]]], lottery_type: str) -> Optional[List[Dict[str, Any]]]:
+    """Read, validate and encode the next batch of rows (None when exhausted)"""
+    batch = next(batches, None)
+    if batch is None:
+        return None
+    values = []
+    for draw in batch:
+        low, high = encode_words(draw["numbers"])
+        values.append({
+            "lottery_type": lottery_type, "numbers_mask_low": low, "numbers_mask_high": high, **draw
+        })
+    return values
+
+
+class DrawIngestService:
+    """Serviço para carga de arquivos oficiais de resultados"""
+    
+    # Columns refreshed when a contest is already stored (a correction)
+    UPSERT_FIELDS = [
+        "draw_date", "numbers", "numbers_second_draw", "prize_amount", "winners_count",
+        "accumulated", "next_estimated_prize", "numbers_mask_low", "numbers_mask_high",
+    ]
+    
+    @staticmethod
+    async def _upsert(db: AsyncSession, values: List[Dict[str, Any]]) -> None:
+        """Insert or update one batch of encoded draws with one bulk upsert"""
+        await upsert_rows(
+            db,
+            Draw,
+            values,
+            index_elements=["lottery_type", "contest_number"],
+            update_fields=DrawIngestService.UPSERT_FIELDS,
+            touch="updated_at",
+        )
+    
+    @staticmethod
+    async def ingest(
+        db: AsyncSession,
+        lottery_type: str,
+        stream: IO[bytes],
+        fmt: str = "csv",
+        encoding: str = "utf-8-sig",
+        strict: bool = True,
+        batch_rows: int = INGEST_BATCH_ROWS
+    ) -> Dict[str, Any]:
+        """Importar um arquivo de resultados (CSV ou XLSX) para os sorteios de uma loteria
+        
+        The file is parsed as a stream and validated in batches on a pool
+        thread; each batch is upserted with one statement and everything is
+        committed at once.
+        Statistics are then refreshed incrementally (or rebuilt when the file
+        corrects contests already counted).
+        
+        Raises:
+            ValueError: Unknown lottery
+            IngestError: File rejected (nothing is saved)
+        """
+        config = await db.scalar(
+            select(LotteryConfiguration).where(LotteryConfiguration.lottery_type == lottery_type)
+        )
+        if not config:
+            raise ValueError(f"Loteria {lottery_type} não configurada")
+        
+        report = IngestReport()
+        loaded = {}
+        try:
+            batches = iter_draw_batches(
+                read_result_rows(stream, fmt, encoding),
+                config.total_numbers,
+                config.numbers_to_pick,
+                report,
+                batch_rows,
+            )
+            while True:
+                # Parsing is CPU-bound and the iterator cannot be pickled: one pool thread per batch
+                batch = await cpu_pool.run(_next_batch, batches, lottery_type, in_thread=True)
+                if batch is None:
+                    break
+                await DrawIngestService._upsert(db, batch)
+                # A contest may appear in several batches: the last row won the upsert
+                loaded.update((draw["contest_number"], draw["numbers"]) for draw in batch)
+            if strict and report.error_count:
+                raise IngestError(f"{report.error_count} linha(s) inválida(s); nada foi importado", report)
+            await db.commit()
+        except (ValueError, UnicodeDecodeError) as e:
+            await db.rollback()
+            if isinstance(e, IngestError):
+                raise
+            raise IngestError(str(e), report)
+        except Exception:
+            await db.rollback()
+            raise
+        
+        draw_histories.invalidate(lottery_type)
+        await StatisticsService.apply_draws(db, lottery_type, list(loaded.items()))
+        logger.info(f"Imported {len(loaded)} draws for {lottery_type}")
+        
+        return {
+            "lottery_type": lottery_type,
+            "rows": report.rows,
+            "loaded": len(loaded),
+            "error_count": report.error_count,
+            "errors": [{"line": line, "message": message} for line, message in report.errors],
+        }
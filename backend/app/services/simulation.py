@@ -0,0 +1,65 @@
+"""
+Serviço de simulação Monte Carlo
+Confere um conjunto de jogos contra milhões de sorteios sintéticos
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.workers import cpu_pool
+from app.services.history import get_draw_history
+from lottery_engine import simulate_draws, summarize_simulation
+from typing import List, Optional, Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SimulationService:
+    """Serviço para simulação de prêmios"""
+    
+    @staticmethod
+    async def simulate(
+        db: AsyncSession,
+        lottery_type: str,
+        combinations: List[List[int]],
+        draws: int = 1_000_000,
+        seed: Optional[int] = None,
+        prize_values: Optional[Dict[str, float]] = None,
+        ticket_cost: Optional[float] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Estimar distribuição de acertos e retorno de um bolão
+        
+        Draws are uniform over the lottery's configuration, independent of
+        the stored history.
+        """
+        history = await get_draw_history(db, lottery_type)
+        min_numbers = history.min_bet_numbers or history.numbers_to_pick
+        max_numbers = history.max_bet_numbers or history.numbers_to_pick
+        
+        for numbers in combinations:
+            if len(numbers) != len(set(numbers)):
+                raise ValueError(f"Números duplicados encontrados: {numbers}")
+            if any(n < 1 or n > history.total_numbers for n in numbers):
+                raise ValueError(f"Números fora do intervalo (1-{history.total_numbers}): {numbers}")
+            if not min_numbers <= len(numbers) <= max_numbers:
+                raise ValueError(f"Jogos de {len(numbers)} números não são permitidos em {lottery_type}")
+        
+        logger.info(f"Simulando {draws} sorteios de {lottery_type} para {len(combinations)} jogos")
+        # simulate_draws fans out to the shared process pool: only the coordination takes a slot here
+        result = await cpu_pool.run(
+            simulate_draws,
+            combinations,
+            history.total_numbers,
+            history.numbers_to_pick,
+            draws,
+            seed=seed,
+            workers=workers or settings.SIMULATION_WORKERS,
+            in_thread=True,
+            cancellable=True
+        )
+        
+        return {
+            "lottery_type": lottery_type,
+            "total_tickets": len(combinations),
+            **summarize_simulation(lottery_type, result, prize_values, ticket_cost)
+        }
@@ -0,0 +1,22 @@
+"""
+Espaço de combinações da Lotofácil pré-computado
+Mapeado em memória no primeiro uso e compartilhado pelo processo
+"""
+from functools import lru_cache
+from app.core.config import settings
+from lottery_engine import CombinationSpace
+
+
+@lru_cache(maxsize=None)
+def _open_space(directory: str) -> CombinationSpace:
+    return CombinationSpace.open(directory)
+
+
+def get_combination_space() -> CombinationSpace:
+    """Obter o espaço de combinações mapeado em memória"""
+    try:
+        return _open_space(settings.COMBINATION_SPACE_DIR)
+    except FileNotFoundError:
+        raise ValueError(
+            "Espaço de combinações não encontrado; execute scripts/build_combination_space.py"
+        )
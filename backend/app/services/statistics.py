@@ -2,133 +2,185 @@
 Serviço de cálculo de estatísticas
 Migrado dos serviços Django
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.core.cache import cache_set, cache_store
+from app.db.upsert import upsert_rows
 from app.models import Draw, NumberStatistics, LotteryConfiguration
-from typing import List, Optional
+from app.services.history import draw_histories, get_draw_history
+from lottery_engine import (
+    CACHE_TTLS,
+    AsyncVersionedCache,
+    apply_draw,
+    conditional_validators,
+    latest_contest,
+    pack_rows,
+    unpack_rows,
+    validators_key,
+)
+from typing import Any, Dict, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Statistics rows per lottery (packed), republished under a new version on every recompute
+statistics_cache = AsyncVersionedCache(cache_store, namespace="stats")
+
 
 class StatisticsService:
     """Serviço para cálculo e recuperação de estatísticas de loteria"""
     
+    STATISTICS_FIELDS = [
+        "number", "frequency", "last_draw_contest", "delay",
+        "max_delay", "average_delay", "gap_sum", "gap_count",
+    ]
+    
     @staticmethod
-    def calculate_statistics(db: Session, lottery_type: str) -> None:
+    async def _save_rows(db: AsyncSession, lottery_type: str, rows: List[Dict[str, Any]]) -> None:
+        """Persist all statistics rows of a lottery with one bulk upsert"""
+        if not rows:
+            return
+        
+        try:
+            await upsert_rows(
+                db,
+                NumberStatistics,
+                [{"lottery_type": lottery_type, **row} for row in rows],
+                index_elements=["lottery_type", "number"],
+                update_fields=StatisticsService.STATISTICS_FIELDS[1:],
+                touch="last_updated",
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    
+    @staticmethod
+    async def _load_rows(db: AsyncSession, lottery_type: str) -> List[Dict[str, Any]]:
+        """Read a lottery's statistics rows as plain dicts, ordered by number"""
+        result = await db.execute(
+            select(*NumberStatistics.__table__.columns)
+            .where(NumberStatistics.lottery_type == lottery_type)
+            .order_by(NumberStatistics.number)
+        )
+        return [dict(row._mapping) for row in result]
+    
+    @staticmethod
+    async def _set_validators(lottery_type: str, rows: List[Dict[str, Any]]) -> None:
+        """Refresh the lottery's HTTP validators (its data version) from its rows"""
+        await cache_set(
+            validators_key(lottery_type),
+            conditional_validators(lottery_type, rows),
+            CACHE_TTLS["validators"],
+        )
+    
+    @staticmethod
+    async def _publish(db: AsyncSession, lottery_type: str) -> None:
+        """Write-through: cache the rows just saved under a new version"""
+        rows = await StatisticsService._load_rows(db, lottery_type)
+        await statistics_cache.publish(lottery_type, pack_rows(rows))
+        # Only after the rows: responses cached under the new version must see them
+        await StatisticsService._set_validators(lottery_type, rows)
+    
+    @staticmethod
+    async def calculate_statistics(db: AsyncSession, lottery_type: str) -> None:
         """Calcular estatísticas para todos os números de um tipo de loteria"""
         logger.info(f"Calculando estatísticas para {lottery_type}")
         
-        # Get lottery configuration
-        config = db.query(LotteryConfiguration).filter(
-            LotteryConfiguration.lottery_type == lottery_type
-        ).first()
-        
-        if not config:
+        # Reload the draw history snapshot; its statistics come from one vectorized pass
+        draw_histories.invalidate(lottery_type)
+        try:
+            history = await get_draw_history(db, lottery_type)
+        except ValueError:
             logger.error(f"Configuration not found for {lottery_type}")
             return
         
-        # Get all draws for this lottery
-        draws = db.query(Draw).filter(
-            Draw.lottery_type == lottery_type
-        ).order_by(desc(Draw.contest_number)).all()
+        if not len(history):
+            logger.warning(f"No draws found for {lottery_type}")
+            return
         
+        history_stats = history.statistics
+        
+        await StatisticsService._save_rows(db, lottery_type, history_stats.as_rows())
+        await StatisticsService._publish(db, lottery_type)
+        logger.info(f"Statistics calculated successfully for {lottery_type}")
+    
+    @staticmethod
+    async def apply_draw(db: AsyncSession, draw: Draw) -> None:
+        """Atualizar estatísticas incrementalmente com um novo sorteio"""
+        await StatisticsService.apply_draws(db, draw.lottery_type, [(draw.contest_number, draw.numbers)])
+    
+    @staticmethod
+    async def apply_draws(
+        db: AsyncSession,
+        lottery_type: str,
+        draws: List[Tuple[int, List[int]]]
+    ) -> None:
+        """Atualizar estatísticas incrementalmente com novos sorteios
+        
+        Each draw is folded in O(1) per number and the rows are saved once.
+        Falls back to a full rebuild when statistics are missing or any draw
+        is not newer than the latest contest already counted.
+        """
         if not draws:
-            logger.warning(f"No draws found for {lottery_type}")
             return
+        draws = sorted(draws)
+        columns = [getattr(NumberStatistics, field) for field in StatisticsService.STATISTICS_FIELDS]
+        result = await db.execute(
+            select(*columns).where(NumberStatistics.lottery_type == lottery_type)
+        )
+        rows = [dict(row._mapping) for row in result]
         
-        latest_contest = draws[0].contest_number
+        config = await db.scalar(
+            select(LotteryConfiguration).where(LotteryConfiguration.lottery_type == lottery_type)
+        )
         
-        # Calculate statistics for each number
-        for number in range(1, config.total_numbers + 1):
-            frequency = 0
-            last_contest = None
-            delays = []
-            current_delay_count = 0
-            
-            # Count frequency and track delays
-            for draw in reversed(draws):
-                if number in draw.numbers:
-                    frequency += 1
-                    if last_contest is None:
-                        last_contest = draw.contest_number
-                    
-                    if current_delay_count > 0:
-                        delays.append(current_delay_count)
-                    current_delay_count = 0
-                else:
-                    current_delay_count += 1
-            
-            # Add final delay if number hasn't appeared recently
-            if current_delay_count > 0:
-                delays.append(current_delay_count)
-            
-            # Calculate delay metrics
-            current_delay = latest_contest - last_contest if last_contest else latest_contest
-            max_delay = max(delays) if delays else 0
-            avg_delay = sum(delays) / len(delays) if delays else 0.0
-            
-            # Update or create statistics
-            stat = db.query(NumberStatistics).filter(
-                NumberStatistics.lottery_type == lottery_type,
-                NumberStatistics.number == number
-            ).first()
-            
-            if stat:
-                stat.frequency = frequency
-                stat.last_draw_contest = last_contest
-                stat.delay = current_delay
-                stat.max_delay = max_delay
-                stat.average_delay = avg_delay
-            else:
-                stat = NumberStatistics(
-                    lottery_type=lottery_type,
-                    number=number,
-                    frequency=frequency,
-                    last_draw_contest=last_contest,
-                    delay=current_delay,
-                    max_delay=max_delay,
-                    average_delay=avg_delay
-                )
-                db.add(stat)
+        latest = latest_contest(rows)
+        if not config or len(rows) < config.total_numbers or latest is None or draws[0][0] <= latest:
+            await StatisticsService.calculate_statistics(db, lottery_type)
+            return
         
-        db.commit()
-        logger.info(f"Statistics calculated successfully for {lottery_type}")
+        for contest_number, numbers in draws:
+            apply_draw(rows, contest_number, numbers)
+        await StatisticsService._save_rows(db, lottery_type, rows)
+        draw_histories.invalidate(lottery_type)
+        await StatisticsService._publish(db, lottery_type)
+        logger.info(f"Statistics updated for {lottery_type} contests {draws[0][0]}-{draws[-1][0]}")
     
     @staticmethod
-    def get_statistics(
-        db: Session,
+    async def get_statistics(
+        db: AsyncSession,
         lottery_type: str,
         limit: Optional[int] = None
-    ) -> List[NumberStatistics]:
-        """Get statistics for a lottery type"""
-        query = db.query(NumberStatistics).filter(
-            NumberStatistics.lottery_type == lottery_type
-        ).order_by(NumberStatistics.number)
+    ) -> List[Dict[str, Any]]:
+        """Get statistics for a lottery type
         
-        if limit:
-            query = query.limit(limit)
+        Served from the versioned cache; concurrent misses share one query.
+        """
+        async def build() -> bytes:
+            rows = await StatisticsService._load_rows(db, lottery_type)
+            await StatisticsService._set_validators(lottery_type, rows)
+            return pack_rows(rows)
         
-        return query.all()
+        rows = unpack_rows(await statistics_cache.get_or_build(lottery_type, build))
+        return rows[:limit] if limit else rows
     
     @staticmethod
-    def get_most_frequent(
-        db: Session,
+    async def get_most_frequent(
+        db: AsyncSession,
         lottery_type: str,
         limit: int = 10
-    ) -> List[NumberStatistics]:
+    ) -> List[Dict[str, Any]]:
         """Get most frequent numbers"""
-        return db.query(NumberStatistics).filter(
-            NumberStatistics.lottery_type == lottery_type
-        ).order_by(desc(NumberStatistics.frequency)).limit(limit).all()
+        rows = await StatisticsService.get_statistics(db, lottery_type)
+        return sorted(rows, key=lambda row: -row["frequency"])[:limit]
     
     @staticmethod
-    def get_most_delayed(
-        db: Session,
+    async def get_most_delayed(
+        db: AsyncSession,
         lottery_type: str,
         limit: int = 10
-    ) -> List[NumberStatistics]:
+    ) -> List[Dict[str, Any]]:
         """Get most delayed numbers"""
-        return db.query(NumberStatistics).filter(
-            NumberStatistics.lottery_type == lottery_type
-        ).order_by(desc(NumberStatistics.delay)).limit(limit).all()
+        rows = await StatisticsService.get_statistics(db, lottery_type)
+        return sorted(rows, key=lambda row: -row["delay"])[:limit]
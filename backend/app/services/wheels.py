@@ -0,0 +1,81 @@
+"""
+Serviço de fechamentos (wheels)
+Gera o menor conjunto de jogos com garantia de acertos
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.workers import cpu_pool
+from app.services.history import get_draw_history
+from lottery_engine import WheelCache
+from typing import List, Optional, Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Solved designs depend only on (v, k, m, t), so they are shared by every lottery
+wheel_cache = WheelCache(time_budget=settings.WHEEL_TIME_BUDGET_SECONDS)
+
+
+def _solve_wheel(v: int, k: int, m: int, t: int):
+    # Worker task; in a process pool each worker keeps its own cache
+    return wheel_cache.get(v, k, m, t)
+
+
+class WheelGeneratorService:
+    """Serviço para geração de fechamentos"""
+
+    @staticmethod
+    async def generate_wheel(
+        db: AsyncSession,
+        lottery_type: str,
+        numbers: List[int],
+        guarantee: int,
+        if_drawn: Optional[int] = None,
+        numbers_per_game: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Gerar um fechamento sobre os números escolhidos
+
+        Garante pelo menos `guarantee` acertos em algum jogo sempre que
+        `if_drawn` dos números sorteados estiverem entre os escolhidos.
+        """
+        history = await get_draw_history(db, lottery_type)
+
+        numbers_per_game = numbers_per_game or history.numbers_to_pick
+        if_drawn = if_drawn or min(history.numbers_to_pick, len(numbers))
+
+        if len(numbers) != len(set(numbers)):
+            raise ValueError("Números duplicados encontrados")
+        invalid = [n for n in numbers if n < 1 or n > history.total_numbers]
+        if invalid:
+            raise ValueError(f"Números fora do intervalo (1-{history.total_numbers}): {invalid}")
+        min_numbers = history.min_bet_numbers or history.numbers_to_pick
+        max_numbers = history.max_bet_numbers or history.numbers_to_pick
+        if not min_numbers <= numbers_per_game <= max_numbers:
+            raise ValueError(f"Jogos de {numbers_per_game} números não são permitidos em {lottery_type}")
+        if if_drawn > history.numbers_to_pick:
+            raise ValueError(f"Apenas {history.numbers_to_pick} números são sorteados em {lottery_type}")
+
+        logger.info(
+            f"Gerando fechamento L({len(numbers)}, {numbers_per_game}, {if_drawn}, {guarantee}) para {lottery_type}"
+        )
+        # The solver stops at its time budget, so allow for it on top of the pool timeout
+        design, cached = await cpu_pool.run(
+            _solve_wheel, len(numbers), numbers_per_game, if_drawn, guarantee,
+            timeout=settings.WHEEL_TIME_BUDGET_SECONDS + settings.WORKER_TASK_TIMEOUT_SECONDS
+        )
+        games = design.games(numbers)
+
+        return {
+            "lottery_type": lottery_type,
+            "numbers": sorted(numbers),
+            "combinations": games,
+            "metadata": {
+                "numbers_per_game": numbers_per_game,
+                "total_games": len(games),
+                "guarantee": guarantee,
+                "if_drawn": if_drawn,
+                "complete": design.complete,
+                "cached": cached,
+                "solve_seconds": round(design.solve_seconds, 3),
+            }
+        }
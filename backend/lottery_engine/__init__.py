@@ -0,0 +1,194 @@
+"""
+Framework-independent lottery engine.
+
+Pure NumPy building blocks shared by the Django app (``lotteries``) and the
+FastAPI backend (``app``). Nothing in this package touches an ORM: callers
+load rows from their own database layer and hand plain numbers in.
+"""
+from lottery_engine.backtest import STRATEGIES, run_backtest, summarize_backtest
+from lottery_engine.bitmask import (
+    decode_mask,
+    encode_mask,
+    encode_words,
+    join_mask,
+    masks_from_matrix,
+    masks_from_numbers,
+    match_count,
+    popcount,
+)
+from lottery_engine.cache import (
+    CACHE_KEY_PREFIX,
+    CACHE_TTLS,
+    AsyncRedisStore,
+    AsyncVersionedCache,
+    MemoryStore,
+    VersionedCache,
+    conditional_validators,
+    make_cache_key,
+    pack_rows,
+    unpack_rows,
+    validators_key,
+)
+from lottery_engine.checker import (
+    count_hits,
+    hit_histogram,
+    score_tickets,
+    summarize_history,
+    summarize_hits,
+    tier_histogram,
+)
+from lottery_engine.codec import (
+    rank_combination,
+    rank_combinations,
+    unrank_combination,
+    unrank_combinations,
+)
+from lottery_engine.counting import ConstrainedSampler, CountingFilters, constrained_sampler
+from lottery_engine.export import (
+    DRAW_EXPORT_COLUMNS,
+    EXPORT_CHUNK_ROWS,
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+    STATISTICS_EXPORT_COLUMNS,
+    ExportWriter,
+    batched,
+    export_chunks,
+)
+from lottery_engine.generation import iter_unique_games, max_unique_games
+from lottery_engine.history import AsyncHistoryRegistry, DrawHistory, HistoryRegistry
+from lottery_engine.ingest import (
+    INGEST_BATCH_ROWS,
+    INGEST_FORMATS,
+    DrawColumns,
+    IngestError,
+    IngestReport,
+    iter_draw_batches,
+    parse_draw_row,
+    read_result_rows,
+)
+from lottery_engine.odds import bet_odds, hit_counts, score_bet, sub_game_hits
+from lottery_engine.pagination import (
+    LAST_PAGE,
+    Cursor,
+    KeysetPage,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+    scan_descending,
+)
+from lottery_engine.prizes import PRIZE_TIERS, prize_tiers, tier_name, winning_hits
+from lottery_engine.processes import (
+    configure_processes,
+    map_chunks,
+    process_pool_size,
+    shared_executor,
+    shutdown_processes,
+)
+from lottery_engine.sampling import WEIGHTINGS, AliasTable, number_weights
+from lottery_engine.simulation import random_draw_masks, simulate_draws, summarize_simulation
+from lottery_engine.space import CombinationSpace, SpaceFilters, build_space
+from lottery_engine.statistics import (
+    HistoryStatistics,
+    apply_draw,
+    build_incidence_matrix,
+    compute_statistics,
+    latest_contest,
+)
+from lottery_engine.wheels import WheelCache, WheelDesign, solve_wheel, verify_wheel
+
+__all__ = [
+    "AliasTable",
+    "AsyncHistoryRegistry",
+    "AsyncRedisStore",
+    "AsyncVersionedCache",
+    "CACHE_KEY_PREFIX",
+    "CACHE_TTLS",
+    "CombinationSpace",
+    "ConstrainedSampler",
+    "CountingFilters",
+    "Cursor",
+    "DRAW_EXPORT_COLUMNS",
+    "DrawColumns",
+    "DrawHistory",
+    "EXPORT_CHUNK_ROWS",
+    "EXPORT_DATASETS",
+    "EXPORT_FORMATS",
+    "ExportWriter",
+    "HistoryRegistry",
+    "HistoryStatistics",
+    "INGEST_BATCH_ROWS",
+    "INGEST_FORMATS",
+    "IngestError",
+    "IngestReport",
+    "KeysetPage",
+    "LAST_PAGE",
+    "MemoryStore",
+    "PRIZE_TIERS",
+    "STATISTICS_EXPORT_COLUMNS",
+    "STRATEGIES",
+    "SpaceFilters",
+    "VersionedCache",
+    "WEIGHTINGS",
+    "WheelCache",
+    "WheelDesign",
+    "apply_draw",
+    "batched",
+    "bet_odds",
+    "build_incidence_matrix",
+    "build_space",
+    "compute_statistics",
+    "conditional_validators",
+    "configure_processes",
+    "constrained_sampler",
+    "count_hits",
+    "decode_cursor",
+    "decode_mask",
+    "encode_cursor",
+    "encode_mask",
+    "encode_words",
+    "export_chunks",
+    "hit_counts",
+    "hit_histogram",
+    "iter_draw_batches",
+    "iter_unique_games",
+    "join_mask",
+    "keyset_page",
+    "latest_contest",
+    "make_cache_key",
+    "map_chunks",
+    "masks_from_matrix",
+    "masks_from_numbers",
+    "match_count",
+    "max_unique_games",
+    "number_weights",
+    "pack_rows",
+    "parse_draw_row",
+    "popcount",
+    "prize_tiers",
+    "process_pool_size",
+    "random_draw_masks",
+    "rank_combination",
+    "rank_combinations",
+    "read_result_rows",
+    "run_backtest",
+    "scan_descending",
+    "score_bet",
+    "score_tickets",
+    "shared_executor",
+    "shutdown_processes",
+    "simulate_draws",
+    "solve_wheel",
+    "sub_game_hits",
+    "summarize_backtest",
+    "summarize_history",
+    "summarize_hits",
+    "summarize_simulation",
+    "tier_histogram",
+    "tier_name",
+    "unpack_rows",
+    "unrank_combination",
+    "unrank_combinations",
+    "validators_key",
+    "verify_wheel",
+    "winning_hits",
+]
@@ -0,0 +1,198 @@
+"""
+Strategy backtesting over the draw history.
+
+The history is replayed contest by contest: after folding draw ``i`` into
+the running statistics, each strategy builds its number pool the same way
+the generator services do, draws games from it and scores them against draw
+``i + 1``. Statistics are carried forward incrementally (one vectorized row
+update per contest), never recomputed from scratch.
+
+Contests are split into fixed-size chunks that run on the shared process
+pool (``lottery_engine.processes``). Each chunk seeds its own generator from
+``(seed, chunk start)``, so results are reproducible and do not depend on
+the number of workers.
+"""
+import threading
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lottery_engine.checker import tier_histogram
+from lottery_engine.processes import map_chunks
+
+# Same pool sizes as CombinationGeneratorService
+POOL_SIZE = 20
+MIX_EXTRA = 10
+STRATEGIES = ('random', 'frequent', 'delayed', 'frequent_delayed', 'mixed')
+CHUNK_SIZE = 250
+
+
+def _top(values: np.ndarray, limit: int) -> np.ndarray:
+    """Indices of the highest values; ties keep lower numbers first."""
+    return np.argsort(-values, kind='stable')[:limit]
+
+
+def _pool(
+    strategy: str,
+    frequency: np.ndarray,
+    delay: np.ndarray,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """Boolean pool of number indices for one strategy."""
+    pool = np.zeros(len(frequency), dtype=bool)
+    if strategy == 'random':
+        pool[:] = True
+        return pool
+    if strategy in ('frequent', 'frequent_delayed', 'mixed'):
+        pool[_top(frequency, POOL_SIZE)] = True
+    if strategy in ('delayed', 'frequent_delayed', 'mixed'):
+        pool[_top(delay, POOL_SIZE)] = True
+    if strategy == 'mixed':
+        rest = np.flatnonzero(~pool)
+        pool[rng.choice(rest, size=min(MIX_EXTRA, len(rest)), replace=False)] = True
+    return pool
+
+
+def _games(
+    pool: np.ndarray,
+    numbers_count: int,
+    games_count: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Draw games uniformly from the pool, topping up from the other numbers
+    when the pool is smaller than a game.
+
+    Returns:
+        (games_count, numbers_count) array of number indices
+    """
+    # Pool members get keys in [0, 1), the rest in [1, 2): the smallest keys win
+    keys = rng.random((games_count, len(pool))) + ~pool
+    return np.argpartition(keys, numbers_count - 1, axis=1)[:, :numbers_count]
+
+
+def _state_after(contests: np.ndarray, matrix: np.ndarray, index: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Frequency and last-seen contest (-1 = never) after folding draws 0..index."""
+    seen = matrix[:index + 1]
+    frequency = seen.sum(axis=0, dtype=np.int64)
+    last_row = index - seen[::-1].argmax(axis=0)
+    last_seen = np.where(frequency > 0, contests[last_row], -1)
+    return frequency, last_seen
+
+
+def _run_chunk(
+    contests: np.ndarray,
+    matrix: np.ndarray,
+    start: int,
+    stop: int,
+    strategies: Sequence[str],
+    numbers_count: int,
+    games_count: int,
+    seed: int
+) -> Dict[str, np.ndarray]:
+    """Replay steps ``start .. stop - 1`` (stats after draw i, scored on draw i + 1)."""
+    rng = np.random.default_rng([seed, start])
+    counts = {strategy: np.zeros(numbers_count + 1, dtype=np.int64) for strategy in strategies}
+
+    frequency, last_seen = _state_after(contests, matrix, start)
+    for index in range(start, stop):
+        if index > start:
+            drawn = matrix[index]
+            frequency += drawn
+            last_seen[drawn] = contests[index]
+        delay = np.where(last_seen >= 0, contests[index] - last_seen, 0)
+        upcoming = matrix[index + 1]
+
+        for strategy in strategies:
+            games = _games(_pool(strategy, frequency, delay, rng), numbers_count, games_count, rng)
+            hits = upcoming[games].sum(axis=1)
+            counts[strategy] += np.bincount(hits, minlength=numbers_count + 1)
+    return counts
+
+
+def run_backtest(
+    contest_numbers: Sequence[int],
+    matrix: np.ndarray,
+    numbers_count: int,
+    games_per_contest: int = 10,
+    strategies: Iterable[str] = STRATEGIES,
+    seed: Optional[int] = None,
+    warmup: int = 1,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    cancel: Optional[threading.Event] = None
+) -> Dict[str, object]:
+    """
+    Replay the history and score every strategy against each next draw.
+
+    Args:
+        contest_numbers: Contest number of each matrix row, ascending
+        matrix: Incidence matrix from ``build_incidence_matrix``
+        numbers_count: Numbers per game
+        games_per_contest: Games each strategy plays per contest
+        strategies: Names from ``STRATEGIES``
+        seed: Seed for reproducible runs (random when omitted, and returned)
+        warmup: Draws folded into the statistics before the first game
+        workers: Chunks run at once on the shared process pool (None = the
+            whole pool, 1 = run inline)
+        chunk_size: Contests per pool task
+        cancel: Set to abandon the run; no further chunk starts and
+            ``concurrent.futures.CancelledError`` is raised
+
+    Returns:
+        Dict with seed, steps, first/last scored contest and, per strategy,
+        a hit count array of length ``numbers_count + 1``
+    """
+    contests = np.asarray(contest_numbers, dtype=np.int64)
+    matrix = np.asarray(matrix, dtype=bool)
+    strategies = tuple(strategies)
+    unknown = set(strategies) - set(STRATEGIES)
+    if unknown:
+        raise ValueError(f"Estratégias desconhecidas: {sorted(unknown)}")
+    if not 1 <= numbers_count <= matrix.shape[1]:
+        raise ValueError(f"Jogos devem ter entre 1 e {matrix.shape[1]} números")
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % (1 << 63))
+
+    first, last = max(warmup, 1) - 1, len(contests) - 1
+    chunks = [(start, min(start + chunk_size, last)) for start in range(first, last, chunk_size)]
+    counts = {strategy: np.zeros(numbers_count + 1, dtype=np.int64) for strategy in strategies}
+    args = (strategies, numbers_count, games_per_contest, seed)
+
+    # The history is small (contests x numbers booleans): it travels with each chunk
+    tasks = [(contests, matrix, start, stop, *args) for start, stop in chunks]
+    results = map_chunks(_run_chunk, tasks, workers, cancel)
+
+    for result in results:
+        for strategy, chunk_counts in result.items():
+            counts[strategy] += chunk_counts
+
+    return {
+        'seed': seed,
+        'steps': max(last - first, 0),
+        'first_contest': int(contests[first + 1]) if last > first else None,
+        'last_contest': int(contests[last]) if last > first else None,
+        'counts': counts,
+    }
+
+
+def summarize_backtest(lottery_type: str, result: Dict[str, object]) -> Dict[str, Dict[str, object]]:
+    """
+    Per-strategy hit and prize tier histograms from ``run_backtest`` counts.
+
+    Returns:
+        Dict of strategy -> games, mean_hits, hit_histogram, prize_tiers, winners
+    """
+    summary = {}
+    for strategy, counts in result['counts'].items():
+        games = int(counts.sum())
+        histogram = {hit: int(count) for hit, count in enumerate(counts)}
+        tiers = tier_histogram(lottery_type, histogram)
+        summary[strategy] = {
+            'games': games,
+            'mean_hits': float(counts @ np.arange(len(counts)) / games) if games else 0.0,
+            'hit_histogram': histogram,
+            'prize_tiers': tiers,
+            'winners': sum(tiers.values()),
+        }
+    return summary
@@ -0,0 +1,111 @@
+"""
+Bitmask encoding of lottery numbers.
+
+Number ``n`` maps to bit ``n - 1``. Masks are split into 64-bit words so
+every supported lottery (up to 80 numbers for Quina) fits in two words:
+word 0 holds numbers 1..64 and word 1 numbers 65..128. Databases store each
+word as a signed BIGINT (two's complement), which keeps bitwise AND
+filters working in SQL.
+"""
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from lottery_engine.statistics import build_incidence_matrix
+
+WORD_BITS = 64
+MASK_WORDS = 2
+MAX_NUMBER = WORD_BITS * MASK_WORDS
+
+_WORD_MASK = (1 << WORD_BITS) - 1
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def encode_mask(numbers: Iterable[int]) -> int:
+    """Encode numbers as a single Python int; values outside 1..MAX_NUMBER are ignored."""
+    mask = 0
+    for number in numbers:
+        if 1 <= number <= MAX_NUMBER:
+            mask |= 1 << (number - 1)
+    return mask
+
+
+def decode_mask(mask: int) -> List[int]:
+    """Return the sorted numbers whose bits are set."""
+    numbers = []
+    while mask:
+        low_bit = mask & -mask
+        numbers.append(low_bit.bit_length())
+        mask ^= low_bit
+    return numbers
+
+
+def to_signed(word: int) -> int:
+    """Reinterpret an unsigned 64-bit word as a signed BIGINT value."""
+    return word - (1 << WORD_BITS) if word >= 1 << (WORD_BITS - 1) else word
+
+
+def to_unsigned(word: int) -> int:
+    """Reinterpret a signed BIGINT value as an unsigned 64-bit word."""
+    return word & _WORD_MASK
+
+
+def split_mask(mask: int) -> Tuple[int, int]:
+    """Split a mask into (low, high) signed BIGINT words for storage."""
+    return to_signed(mask & _WORD_MASK), to_signed((mask >> WORD_BITS) & _WORD_MASK)
+
+
+def join_mask(low: int, high: int) -> int:
+    """Rebuild a mask from its stored (low, high) words."""
+    return to_unsigned(low) | (to_unsigned(high or 0) << WORD_BITS)
+
+
+def encode_words(numbers: Iterable[int]) -> Tuple[int, int]:
+    """Encode numbers straight into stored (low, high) words."""
+    return split_mask(encode_mask(numbers))
+
+
+def match_count(mask_a: int, mask_b: int) -> int:
+    """Count numbers present in both masks."""
+    return bin(mask_a & mask_b).count('1')
+
+
+def masks_from_matrix(matrix: np.ndarray) -> np.ndarray:
+    """
+    Pack a boolean (rows x numbers) incidence matrix into uint64 words.
+
+    Returns:
+        Array of shape (rows, MASK_WORDS) with dtype uint64
+    """
+    rows, total_numbers = matrix.shape
+    padded = np.zeros((rows, MAX_NUMBER), dtype=bool)
+    padded[:, :total_numbers] = matrix
+    # packbits with little bit order puts number 1 in the lowest bit
+    packed = np.packbits(padded, axis=1, bitorder='little')
+    return packed.view('<u8').astype(np.uint64, copy=False).reshape(rows, MASK_WORDS)
+
+
+def masks_from_numbers(games: Iterable[Iterable[int]]) -> np.ndarray:
+    """Encode many games at once into a (games, MASK_WORDS) uint64 array."""
+    if not isinstance(games, np.ndarray):
+        games = list(games)
+        try:
+            # Games of equal size take the rectangular fast path
+            games = np.array(games, dtype=np.int64)
+        except ValueError:
+            pass
+    return masks_from_matrix(build_incidence_matrix(games, MAX_NUMBER))
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """
+    Count set bits over the last axis of a uint64 word array.
+
+    Returns:
+        Array with the last axis reduced, dtype int64
+    """
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(words.shape[:-1] + (-1,))
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=-1, dtype=np.int64)
@@ -0,0 +1,410 @@
+"""
+Versioned, write-through caching with single-flight rebuilds.
+
+Each cached key has a data-version counter stored next to it, and its value
+lives under ``<namespace>:<key>:v<version>``. Writers recompute and
+``publish``: the counter is bumped and the new value stored under the new
+version, so readers switch over atomically and never see a cold cache after
+a recompute. Old versions are dropped, or simply expire.
+
+When a value is missing anyway (first use, eviction), ``get_or_build``
+coalesces the rebuild. A per-key lock serializes callers within the
+process, and a short-lived lock key taken with ``add`` elects one rebuilder
+across processes sharing the store. Everyone else polls for the published
+value and, if the rebuilder stalls, falls back to building it themselves.
+
+The store only needs the subset of Django's cache API used here: ``get``
+(with a default), ``set``, ``add``, ``incr`` (``ValueError`` when the key is
+missing) and ``delete``. Django's cache (local memory or Redis) qualifies as
+is; ``MemoryStore`` is a process-local equivalent and ``AsyncRedisStore`` a
+shared one for asyncio code. Both sides build Redis keys with
+``make_cache_key`` (Django through ``KEY_FUNCTION``), so a version bumped or
+a key deleted by one stack is seen by the other.
+
+Namespaces and their TTLs are declared once in ``CACHE_TTLS``; values shared
+across processes are packed with ``pack_rows`` rather than pickled objects.
+"""
+import asyncio
+import inspect
+import json
+import pickle
+import threading
+import time
+import zlib
+from datetime import date, datetime
+from email.utils import formatdate
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Every cache namespace and the lifetime of each value in it (seconds, None = no expiry)
+CACHE_TTLS: Dict[str, Optional[float]] = {
+    'stats': 3600,
+    # ETag / Last-Modified of each lottery's data, replaced on every recompute; they
+    # expire with the statistics they describe, so writes that bypass the services
+    # stop being masked by an old ETag once the statistics are rebuilt
+    'validators': 3600,
+    # Encoded API responses, keyed by data version (stale versions just expire)
+    'responses': 3600,
+    # Encoded responses with no data version (lottery configurations), bounded by age only
+    'static_responses': 300,
+}
+# Prefix of every key in a shared Redis (Django KEY_PREFIX, FastAPI CACHE_KEY_PREFIX)
+CACHE_KEY_PREFIX = 'lotofacil'
+# How long a rebuild may hold its lock key before others take over (seconds)
+REBUILD_LOCK_TTL = 30
+
+_MISSING = object()
+
+
+def pack_rows(rows: List[Dict[str, Any]]) -> bytes:
+    """
+    Serialize rows with the same fields as compressed columnar JSON.
+
+    Dates and datetimes round-trip as ISO strings; everything else must be
+    JSON-native. A statistics payload is a few hundred bytes.
+    """
+    fields = list(rows[0]) if rows else []
+    columns, kinds = {}, {}
+    for field in fields:
+        values = [row[field] for row in rows]
+        sample = next((value for value in values if value is not None), None)
+        if isinstance(sample, date):
+            kinds[field] = 'datetime' if isinstance(sample, datetime) else 'date'
+            values = [None if value is None else value.isoformat() for value in values]
+        columns[field] = values
+    payload = {'fields': fields, 'kinds': kinds, 'columns': [columns[field] for field in fields]}
+    return zlib.compress(json.dumps(payload, separators=(',', ':')).encode())
+
+
+def unpack_rows(payload: bytes) -> List[Dict[str, Any]]:
+    """Inverse of ``pack_rows``."""
+    data = json.loads(zlib.decompress(payload))
+    parsers = {'datetime': datetime.fromisoformat, 'date': date.fromisoformat}
+    columns = []
+    for field, values in zip(data['fields'], data['columns']):
+        parse = parsers.get(data['kinds'].get(field))
+        if parse is not None:
+            values = [None if value is None else parse(value) for value in values]
+        columns.append(values)
+    return [dict(zip(data['fields'], row)) for row in zip(*columns)]
+
+
+def validators_key(lottery_type: str) -> str:
+    """Cache key of a lottery's HTTP validators."""
+    return f"validators:{lottery_type}"
+
+
+def conditional_validators(lottery_type: str, rows: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    ETag and Last-Modified of a lottery's data, from its statistics rows.
+
+    The data version is the latest contest counted plus the time the rows
+    were last written, so it moves whenever a draw lands or statistics are
+    recomputed.
+    """
+    latest = max((row['last_draw_contest'] or 0 for row in rows), default=0)
+    updated = max((row['last_updated'] for row in rows if row['last_updated'] is not None), default=None)
+    stamp = updated.timestamp() if updated is not None else 0.0
+    return {
+        # Weak: the same data may be served compressed or not
+        'etag': f'W/"{lottery_type}-{latest}-{int(stamp * 1_000_000):x}"',
+        'last_modified': formatdate(int(stamp), usegmt=True),
+    }
+
+
+class MemoryStore:
+    """Thread-safe in-process store implementing the cache API used here."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def _store(self, key: str, value: Any, timeout: Optional[float]) -> None:
+        if len(self._data) >= self.max_entries and key not in self._data:
+            now = time.monotonic()
+            expired = [k for k, (_, expires) in self._data.items() if expires is not None and expires <= now]
+            for k in expired or list(self._data)[:len(self._data) // 10 + 1]:
+                del self._data[k]
+        self._data[key] = (value, None if timeout is None else time.monotonic() + timeout)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._live(key)
+            return default if entry is None else entry[0]
+
+    def set(self, key: str, value: Any, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, value, timeout)
+
+    def add(self, key: str, value: Any, timeout: Optional[float] = None) -> bool:
+        """Store only if the key is absent; True when stored."""
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            self._store(key, value, timeout)
+            return True
+
+    def incr(self, key: str, delta: int = 1) -> int:
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = entry[0] + delta
+            self._data[key] = (value, entry[1])
+            return value
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def make_cache_key(key: str, key_prefix: str = '', version: Any = None) -> str:
+    """
+    Redis key of a cache key: ``<prefix>:<key>``.
+
+    Also Django's ``KEY_FUNCTION`` for the shared Redis cache, so Django and
+    ``AsyncRedisStore`` address the same keys. Django's per-key ``version``
+    is left out: the caches here version their values themselves.
+    """
+    return f"{key_prefix}:{key}" if key_prefix else key
+
+
+class AsyncRedisStore:
+    """
+    The same cache API over a ``redis.asyncio`` client; every method is a coroutine.
+
+    Values are encoded like Django's ``RedisCache``: integers are stored as
+    Redis integers (so ``incr`` is atomic), anything else is pickled.
+    """
+
+    def __init__(self, client: Any, prefix: str = ''):
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return make_cache_key(key, self.prefix)
+
+    @staticmethod
+    def _dumps(value: Any) -> Any:
+        return value if type(value) is int else pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _loads(value: bytes) -> Any:
+        try:
+            return int(value)
+        except ValueError:
+            return pickle.loads(value)
+
+    @staticmethod
+    def _px(timeout: Optional[float]) -> Optional[int]:
+        return None if timeout is None else max(1, int(timeout * 1000))
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        value = await self.client.get(self._key(key))
+        return default if value is None else self._loads(value)
+
+    async def set(self, key: str, value: Any, timeout: Optional[float] = None) -> None:
+        await self.client.set(self._key(key), self._dumps(value), px=self._px(timeout))
+
+    async def add(self, key: str, value: Any, timeout: Optional[float] = None) -> bool:
+        return bool(await self.client.set(self._key(key), self._dumps(value), px=self._px(timeout), nx=True))
+
+    async def incr(self, key: str, delta: int = 1) -> int:
+        if not await self.client.exists(self._key(key)):
+            raise ValueError(f"Key '{key}' not found")
+        return await self.client.incrby(self._key(key), delta)
+
+    async def delete(self, key: str) -> bool:
+        return bool(await self.client.delete(self._key(key)))
+
+    async def clear(self) -> None:
+        await self.client.flushdb()
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class _VersionedKeys:
+    """Key layout and settings shared by both caches."""
+
+    def __init__(
+        self,
+        store: Any,
+        namespace: str,
+        timeout: Optional[float] = None,
+        lock_timeout: float = REBUILD_LOCK_TTL,
+        wait_timeout: float = 10.0,
+        poll_interval: float = 0.05
+    ):
+        self.store = store
+        self.namespace = namespace
+        self.timeout = timeout if timeout is not None else CACHE_TTLS[namespace]
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    def _version_key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key}:version"
+
+    def _data_key(self, key: Hashable, version: int) -> str:
+        return f"{self.namespace}:{key}:v{version}"
+
+    def _lock_key(self, key: Hashable, version: int) -> str:
+        return f"{self._data_key(key, version)}:lock"
+
+
+def _initial_version() -> int:
+    # Seeded from the clock so a lost counter never reuses an older version
+    return time.time_ns() // 1_000_000
+
+
+class VersionedCache(_VersionedKeys):
+    """Versioned cache for threaded callers (``build`` is a plain function)."""
+
+    def __init__(self, store: Any, namespace: str, **kwargs: Any):
+        super().__init__(store, namespace, **kwargs)
+        self._locks: Dict[Hashable, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key: Hashable) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def version(self, key: Hashable) -> int:
+        """Current data version of ``key``, created on first use."""
+        version = self.store.get(self._version_key(key))
+        if version is None:
+            self.store.add(self._version_key(key), _initial_version(), None)
+            version = self.store.get(self._version_key(key))
+        return version
+
+    def bump(self, key: Hashable) -> int:
+        """Move ``key`` to a new data version; the old value stops being served."""
+        try:
+            return self.store.incr(self._version_key(key))
+        except ValueError:
+            self.version(key)
+            return self.store.incr(self._version_key(key))
+
+    def publish(self, key: Hashable, value: Any) -> int:
+        """Write-through: store ``value`` as the new version of ``key``."""
+        previous = self.store.get(self._version_key(key))
+        version = self.bump(key)
+        self.store.set(self._data_key(key, version), value, self.timeout)
+        if previous is not None:
+            self.store.delete(self._data_key(key, previous))
+        return version
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the current value of ``key``, rebuilding it once on a miss."""
+        version = self.version(key)
+        data_key = self._data_key(key, version)
+        value = self.store.get(data_key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock_for(key):
+            value = self.store.get(data_key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            lock_key = self._lock_key(key, version)
+            if self.store.add(lock_key, 1, self.lock_timeout):
+                try:
+                    value = build()
+                    self.store.set(data_key, value, self.timeout)
+                finally:
+                    self.store.delete(lock_key)
+                return value
+
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                value = self.store.get(data_key, _MISSING)
+                if value is not _MISSING:
+                    return value
+            return build()
+
+
+class AsyncVersionedCache(_VersionedKeys):
+    """
+    ``VersionedCache`` for asyncio callers: ``build`` is a coroutine function.
+
+    The store's methods may be plain (``MemoryStore``) or coroutines
+    (``AsyncRedisStore``).
+    """
+
+    def __init__(self, store: Any, namespace: str, **kwargs: Any):
+        super().__init__(store, namespace, **kwargs)
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    async def _call(self, method: str, *args: Any) -> Any:
+        result = getattr(self.store, method)(*args)
+        return await result if inspect.isawaitable(result) else result
+
+    async def version(self, key: Hashable) -> int:
+        """Current data version of ``key``, created on first use."""
+        version = await self._call('get', self._version_key(key))
+        if version is None:
+            await self._call('add', self._version_key(key), _initial_version(), None)
+            version = await self._call('get', self._version_key(key))
+        return version
+
+    async def bump(self, key: Hashable) -> int:
+        """Move ``key`` to a new data version; the old value stops being served."""
+        try:
+            return await self._call('incr', self._version_key(key))
+        except ValueError:
+            await self.version(key)
+            return await self._call('incr', self._version_key(key))
+
+    async def publish(self, key: Hashable, value: Any) -> int:
+        """Write-through: store ``value`` as the new version of ``key``."""
+        previous = await self._call('get', self._version_key(key))
+        version = await self.bump(key)
+        await self._call('set', self._data_key(key, version), value, self.timeout)
+        if previous is not None:
+            await self._call('delete', self._data_key(key, previous))
+        return version
+
+    async def get_or_build(self, key: Hashable, build: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the current value of ``key``, rebuilding it once on a miss."""
+        version = await self.version(key)
+        data_key = self._data_key(key, version)
+        value = await self._call('get', data_key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # Single event loop thread: setdefault needs no extra guard
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            value = await self._call('get', data_key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+            lock_key = self._lock_key(key, version)
+            if await self._call('add', lock_key, 1, self.lock_timeout):
+                try:
+                    value = await build()
+                    await self._call('set', data_key, value, self.timeout)
+                finally:
+                    await self._call('delete', lock_key)
+                return value
+
+            deadline = time.monotonic() + self.wait_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.poll_interval)
+                value = await self._call('get', data_key, _MISSING)
+                if value is not _MISSING:
+                    return value
+            return await build()
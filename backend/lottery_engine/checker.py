@@ -0,0 +1,141 @@
+"""
+Vectorized result checking.
+
+Tickets and draws are compared as bitmask words: the hit count of a ticket
+is the popcount of the AND between its mask and the draw's mask.
+"""
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from lottery_engine.bitmask import popcount
+from lottery_engine.odds import score_bet
+from lottery_engine.prizes import prize_tiers
+
+
+def count_hits(ticket_masks: np.ndarray, draw_masks: np.ndarray) -> np.ndarray:
+    """
+    Count hits of tickets against draws.
+
+    Args:
+        ticket_masks: (tickets, MASK_WORDS) uint64 array
+        draw_masks: (MASK_WORDS,) words of one draw, or (draws, MASK_WORDS)
+
+    Returns:
+        (tickets,) hit counts for one draw, or (draws, tickets) for many
+    """
+    if draw_masks.ndim == 1:
+        return popcount(ticket_masks & draw_masks)
+    return popcount(draw_masks[:, np.newaxis, :] & ticket_masks[np.newaxis, :, :])
+
+
+def hit_histogram(hits: np.ndarray, max_hits: int) -> Dict[int, int]:
+    """Number of occurrences of each hit count from 0 to ``max_hits``."""
+    counts = np.bincount(np.asarray(hits).ravel(), minlength=max_hits + 1)
+    return {hit: int(count) for hit, count in enumerate(counts)}
+
+
+def tier_histogram(lottery_type: str, histogram: Dict[int, int]) -> Dict[str, int]:
+    """Group a hit histogram by prize tier name, highest tier first."""
+    tiers = prize_tiers(lottery_type)
+    return {
+        name: histogram.get(hits, 0)
+        for hits, name in sorted(tiers.items(), reverse=True)
+    }
+
+
+def score_tickets(
+    lottery_type: str,
+    hits: np.ndarray,
+    bet_sizes: np.ndarray,
+    game_size: int
+) -> Tuple[Dict[str, int], int]:
+    """
+    Winning sub-games per prize tier over many bets, highest tier first.
+
+    Each distinct (bet size, hits) pair is scored once with ``score_bet``.
+
+    Returns:
+        (sub-games per tier name, bets winning at least one sub-game)
+    """
+    tiers = {name: 0 for _, name in sorted(prize_tiers(lottery_type).items(), reverse=True)}
+    winners = 0
+    pairs = np.stack([np.asarray(bet_sizes).ravel(), np.asarray(hits).ravel()], axis=1)
+    if not len(pairs):
+        return tiers, winners
+    for (bet_size, bet_hits), count in zip(*np.unique(pairs, axis=0, return_counts=True)):
+        scored = score_bet(lottery_type, int(bet_size), int(bet_hits), game_size)
+        for name, sub_games in scored.items():
+            tiers[name] += sub_games * int(count)
+        if any(scored.values()):
+            winners += int(count)
+    return tiers, winners
+
+
+def summarize_hits(
+    lottery_type: str,
+    hits: np.ndarray,
+    max_hits: int,
+    bet_sizes: Optional[np.ndarray] = None,
+    game_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Summarize ticket hit counts into histograms and a winner count.
+
+    With ``bet_sizes`` and ``game_size``, bets larger than the base game are
+    scored as all their sub-games, so ``prize_tiers`` counts winning sub-games.
+
+    Returns:
+        Dict with hit_histogram, prize_tiers and winners
+    """
+    histogram = hit_histogram(hits, max_hits)
+    if bet_sizes is None or game_size is None:
+        tiers = tier_histogram(lottery_type, histogram)
+        winners = sum(tiers.values())
+    else:
+        tiers, winners = score_tickets(lottery_type, hits, bet_sizes, game_size)
+    return {
+        'hit_histogram': histogram,
+        'prize_tiers': tiers,
+        'winners': winners,
+    }
+
+
+def summarize_history(
+    lottery_type: str,
+    contest_numbers: np.ndarray,
+    hits: np.ndarray,
+    max_hits: int,
+    bet_size: Optional[int] = None,
+    game_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Summarize how one ticket did across a whole draw history.
+
+    Args:
+        lottery_type: Type of lottery
+        contest_numbers: (draws,) contest number of each draw
+        hits: (draws,) hit count of the ticket in each draw
+        max_hits: Highest hit count to report in the histogram
+        bet_size: Numbers in the ticket; with ``game_size``, larger bets
+            are scored as all their sub-games
+        game_size: Numbers per sub-game (the lottery's base game)
+
+    Returns:
+        Dict with hit_histogram, prize_tiers, prize_contests (indices into
+        the history, ascending), best_hits and best_contests
+    """
+    bet_sizes = None if bet_size is None else np.full(len(hits), bet_size)
+    summary = summarize_hits(lottery_type, hits, max_hits, bet_sizes, game_size)
+    tiers = prize_tiers(lottery_type)
+    if tiers and len(hits):
+        summary['prize_contests'] = np.flatnonzero(hits >= min(tiers)).tolist()
+    else:
+        summary['prize_contests'] = []
+
+    best_hits = int(hits.max(initial=0))
+    summary['best_hits'] = best_hits
+    summary['best_contests'] = (
+        contest_numbers[hits == best_hits].tolist() if len(hits) else []
+    )
+    return summary
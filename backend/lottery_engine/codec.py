@@ -0,0 +1,92 @@
+"""
+Combinatorial rank/unrank codec.
+
+A game of ``k`` distinct numbers is mapped to its colexicographic rank:
+with the numbers sorted ascending as ``n_1 < ... < n_k``, the rank is
+``sum(C(n_i - 1, i))``. Ranks of k-subsets are exactly ``0 .. C(n, k) - 1``
+for any universe ``1..n``, so a game travels as one integer plus its size.
+Colex order is also ascending bitmask order, which makes a Lotofácil rank
+the row index of the game in the precomputed combination space.
+
+Scalar functions use Python ints and accept any size; the batch versions
+work on int64 and need ``C(max_number, k)`` to fit in 63 bits, which holds
+for every supported lottery (C(80, 20) < 2**63).
+"""
+from math import comb
+from typing import Iterable, List
+
+import numpy as np
+
+MAX_NUMBER = 80
+MAX_PICK = 20
+
+# _BINOMIALS[c, i] == C(c, i) for 0 <= c <= MAX_NUMBER, 0 <= i <= MAX_PICK
+_BINOMIALS = np.array(
+    [[comb(c, i) for i in range(MAX_PICK + 1)] for c in range(MAX_NUMBER + 1)],
+    dtype=np.int64,
+)
+
+
+def rank_combination(numbers: Iterable[int]) -> int:
+    """Colex rank of a game (order of ``numbers`` does not matter)."""
+    return sum(comb(number - 1, i) for i, number in enumerate(sorted(numbers), start=1))
+
+
+def unrank_combination(rank: int, k: int) -> List[int]:
+    """Inverse of ``rank_combination``: the sorted ``k`` numbers with that rank."""
+    if rank < 0:
+        raise ValueError(f"Rank must be non-negative, got {rank}")
+    numbers = []
+    for i in range(k, 0, -1):
+        # Largest c with C(c, i) <= rank; start from the smallest candidate
+        c = i - 1
+        while comb(c + 1, i) <= rank:
+            c += 1
+        rank -= comb(c, i)
+        numbers.append(c + 1)
+    return numbers[::-1]
+
+
+def _check_batch_size(k: int) -> None:
+    if not 0 <= k <= MAX_PICK:
+        raise ValueError(f"Batch codec supports games of up to {MAX_PICK} numbers, got {k}")
+
+
+def rank_combinations(games: np.ndarray) -> np.ndarray:
+    """
+    Vectorized ``rank_combination`` over a (games, k) integer array.
+
+    Returns:
+        int64 array of shape (games,)
+    """
+    games = np.asarray(games, dtype=np.int64)
+    if games.size == 0:
+        return np.zeros(len(games), dtype=np.int64)
+    games = np.sort(games, axis=1)
+    k = games.shape[1]
+    _check_batch_size(k)
+    if games.min() < 1 or games.max() > MAX_NUMBER:
+        raise ValueError(f"Numbers must be within 1..{MAX_NUMBER}")
+    positions = np.arange(1, k + 1)
+    return _BINOMIALS[games - 1, positions].sum(axis=1, dtype=np.int64)
+
+
+def unrank_combinations(ranks: np.ndarray, k: int) -> np.ndarray:
+    """
+    Vectorized ``unrank_combination``.
+
+    Returns:
+        (len(ranks), k) int64 array of sorted numbers
+    """
+    _check_batch_size(k)
+    remaining = np.array(ranks, dtype=np.int64)
+    if remaining.size and (remaining.min() < 0 or remaining.max() >= _BINOMIALS[MAX_NUMBER, k]):
+        raise ValueError(f"Ranks must be within 0..C({MAX_NUMBER}, {k}) - 1")
+    games = np.empty((len(remaining), k), dtype=np.int64)
+    for i in range(k, 0, -1):
+        # Column i is non-decreasing in c, so the largest c with C(c, i) <= rank
+        # is one left of the right insertion point
+        c = np.searchsorted(_BINOMIALS[:, i], remaining, side='right') - 1
+        remaining -= _BINOMIALS[c, i]
+        games[:, i - 1] = c + 1
+    return games
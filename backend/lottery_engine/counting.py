@@ -0,0 +1,197 @@
+"""
+Exact counting and uniform sampling of filtered games by dynamic programming.
+
+Numbers ``1..N`` are decided in order (take or skip). The state after each
+decision is (numbers taken, running sum, odd numbers taken, current run of
+consecutive numbers); dimensions whose filter is not set collapse to size 1.
+Tables are built backwards: ``tables[i][state]`` counts the ways to finish a
+valid game when numbers ``i + 1 .. N`` are still undecided, so
+``tables[0][0, 0, 0, 0]`` is the exact number of games passing the filters.
+
+Sampling walks the tables forwards: each game draws one integer below the
+total and, at every number, skips it when the integer falls among the
+completions that skip it, otherwise takes it. Every valid game corresponds to
+exactly one integer, so samples are exactly uniform without any rejection,
+and the walk is vectorized across games.
+
+Counts never exceed C(N, k), which fits int64 for every supported lottery.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Upper bound on int64 cells over all tables (8 bytes each)
+MAX_TABLE_CELLS = 16_000_000
+# Table bytes kept by ``constrained_sampler`` across calls (one sampler at the cell limit)
+CACHE_MAX_BYTES = MAX_TABLE_CELLS * 8
+
+_cache: 'OrderedDict[Tuple[int, int, CountingFilters], ConstrainedSampler]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CountingFilters:
+    """Filters supported by the DP sampler; None leaves a bound open."""
+    min_sum: Optional[int] = None
+    max_sum: Optional[int] = None
+    min_odd: Optional[int] = None
+    max_odd: Optional[int] = None
+    max_run: Optional[int] = None
+    fixed_numbers: Tuple[int, ...] = ()
+    excluded_numbers: Tuple[int, ...] = ()
+
+
+class ConstrainedSampler:
+    """Count and uniformly sample k-of-N games under ``CountingFilters``."""
+
+    def __init__(self, total_numbers: int, numbers_count: int, filters: CountingFilters):
+        if not 1 <= numbers_count <= total_numbers:
+            raise ValueError(f"Impossível montar jogos de {numbers_count} números entre {total_numbers}")
+        fixed, excluded = set(filters.fixed_numbers), set(filters.excluded_numbers)
+        if fixed & excluded:
+            raise ValueError(f"Números fixos e excluídos ao mesmo tempo: {sorted(fixed & excluded)}")
+        if any(not 1 <= n <= total_numbers for n in fixed | excluded):
+            raise ValueError(f"Números fora do intervalo (1-{total_numbers})")
+
+        self.total_numbers = total_numbers
+        self.numbers_count = numbers_count
+        self.filters = filters
+
+        k = numbers_count
+        # Largest possible sum, and the tracked range of each dimension
+        top_sum = sum(range(total_numbers - k + 1, total_numbers + 1))
+        track_sum = filters.min_sum is not None or filters.max_sum is not None
+        track_odd = filters.min_odd is not None or filters.max_odd is not None
+        track_run = filters.max_run is not None
+        max_sum = min(top_sum, filters.max_sum if filters.max_sum is not None else top_sum)
+        max_odd = min(k, filters.max_odd if filters.max_odd is not None else k)
+
+        shape = (
+            k + 1,
+            max(max_sum, -1) + 1 if track_sum else 1,
+            max(max_odd, -1) + 1 if track_odd else 1,
+            filters.max_run + 1 if track_run else 1,
+        )
+        if (total_numbers + 1) * int(np.prod(shape)) > MAX_TABLE_CELLS:
+            raise ValueError("Filtros amplos demais para a contagem exata; restrinja soma, ímpares ou sequência")
+        self._track = (track_sum, track_odd, track_run)
+
+        final = np.zeros(shape, dtype=np.int64)
+        if min(shape) > 0:
+            valid = final[k]
+            valid[...] = 1
+            if track_sum:
+                valid[:filters.min_sum or 0] = 0
+            if track_odd:
+                valid[:, :filters.min_odd or 0] = 0
+        tables = [final]
+        for number in range(total_numbers, 0, -1):
+            after = tables[-1]
+            table = np.zeros(shape, dtype=np.int64)
+            if number not in fixed:
+                # Skipping ends the current run
+                table += after[:, :, :, :1]
+            if number not in excluded:
+                ds, do, dr = self._steps(number)
+                if shape[1] > ds and shape[3] > dr:
+                    table[:k, :shape[1] - ds, :shape[2] - do, :shape[3] - dr] += after[1:, ds:, do:, dr:]
+            tables.append(table)
+        tables.reverse()
+        self._tables: List[np.ndarray] = tables
+
+    def _steps(self, number: int) -> Tuple[int, int, int]:
+        """Index shifts of (sum, odd, run) when ``number`` is taken."""
+        track_sum, track_odd, track_run = self._track
+        return (number if track_sum else 0, number % 2 if track_odd else 0, 1 if track_run else 0)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the count tables."""
+        return sum(table.nbytes for table in self._tables)
+
+    @property
+    def count(self) -> int:
+        """Exact number of games passing the filters."""
+        return int(self._tables[0][0, 0, 0, 0]) if self._tables[0].size else 0
+
+    def sample(
+        self,
+        games_count: int,
+        rng: Optional[np.random.Generator] = None,
+        replace: bool = False
+    ) -> np.ndarray:
+        """
+        Draw games uniformly among those passing the filters.
+
+        Without replacement, fewer rows come back when fewer games match.
+
+        Returns:
+            (games, numbers_count) int64 array with sorted rows
+        """
+        total = self.count
+        if not total:
+            raise ValueError("Nenhuma combinação atende aos filtros")
+        rng = rng or np.random.default_rng()
+        if replace:
+            indices = rng.integers(0, total, size=games_count, dtype=np.int64)
+        else:
+            indices = np.sort(rng.choice(total, size=min(games_count, total), replace=False))
+        return self.games_at(indices)
+
+    def games_at(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Games at the given positions (0 .. count - 1) of the filtered set.
+
+        Positions follow the walk: at each number, the games that skip it
+        come before the games that take it.
+
+        Returns:
+            (len(indices), numbers_count) int64 array with sorted rows
+        """
+        remaining = np.array(indices, dtype=np.int64)
+        games_count = len(remaining)
+        taken = np.zeros(games_count, dtype=np.intp)
+        sums = np.zeros(games_count, dtype=np.intp)
+        odds = np.zeros(games_count, dtype=np.intp)
+        games = np.zeros((games_count, self.numbers_count), dtype=np.int64)
+        rows = np.arange(games_count)
+
+        for number in range(1, self.total_numbers + 1):
+            after = self._tables[number]
+            # The run only limits taking, which the tables already priced in
+            skip = after[taken, sums, odds, 0] if number not in self.filters.fixed_numbers else 0
+            take = remaining >= skip
+            remaining = np.where(take, remaining - skip, remaining)
+
+            ds, do, _ = self._steps(number)
+            games[rows[take], taken[take]] = number
+            taken = taken + take
+            sums = sums + take * ds
+            odds = odds + take * do
+        return games
+
+
+def constrained_sampler(total_numbers: int, numbers_count: int, filters: CountingFilters) -> ConstrainedSampler:
+    """
+    Cached ``ConstrainedSampler``: repeated filter sets reuse their tables.
+
+    Least recently used samplers are dropped once the cached tables exceed
+    ``CACHE_MAX_BYTES``; a sampler larger than that is built but not kept.
+    """
+    key = (total_numbers, numbers_count, filters)
+    with _cache_lock:
+        sampler = _cache.get(key)
+        if sampler is not None:
+            _cache.move_to_end(key)
+            return sampler
+
+    sampler = ConstrainedSampler(total_numbers, numbers_count, filters)
+    if sampler.nbytes <= CACHE_MAX_BYTES:
+        with _cache_lock:
+            _cache[key] = sampler
+            while sum(cached.nbytes for cached in _cache.values()) > CACHE_MAX_BYTES:
+                _cache.popitem(last=False)
+    return sampler
@@ -0,0 +1,230 @@
+"""
+Chunked export of draws and number statistics as CSV, NDJSON, Parquet or Arrow.
+
+Rows arrive as tuples in column order, typically straight from a database
+cursor in fixed-size batches (Django ``iterator()``, SQLAlchemy
+``yield_per``). ``ExportWriter`` encodes each batch into bytes as it comes,
+so memory stays bounded by one batch whatever the history size.
+
+Parquet writes one row group per batch and Arrow one record batch per
+batch, both against a fixed schema derived from the column kinds. They need
+the optional ``pyarrow`` package. CSV writes lists as space-separated
+numbers, and CSV and NDJSON write dates and decimals as strings.
+"""
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Media type of each export format
+EXPORT_FORMATS: Dict[str, str] = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+# (column, kind) of each dataset; kinds drive encoding and the Arrow schema
+DRAW_EXPORT_COLUMNS: List[Tuple[str, str]] = [
+    ('lottery_type', 'str'),
+    ('contest_number', 'int'),
+    ('draw_date', 'date'),
+    ('numbers', 'int_list'),
+    ('numbers_second_draw', 'int_list'),
+    ('prize_amount', 'decimal'),
+    ('winners_count', 'int'),
+    ('accumulated', 'bool'),
+    ('next_estimated_prize', 'decimal'),
+]
+
+STATISTICS_EXPORT_COLUMNS: List[Tuple[str, str]] = [
+    ('lottery_type', 'str'),
+    ('number', 'int'),
+    ('frequency', 'int'),
+    ('last_draw_contest', 'int'),
+    ('delay', 'int'),
+    ('max_delay', 'int'),
+    ('average_delay', 'float'),
+    ('last_updated', 'datetime'),
+]
+
+EXPORT_DATASETS: Dict[str, List[Tuple[str, str]]] = {
+    'draws': DRAW_EXPORT_COLUMNS,
+    'statistics': STATISTICS_EXPORT_COLUMNS,
+}
+
+# Rows encoded together (one Parquet row group / Arrow record batch)
+EXPORT_CHUNK_ROWS = 10_000
+
+
+def _int_list(value: Any) -> Optional[List[int]]:
+    # JSON columns may come back as text on some backends
+    if isinstance(value, str):
+        value = json.loads(value)
+    return None if value is None else [int(n) for n in value]
+
+
+def _text(value: Any, kind: str) -> Any:
+    """Value as written to CSV / NDJSON."""
+    if value is None:
+        return None
+    if kind == 'int_list':
+        return _int_list(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _arrow_type(kind: str):
+    import pyarrow as pa
+
+    return {
+        'str': pa.string(),
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'bool': pa.bool_(),
+        'date': pa.date32(),
+        'datetime': pa.timestamp('us', tz='UTC'),
+        'decimal': pa.decimal128(15, 2),
+        'int_list': pa.list_(pa.int16()),
+    }[kind]
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink whose contents are handed out and dropped after each batch."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._parts = b''.join(self._parts), []
+        return data
+
+
+class ExportWriter:
+    """
+    Incremental encoder for one export.
+
+    Call ``write`` with each batch of row tuples and send the bytes it
+    returns, then send what ``close`` returns (header of an empty CSV, the
+    Parquet footer).
+    """
+
+    def __init__(self, columns: Sequence[Tuple[str, str]], fmt: str):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt} (use {', '.join(EXPORT_FORMATS)})")
+        self.columns = list(columns)
+        self.fmt = fmt
+        self._started = False
+        self._sink: Optional[_Drain] = None
+        self._writer = None
+        if fmt in ('parquet', 'arrow'):
+            self._open_arrow()
+
+    @property
+    def media_type(self) -> str:
+        return EXPORT_FORMATS[self.fmt]
+
+    def _open_arrow(self) -> None:
+        # Optional dependency: only needed for the columnar formats
+        import pyarrow as pa
+
+        self._schema = pa.schema([(name, _arrow_type(kind)) for name, kind in self.columns])
+        self._sink = _Drain()
+        if self.fmt == 'parquet':
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(self._sink, self._schema, compression='zstd')
+        else:
+            self._writer = pa.ipc.new_stream(self._sink, self._schema)
+
+    def _csv(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        if not self._started:
+            writer.writerow([name for name, _ in self.columns])
+        for row in rows:
+            values = []
+            for value, (_, kind) in zip(row, self.columns):
+                value = _text(value, kind)
+                if kind == 'int_list' and value is not None:
+                    value = ' '.join(map(str, value))
+                values.append(value)
+            writer.writerow(values)
+        return buffer.getvalue().encode()
+
+    def _ndjson(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        names = [name for name, _ in self.columns]
+        kinds = [kind for _, kind in self.columns]
+        return ''.join(
+            json.dumps(dict(zip(names, map(_text, row, kinds))), separators=(',', ':')) + '\n'
+            for row in rows
+        ).encode()
+
+    def _arrow(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        import pyarrow as pa
+
+        columns = list(zip(*rows))
+        arrays = []
+        for values, (_, kind), field in zip(columns, self.columns, self._schema):
+            if kind == 'int_list':
+                values = [_int_list(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        return self._sink.drain()
+
+    def write(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        """Encode one batch of rows (tuples in column order)."""
+        if not rows and self.fmt != 'csv':
+            return b''
+        encode = {'csv': self._csv, 'ndjson': self._ndjson}.get(self.fmt, self._arrow)
+        data = encode(rows)
+        self._started = True
+        return data
+
+    def close(self) -> bytes:
+        """Finish the export and return its trailing bytes."""
+        if self._writer is not None:
+            self._writer.close()
+            return self._sink.drain()
+        return b'' if self._started else self.write([])
+
+
+def batched(rows: Iterable[Any], size: int = EXPORT_CHUNK_ROWS) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most ``size`` items."""
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def export_chunks(
+    rows: Iterable[Sequence[Any]],
+    columns: Sequence[Tuple[str, str]],
+    fmt: str,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[bytes]:
+    """Encode rows to ``fmt``, yielding bytes one batch at a time."""
+    writer = ExportWriter(columns, fmt)
+    for batch in batched(rows, chunk_rows):
+        yield writer.write(batch)
+    yield writer.close()
@@ -0,0 +1,152 @@
+"""
+Bulk generation of unique games.
+
+Games are drawn in batches with a NumPy ``Generator``: each row picks its
+free numbers by partial argsort of uniform keys (a vectorized sample
+without replacement), fixed numbers are appended, and duplicates are
+dropped using the colex rank of each game as an exact 64-bit hash. Seen
+ranks are kept in a few sorted int64 runs merged like a log-structured
+index (each rank is copied O(log n) times, never once per batch), so memory
+grows by 8 bytes per game rather than by a Python object.
+
+Rejection sampling slows down as the request nears the number of distinct
+games. From ``DENSE_SHARE`` of that capacity on, distinct ranks are drawn
+directly with ``Generator.choice(replace=False)`` and unranked with the
+colex codec instead, so even the whole space costs one permutation.
+"""
+from math import comb
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from lottery_engine.codec import rank_combinations, unrank_combinations
+
+BATCH_SIZE = 50_000
+
+# Share of the distinct games above which ranks are sampled instead of games
+DENSE_SHARE = 0.5
+
+
+def max_unique_games(pool_size: int, numbers_count: int, fixed_count: int = 0) -> int:
+    """How many distinct games exist for a pool and a set of fixed numbers."""
+    return comb(pool_size - fixed_count, numbers_count - fixed_count)
+
+
+def iter_unique_games(
+    pool: Iterable[int],
+    numbers_count: int,
+    games_count: int,
+    fixed_numbers: Iterable[int] = (),
+    rng: Optional[np.random.Generator] = None,
+    batch_size: int = BATCH_SIZE
+) -> Iterator[np.ndarray]:
+    """
+    Yield ``games_count`` distinct games in batches.
+
+    Args:
+        pool: Numbers the free picks are drawn from
+        numbers_count: Numbers per game
+        games_count: Total distinct games to produce
+        fixed_numbers: Numbers present in every game
+        rng: Random generator (seed it for reproducible output)
+        batch_size: Upper bound on the rows generated per round
+
+    Returns:
+        Iterator of (rows, numbers_count) int64 arrays with sorted rows
+
+    Raises:
+        ValueError: If the pool cannot supply ``games_count`` distinct games
+    """
+    rng = rng or np.random.default_rng()
+    fixed = np.unique(np.fromiter(fixed_numbers, dtype=np.int64))
+    free = np.setdiff1d(np.fromiter(pool, dtype=np.int64), fixed)
+    need = numbers_count - len(fixed)
+
+    if need < 0 or need > len(free):
+        raise ValueError(
+            f"Impossível montar jogos de {numbers_count} números com "
+            f"{len(fixed)} fixos e {len(free)} disponíveis"
+        )
+    capacity = max_unique_games(len(free) + len(fixed), numbers_count, len(fixed))
+    if games_count > capacity:
+        raise ValueError(f"Só existem {capacity} jogos distintos com esses parâmetros")
+
+    # Validation runs eagerly; only the generation itself is lazy
+    if games_count >= DENSE_SHARE * capacity:
+        return _generate_dense(rng, free, fixed, need, games_count, capacity, batch_size)
+    return _generate(rng, free, fixed, need, games_count, batch_size)
+
+
+def _with_fixed(fixed: np.ndarray, picks: np.ndarray) -> np.ndarray:
+    games = np.concatenate([np.broadcast_to(fixed, (len(picks), len(fixed))), picks], axis=1)
+    games.sort(axis=1)
+    return games
+
+
+def _generate_dense(
+    rng: np.random.Generator,
+    free: np.ndarray,
+    fixed: np.ndarray,
+    need: int,
+    games_count: int,
+    capacity: int,
+    batch_size: int
+) -> Iterator[np.ndarray]:
+    # Colex ranks of need-subsets of positions 1..len(free), distinct and in random order
+    ranks = rng.choice(capacity, games_count, replace=False)
+    for start in range(0, games_count, batch_size):
+        positions = unrank_combinations(ranks[start:start + batch_size], need)
+        yield _with_fixed(fixed, free[positions - 1])
+
+
+class _SeenRanks:
+    """Set of int64 ranks as sorted runs; a run is merged into the previous one once it is at least half its size."""
+
+    def __init__(self):
+        self._runs = []
+
+    def contains(self, ranks: np.ndarray) -> np.ndarray:
+        found = np.zeros(len(ranks), dtype=bool)
+        for run in self._runs:
+            position = np.searchsorted(run, ranks)
+            inside = position < len(run)
+            found[inside] |= run[position[inside]] == ranks[inside]
+        return found
+
+    def add(self, ranks: np.ndarray) -> None:
+        self._runs.append(np.sort(ranks))
+        while len(self._runs) > 1 and 2 * len(self._runs[-1]) >= len(self._runs[-2]):
+            last = self._runs.pop()
+            self._runs[-1] = np.sort(np.concatenate([self._runs[-1], last]))
+
+
+def _generate(
+    rng: np.random.Generator,
+    free: np.ndarray,
+    fixed: np.ndarray,
+    need: int,
+    games_count: int,
+    batch_size: int
+) -> Iterator[np.ndarray]:
+    seen = _SeenRanks()
+    remaining = games_count
+    while remaining > 0:
+        # Oversample a little so the last rounds are not starved by duplicates
+        rows = min(batch_size, 2 * remaining + 16)
+        keys = rng.random((rows, len(free)))
+        if need == len(free):
+            picks = np.broadcast_to(np.arange(need), (rows, need))
+        else:
+            picks = np.argpartition(keys, need, axis=1)[:, :need]
+        games = _with_fixed(fixed, free[picks])
+
+        # Dedupe inside the batch (keeping generation order), then against earlier batches
+        ranks = rank_combinations(games)
+        unique, first = np.unique(ranks, return_index=True)
+        # Sorted queries keep the lookups cache-friendly
+        fresh = np.sort(first[~seen.contains(unique)])[:remaining]
+
+        seen.add(ranks[fresh])
+        remaining -= len(fresh)
+        if len(fresh):
+            yield games[fresh]
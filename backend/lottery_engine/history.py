@@ -0,0 +1,256 @@
+"""
+In-process draw history snapshots.
+
+A ``DrawHistory`` is an immutable, array-backed copy of one lottery's
+results: contest numbers, dates, the drawn numbers, the incidence matrix and
+its bitmask words, plus the statistics derived from them. A
+``HistoryRegistry`` (``AsyncHistoryRegistry`` for asyncio callers) keeps one
+snapshot per lottery, keyed by a cheap data version, and swaps it atomically
+when new draws land.
+"""
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lottery_engine.bitmask import WORD_BITS, masks_from_matrix
+from lottery_engine.sampling import AliasTable, number_weights
+from lottery_engine.statistics import HistoryStatistics, build_incidence_matrix, compute_statistics
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True)
+class DrawHistory:
+    """Immutable snapshot of one lottery's draws, in ascending contest order."""
+    lottery_type: str
+    total_numbers: int
+    numbers_to_pick: int
+    min_bet_numbers: Optional[int]
+    max_bet_numbers: Optional[int]
+    version: Hashable
+    contest_numbers: np.ndarray  # int64 (draws,)
+    draw_dates: np.ndarray       # datetime64[D] (draws,)
+    numbers: np.ndarray          # int16 (draws, width), padded with -1
+    matrix: np.ndarray           # bool (draws, total_numbers)
+    masks: np.ndarray            # uint64 (draws, MASK_WORDS)
+    statistics: HistoryStatistics = field(repr=False)
+    # Derived per-snapshot caches; the snapshot is immutable so they never go stale
+    _alias_tables: Dict[str, AliasTable] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_rows(
+        cls,
+        config: Dict[str, Any],
+        version: Hashable,
+        rows: Iterable[Tuple[int, date, Sequence[int]]]
+    ) -> 'DrawHistory':
+        """
+        Build a snapshot from (contest_number, draw_date, numbers) rows.
+
+        Args:
+            config: Lottery configuration values (lottery_type, total_numbers,
+                numbers_to_pick, min_bet_numbers, max_bet_numbers)
+            version: Data version the rows were read at
+            rows: Draw rows in ascending contest order
+
+        Returns:
+            DrawHistory snapshot
+        """
+        rows = list(rows)
+        contests = np.array([row[0] for row in rows], dtype=np.int64)
+        dates = np.array([row[1] for row in rows], dtype='datetime64[D]')
+        draws = [row[2] for row in rows]
+
+        width = max((len(numbers) for numbers in draws), default=0)
+        numbers = np.full((len(draws), width), -1, dtype=np.int16)
+        for index, drawn in enumerate(draws):
+            numbers[index, :len(drawn)] = drawn
+
+        matrix = build_incidence_matrix(draws, config['total_numbers'])
+        return cls(
+            lottery_type=config['lottery_type'],
+            total_numbers=config['total_numbers'],
+            numbers_to_pick=config['numbers_to_pick'],
+            min_bet_numbers=config.get('min_bet_numbers'),
+            max_bet_numbers=config.get('max_bet_numbers'),
+            version=version,
+            contest_numbers=_read_only(contests),
+            draw_dates=_read_only(dates),
+            numbers=_read_only(numbers),
+            matrix=_read_only(matrix),
+            masks=_read_only(masks_from_matrix(matrix)),
+            statistics=compute_statistics(contests, matrix),
+        )
+
+    @property
+    def latest_contest(self) -> Optional[int]:
+        return int(self.contest_numbers[-1]) if len(self) else None
+
+    def __len__(self) -> int:
+        return len(self.contest_numbers)
+
+    def index_of(self, contest_number: Optional[int] = None) -> Optional[int]:
+        """Row index of a contest (None = latest), or None when absent."""
+        if not len(self):
+            return None
+        if contest_number is None:
+            return len(self) - 1
+        index = int(np.searchsorted(self.contest_numbers, contest_number))
+        if index < len(self) and self.contest_numbers[index] == contest_number:
+            return index
+        return None
+
+    def draw_date(self, index: int) -> date:
+        return self.draw_dates[index].item()
+
+    def drawn_numbers(self, index: int) -> List[int]:
+        """Numbers of a draw as stored, sorted."""
+        return sorted(int(n) for n in self.numbers[index] if n >= 0)
+
+    def mask(self, index: int) -> int:
+        """Bitmask of a draw as a single int."""
+        mask = 0
+        for word, value in enumerate(self.masks[index]):
+            mask |= int(value) << (word * WORD_BITS)
+        return mask
+
+    def alias_table(self, weighting: str) -> AliasTable:
+        """Alias table of the statistics-based weights, built once per snapshot."""
+        table = self._alias_tables.get(weighting)
+        if table is None:
+            table = AliasTable.build(number_weights(self.statistics, weighting))
+            # Concurrent builders produce identical tables; last write wins
+            self._alias_tables[weighting] = table
+        return table
+
+    def ranked_numbers(self, by: str, limit: Optional[int] = None) -> List[int]:
+        """Numbers ordered by a statistic ('frequency' or 'delay'), highest first."""
+        values = getattr(self.statistics, by)
+        # Stable sort on the negated values keeps lower numbers first on ties
+        order = np.argsort(-values, kind='stable')[:limit]
+        return [int(index) + 1 for index in order]
+
+
+class HistoryRegistry:
+    """
+    Per-process cache of ``DrawHistory`` snapshots.
+
+    ``version(key, *args)`` must be a cheap query identifying the current data
+    (e.g. draw count and latest contest); ``load(key, version, *args)`` builds
+    a fresh snapshot. Versions are re-checked at most every
+    ``revalidate_after`` seconds; writers in the same process call
+    ``invalidate`` to force the next access to reload.
+    """
+
+    def __init__(
+        self,
+        load: Callable[..., DrawHistory],
+        version: Callable[..., Hashable],
+        revalidate_after: float = 60.0
+    ):
+        self._load = load
+        self._version = version
+        self.revalidate_after = revalidate_after
+        self._snapshots: Dict[Hashable, Tuple[DrawHistory, float]] = {}
+        self._locks: Dict[Hashable, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key: Hashable) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, key: Hashable, *args: Any) -> DrawHistory:
+        """Return the current snapshot for ``key``, loading or refreshing it if needed."""
+        entry = self._snapshots.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.revalidate_after:
+            return entry[0]
+
+        with self._lock_for(key):
+            # Another thread may have refreshed while we waited
+            entry = self._snapshots.get(key)
+            now = time.monotonic()
+            if entry is not None and now - entry[1] < self.revalidate_after:
+                return entry[0]
+
+            version = self._version(key, *args)
+            if entry is not None and entry[0].version == version:
+                snapshot = entry[0]
+            else:
+                snapshot = self._load(key, version, *args)
+            # Single assignment: readers see either the old or the new snapshot
+            self._snapshots[key] = (snapshot, now)
+            return snapshot
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Force a reload of one snapshot (or all of them) on next access."""
+        if key is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(key, None)
+
+
+class AsyncHistoryRegistry:
+    """
+    ``HistoryRegistry`` for asyncio callers.
+
+    ``version`` and ``load`` are coroutine functions (e.g. queries on an async
+    session). A fresh snapshot is returned without awaiting anything; on
+    refresh, one task per key queries the database while the others wait on
+    an ``asyncio.Lock`` and then reuse its result.
+    """
+
+    def __init__(
+        self,
+        load: Callable[..., Awaitable[DrawHistory]],
+        version: Callable[..., Awaitable[Hashable]],
+        revalidate_after: float = 60.0
+    ):
+        self._load = load
+        self._version = version
+        self.revalidate_after = revalidate_after
+        self._snapshots: Dict[Hashable, Tuple[DrawHistory, float]] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    def _fresh(self, key: Hashable) -> Optional[DrawHistory]:
+        entry = self._snapshots.get(key)
+        if entry is not None and time.monotonic() - entry[1] < self.revalidate_after:
+            return entry[0]
+        return None
+
+    async def get(self, key: Hashable, *args: Any) -> DrawHistory:
+        """Return the current snapshot for ``key``, loading or refreshing it if needed."""
+        snapshot = self._fresh(key)
+        if snapshot is not None:
+            return snapshot
+
+        # Single event loop thread: setdefault needs no extra guard
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            snapshot = self._fresh(key)
+            if snapshot is not None:
+                return snapshot
+
+            entry = self._snapshots.get(key)
+            version = await self._version(key, *args)
+            if entry is not None and entry[0].version == version:
+                snapshot = entry[0]
+            else:
+                snapshot = await self._load(key, version, *args)
+            self._snapshots[key] = (snapshot, time.monotonic())
+            return snapshot
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Force a reload of one snapshot (or all of them) on next access."""
+        if key is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(key, None)
@@ -0,0 +1,307 @@
+"""
+Streaming parser for official draw result files (CSV or XLSX exports).
+
+Files are read row by row and turned into validated draw dicts in batches,
+ready for a chunked upsert; nothing holds more than one batch. Columns are
+found by header name, compared without case, accents or punctuation, so the
+Caixa layouts of every lottery are accepted:
+
+* ``Concurso`` and ``Data Sorteio`` (or ``Data``);
+* ``Bola1``..``BolaN`` / ``Dezena1``.. (columns mentioning ``2`` and
+  ``sorteio`` hold Dupla Sena's second draw);
+* optionally the first ``Ganhadores ...`` and ``Rateio ...`` columns (top
+  prize tier), ``Acumulado ...`` and ``Estimativa Prêmio``.
+
+Each row is validated against the lottery's configuration (contest, date,
+count, range and uniqueness of the numbers); invalid rows are reported with
+their line number instead of stopping the parse, and a contest repeated in
+the file keeps its last row.
+"""
+import codecs
+import csv
+import io
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+INGEST_FORMATS = ('csv', 'xlsx')
+
+# Rows validated and upserted together
+INGEST_BATCH_ROWS = 1_000
+
+# Errors kept per file; the count of the rest is still tracked
+MAX_REPORTED_ERRORS = 50
+
+DATE_FORMATS = ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y')
+
+_NUMBER_COLUMN = re.compile(r'^(?:bola|dezena|coluna)\s*(\d+)\b(.*)$')
+_TRUE = {'sim', 's', 'true', 'verdadeiro', '1', 'yes'}
+_FALSE = {'nao', 'n', 'false', 'falso', '0', 'no', ''}
+
+
+def normalize_header(value: Any) -> str:
+    """Lowercase ASCII words of a header (``'Data Sorteio'`` -> ``'data sorteio'``)."""
+    text = unicodedata.normalize('NFKD', str(value or ''))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text).split())
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and value.strip() in ('', '-'))
+
+
+def parse_int(value: Any) -> int:
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return int(str(value).strip())
+
+
+def parse_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"data inválida: {text!r}")
+
+
+def parse_money(value: Any) -> Optional[Decimal]:
+    """Amounts as ``1234.5``, ``'1.234.567,89'`` or ``'R$ 1.234,00'``."""
+    if _blank(value):
+        return None
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return Decimal(str(value)).quantize(Decimal('0.01'))
+    text = str(value).replace('R$', '').replace('\xa0', '').replace(' ', '')
+    if ',' in text:
+        text = text.replace('.', '').replace(',', '.')
+    try:
+        return Decimal(text).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise ValueError(f"valor inválido: {value!r}")
+
+
+def parse_flag(value: Any) -> bool:
+    """``SIM``/``NÃO`` flags, or an accumulated amount (> 0 means accumulated)."""
+    if isinstance(value, bool):
+        return value
+    if _blank(value):
+        return False
+    word = normalize_header(value)
+    if word in _TRUE:
+        return True
+    if word in _FALSE:
+        return False
+    amount = parse_money(value)
+    return amount is not None and amount > 0
+
+
+@dataclass(frozen=True)
+class DrawColumns:
+    """Position of each field in a result file's rows."""
+    contest: int
+    draw_date: int
+    numbers: Tuple[int, ...]
+    second_draw: Tuple[int, ...] = ()
+    winners: Optional[int] = None
+    prize: Optional[int] = None
+    accumulated: Optional[int] = None
+    next_prize: Optional[int] = None
+
+    @classmethod
+    def from_header(cls, header: Sequence[Any]) -> 'DrawColumns':
+        """
+        Locate the columns of a header row.
+
+        Raises:
+            ValueError: If the contest, date or number columns are missing
+        """
+        names = [normalize_header(value) for value in header]
+
+        def first(*candidates: str, prefix: bool = False) -> Optional[int]:
+            for i, name in enumerate(names):
+                if any(name.startswith(c) if prefix else name == c for c in candidates):
+                    return i
+            return None
+
+        numbers, second = [], []
+        for i, name in enumerate(names):
+            match = _NUMBER_COLUMN.match(name)
+            if match:
+                rest = match.group(2)
+                target = second if 'sorteio' in rest and '2' in rest else numbers
+                target.append((int(match.group(1)), i))
+
+        contest = first('concurso', 'contest number', 'contest')
+        draw_date = first('data sorteio', 'data do sorteio', 'data', 'draw date')
+        if contest is None or draw_date is None or not numbers:
+            raise ValueError("Cabeçalho sem as colunas Concurso, Data Sorteio e Bola1..N")
+
+        return cls(
+            contest=contest,
+            draw_date=draw_date,
+            numbers=tuple(i for _, i in sorted(numbers)),
+            second_draw=tuple(i for _, i in sorted(second)),
+            winners=first('ganhadores', prefix=True),
+            prize=first('rateio', prefix=True),
+            accumulated=first('acumulado', prefix=True),
+            next_prize=first('estimativa premio', 'estimativa', prefix=True),
+        )
+
+
+def _check_numbers(numbers: List[int], total_numbers: int, numbers_to_pick: int, label: str) -> None:
+    if len(numbers) != numbers_to_pick:
+        raise ValueError(f"{label}: {len(numbers)} números, esperados {numbers_to_pick}")
+    if len(set(numbers)) != len(numbers):
+        raise ValueError(f"{label}: números repetidos")
+    if min(numbers) < 1 or max(numbers) > total_numbers:
+        raise ValueError(f"{label}: números fora do intervalo 1-{total_numbers}")
+
+
+def parse_draw_row(
+    values: Sequence[Any],
+    columns: DrawColumns,
+    total_numbers: int,
+    numbers_to_pick: int
+) -> Dict[str, Any]:
+    """
+    Validate one data row and return it as draw fields.
+
+    Raises:
+        ValueError: Describing the first problem found
+    """
+    def cell(index: Optional[int]) -> Any:
+        return values[index] if index is not None and index < len(values) else None
+
+    try:
+        contest_number = parse_int(cell(columns.contest))
+    except (TypeError, ValueError):
+        raise ValueError(f"concurso inválido: {cell(columns.contest)!r}")
+    if contest_number < 1:
+        raise ValueError(f"concurso inválido: {contest_number}")
+    if _blank(cell(columns.draw_date)):
+        raise ValueError("data ausente")
+
+    def read_numbers(indexes: Tuple[int, ...]) -> List[int]:
+        try:
+            return sorted(parse_int(cell(i)) for i in indexes if not _blank(cell(i)))
+        except (TypeError, ValueError):
+            raise ValueError("número sorteado inválido")
+
+    numbers = read_numbers(columns.numbers)
+    _check_numbers(numbers, total_numbers, numbers_to_pick, 'sorteio')
+    second_draw = read_numbers(columns.second_draw) if columns.second_draw else []
+    if second_draw:
+        _check_numbers(second_draw, total_numbers, numbers_to_pick, '2º sorteio')
+
+    winners = cell(columns.winners)
+    return {
+        'contest_number': contest_number,
+        'draw_date': parse_date(cell(columns.draw_date)),
+        'numbers': numbers,
+        'numbers_second_draw': second_draw or None,
+        'prize_amount': parse_money(cell(columns.prize)),
+        'winners_count': 0 if _blank(winners) else parse_int(winners),
+        'accumulated': parse_flag(cell(columns.accumulated)),
+        'next_estimated_prize': parse_money(cell(columns.next_prize)),
+    }
+
+
+def read_csv_rows(stream: IO[bytes], encoding: str = 'utf-8-sig') -> Iterator[List[str]]:
+    """Rows of a CSV file; the delimiter (``;``, ``,`` or tab) is taken from the header."""
+    text = codecs.getreader(encoding)(stream)
+    header = text.readline()
+    delimiter = max(';,\t', key=header.count)
+    yield from csv.reader(io.StringIO(header), delimiter=delimiter)
+    yield from csv.reader(text, delimiter=delimiter)
+
+
+def read_xlsx_rows(stream: IO[bytes]) -> Iterator[Tuple[Any, ...]]:
+    """Rows of the first worksheet of an XLSX file, read in streaming mode."""
+    # Optional dependency: only needed for spreadsheets
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_result_rows(stream: IO[bytes], fmt: str, encoding: str = 'utf-8-sig') -> Iterator[Sequence[Any]]:
+    """Header and data rows of a result file in ``fmt`` ('csv' or 'xlsx')."""
+    if fmt == 'csv':
+        return read_csv_rows(stream, encoding)
+    if fmt == 'xlsx':
+        return read_xlsx_rows(stream)
+    raise ValueError(f"Formato desconhecido: {fmt} (use {', '.join(INGEST_FORMATS)})")
+
+
+@dataclass
+class IngestReport:
+    """Outcome of parsing a result file."""
+    rows: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    error_count: int = 0
+
+    def add_error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+class IngestError(ValueError):
+    """A result file was rejected; ``report`` holds the row errors found."""
+
+    def __init__(self, message: str, report: IngestReport):
+        super().__init__(message)
+        self.report = report
+
+
+def iter_draw_batches(
+    rows: Iterable[Sequence[Any]],
+    total_numbers: int,
+    numbers_to_pick: int,
+    report: IngestReport,
+    batch_rows: int = INGEST_BATCH_ROWS
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Parse a header row and data rows into batches of validated draw dicts.
+
+    Blank rows are skipped; invalid rows are recorded in ``report`` and left
+    out. Within a batch a repeated contest keeps its last row.
+
+    Raises:
+        ValueError: If the file is empty or its header lacks required columns
+    """
+    iterator = iter(rows)
+    header = next(iterator, None)
+    if header is None:
+        raise ValueError("Arquivo vazio")
+    columns = DrawColumns.from_header(header)
+
+    batch: Dict[int, Dict[str, Any]] = {}
+    for line, values in enumerate(iterator, start=2):
+        if all(_blank(value) for value in values):
+            continue
+        report.rows += 1
+        try:
+            draw = parse_draw_row(values, columns, total_numbers, numbers_to_pick)
+        except ValueError as e:
+            report.add_error(line, str(e))
+            continue
+        batch[draw['contest_number']] = draw
+        if len(batch) >= batch_rows:
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
@@ -0,0 +1,133 @@
+"""
+Exact prize odds and closed-form scoring of multi-number bets.
+
+A bet of ``n`` numbers in a lottery drawing ``k`` of ``N`` hits ``h`` of the
+drawn numbers with the hypergeometric probability
+``C(n, h) * C(N - n, k - h) / C(N, k)``. A bet larger than the base game
+stands for its ``C(n, g)`` sub-games of ``g`` numbers, and when the bet hits
+``h`` numbers exactly ``C(h, j) * C(n - h, g - j)`` of those sub-games hit
+``j``. Scoring a 20-number Lotofácil bet is therefore a handful of binomials
+instead of 15,504 expanded games.
+
+Everything is computed with Python integers and cached per configuration.
+"""
+from fractions import Fraction
+from functools import lru_cache
+from math import comb
+from typing import Any, Dict, Optional, Tuple
+
+from lottery_engine.prizes import prize_tiers
+
+# Drawn by column (one digit per column), not as k distinct numbers out of N
+COLUMN_LOTTERIES = ('SUPER_SETE',)
+
+
+@lru_cache(maxsize=None)
+def hit_counts(total_numbers: int, numbers_to_pick: int, bet_size: int) -> Tuple[int, ...]:
+    """
+    Number of possible draws giving a bet each hit count.
+
+    Returns:
+        Tuple indexed by hits (0 .. min(bet_size, numbers_to_pick)) that sums
+        to C(total_numbers, numbers_to_pick)
+    """
+    if not 0 <= numbers_to_pick <= total_numbers or not 0 <= bet_size <= total_numbers:
+        raise ValueError(
+            f"Apostas de {bet_size} números não cabem em sorteios de "
+            f"{numbers_to_pick} entre {total_numbers}"
+        )
+    return tuple(
+        comb(bet_size, hits) * comb(total_numbers - bet_size, numbers_to_pick - hits)
+        for hits in range(min(bet_size, numbers_to_pick) + 1)
+    )
+
+
+def sub_game_hits(bet_size: int, hits: int, game_size: int) -> Dict[int, int]:
+    """
+    How many sub-games of ``game_size`` numbers hit each count.
+
+    Args:
+        bet_size: Numbers in the bet
+        hits: Numbers of the bet that were drawn
+        game_size: Numbers per sub-game (the lottery's base game)
+
+    Returns:
+        {sub-game hits: sub-games}, summing to C(bet_size, game_size)
+    """
+    if not 0 <= hits <= bet_size or not 0 <= game_size <= bet_size:
+        raise ValueError(f"Aposta de {bet_size} números não pode ter {hits} acertos em jogos de {game_size}")
+    return {
+        j: comb(hits, j) * comb(bet_size - hits, game_size - j)
+        for j in range(min(hits, game_size) + 1)
+        if comb(hits, j) * comb(bet_size - hits, game_size - j)
+    }
+
+
+def score_bet(lottery_type: str, bet_size: int, hits: int, game_size: int) -> Dict[str, int]:
+    """
+    Winning sub-games of a bet per prize tier, highest tier first.
+
+    Bets no larger than ``game_size`` count as a single game.
+    """
+    counts = sub_game_hits(bet_size, hits, game_size) if bet_size > game_size else {hits: 1}
+    return {
+        name: counts.get(tier_hits, 0)
+        for tier_hits, name in sorted(prize_tiers(lottery_type).items(), reverse=True)
+    }
+
+
+def bet_odds(
+    lottery_type: str,
+    total_numbers: int,
+    numbers_to_pick: int,
+    bet_size: int,
+    game_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Exact per-tier odds of a bet for one draw.
+
+    Args:
+        lottery_type: Type of lottery (selects the prize tiers)
+        total_numbers: Numbers in the lottery's range
+        numbers_to_pick: Numbers drawn
+        bet_size: Numbers in the bet
+        game_size: Numbers per sub-game (default: numbers_to_pick)
+
+    Returns:
+        Dict with sub_games, total_draws, the hit probabilities of the bet
+        and, per tier, the probability of winning it at least once, the
+        matching "1 in N" and the expected winning sub-games per draw
+    """
+    if lottery_type in COLUMN_LOTTERIES:
+        raise ValueError(f"Probabilidades não disponíveis para {lottery_type} (sorteio por colunas)")
+    game_size = game_size or numbers_to_pick
+    if bet_size < game_size:
+        raise ValueError(f"Apostas devem ter pelo menos {game_size} números")
+
+    counts = hit_counts(total_numbers, numbers_to_pick, bet_size)
+    total_draws = comb(total_numbers, numbers_to_pick)
+
+    tiers = {}
+    for tier_hits, name in sorted(prize_tiers(lottery_type).items(), reverse=True):
+        winning_draws = 0
+        expected = Fraction(0)
+        for hits, draws in enumerate(counts):
+            sub_games = sub_game_hits(bet_size, hits, game_size).get(tier_hits, 0)
+            if sub_games:
+                winning_draws += draws
+                expected += Fraction(draws * sub_games, total_draws)
+        tiers[name] = {
+            'hits': tier_hits,
+            'probability': winning_draws / total_draws,
+            'one_in': total_draws / winning_draws if winning_draws else None,
+            'expected_sub_games': float(expected),
+        }
+
+    return {
+        'bet_size': bet_size,
+        'game_size': game_size,
+        'sub_games': comb(bet_size, game_size),
+        'total_draws': total_draws,
+        'hit_probabilities': {hits: draws / total_draws for hits, draws in enumerate(counts)},
+        'tiers': tiers,
+    }
@@ -0,0 +1,127 @@
+"""
+Keyset (cursor) pagination of draws, newest contest first.
+
+Instead of OFFSET, each page is a range scan on the
+``(lottery_type, contest_number)`` index starting after the contest at a
+page boundary, so a deep page costs the same as the first one and no
+``COUNT(*)`` is needed.
+
+Cursors are opaque URL-safe tokens holding a boundary contest and a
+direction:
+
+* ``next``: contests older than the boundary, scanned descending;
+* ``prev``: contests newer than the boundary, scanned ascending and then
+  reversed back to newest-first.
+
+Callers fetch ``limit + 1`` rows in ``scan_descending(cursor)`` order and
+hand them to ``keyset_page``; the extra row only tells whether another page
+exists in the scan direction. ``LAST_PAGE`` (``prev`` from contest 0) jumps
+to the oldest draws.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence
+
+DIRECTIONS = ('next', 'prev')
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Page boundary: the contest to continue from and the scan direction."""
+    contest: int
+    direction: str = 'next'
+
+    def __post_init__(self):
+        if self.direction not in DIRECTIONS:
+            raise ValueError(f"Unknown cursor direction: {self.direction}")
+
+    @property
+    def descending(self) -> bool:
+        return self.direction == 'next'
+
+
+LAST_PAGE = Cursor(0, 'prev')
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Opaque token for a cursor."""
+    raw = json.dumps([cursor.contest, cursor.direction], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(token: str) -> Cursor:
+    """
+    Inverse of ``encode_cursor``.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        contest, direction = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if type(contest) is not int or contest < 0:
+        raise ValueError("Invalid cursor")
+    return Cursor(contest, direction)
+
+
+def scan_descending(cursor: Optional[Cursor]) -> bool:
+    """Order in which rows must be fetched for this cursor (first page: descending)."""
+    return cursor is None or cursor.descending
+
+
+@dataclass(frozen=True)
+class KeysetPage:
+    """One page of rows, newest first, with the tokens of its neighbours."""
+    items: List[Any]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.prev_cursor is not None
+
+
+def keyset_page(
+    rows: Sequence[Any],
+    limit: int,
+    cursor: Optional[Cursor] = None,
+    contest_of: Callable[[Any], int] = lambda row: row.contest_number,
+) -> KeysetPage:
+    """
+    Build a page from up to ``limit + 1`` rows fetched in scan order.
+
+    Args:
+        rows: Rows past the cursor, descending for ``next`` / first page and
+            ascending for ``prev``
+        limit: Page size
+        cursor: Cursor the rows were fetched with (None for the first page)
+        contest_of: Contest number of a row
+    """
+    items = list(rows[:limit])
+    more = len(rows) > limit
+    if not scan_descending(cursor):
+        items.reverse()
+    if not items:
+        return KeysetPage(items, None, None)
+
+    newest, oldest = contest_of(items[0]), contest_of(items[-1])
+    if cursor is None:
+        has_newer, has_older = False, more
+    elif cursor.descending:
+        has_newer, has_older = True, more
+    else:
+        has_newer, has_older = more, cursor.contest > 0
+
+    return KeysetPage(
+        items,
+        next_cursor=encode_cursor(Cursor(oldest, 'next')) if has_older else None,
+        prev_cursor=encode_cursor(Cursor(newest, 'prev')) if has_newer else None,
+    )
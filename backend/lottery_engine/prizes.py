@@ -0,0 +1,27 @@
+"""
+Prize tiers of each lottery, indexed by number of hits.
+"""
+from typing import Dict, List, Optional
+
+PRIZE_TIERS: Dict[str, Dict[int, str]] = {
+    'MEGA_SENA': {6: 'Sena', 5: 'Quina', 4: 'Quadra'},
+    'LOTOFACIL': {15: '15 acertos', 14: '14 acertos', 13: '13 acertos', 12: '12 acertos', 11: '11 acertos'},
+    'QUINA': {5: 'Quina', 4: 'Quadra', 3: 'Terno', 2: 'Duque'},
+    'DUPLA_SENA': {6: 'Sena', 5: 'Quina', 4: 'Quadra', 3: 'Terno'},
+    'SUPER_SETE': {7: '7 acertos', 6: '6 acertos', 5: '5 acertos', 4: '4 acertos', 3: '3 acertos'},
+}
+
+
+def prize_tiers(lottery_type: str) -> Dict[int, str]:
+    """Prize tiers of a lottery as {hits: tier name}, empty when unknown."""
+    return PRIZE_TIERS.get(lottery_type, {})
+
+
+def winning_hits(lottery_type: str) -> List[int]:
+    """Hit counts that win a prize, highest first."""
+    return sorted(prize_tiers(lottery_type), reverse=True)
+
+
+def tier_name(lottery_type: str, hits: int) -> Optional[str]:
+    """Name of the prize tier reached with ``hits``, or None."""
+    return prize_tiers(lottery_type).get(hits)
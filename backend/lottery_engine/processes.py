@@ -0,0 +1,112 @@
+"""
+Shared process pool for the engines that fan out in chunks (backtest, simulation).
+
+One long-lived executor per process, capped at ``max_workers`` (one per
+CPU unless configured) however many requests run at once. Workers start
+from a ``forkserver`` (``spawn`` where unavailable), never by forking the
+caller, which is usually a thread of a multithreaded server. Chunk
+functions must be module-level and take their data as arguments.
+
+A call can be abandoned through a ``threading.Event``: once it is set, no
+further chunk is started and the queued ones are cancelled.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ProcessPoolExecutor, wait
+from typing import Any, Callable, List, Optional, Sequence
+
+_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+_max_workers: Optional[int] = None
+# How often a cancellable call checks its event while chunks run
+CANCEL_POLL_SECONDS = 0.1
+
+
+def _context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def configure_processes(max_workers: Optional[int] = None) -> None:
+    """Set the pool size (None = one per CPU); takes effect when the pool next starts."""
+    global _max_workers
+    with _lock:
+        _max_workers = max_workers
+
+
+def process_pool_size() -> int:
+    return _max_workers or os.cpu_count() or 1
+
+
+def shared_executor() -> ProcessPoolExecutor:
+    """The process-wide executor, started on first use."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=process_pool_size(), mp_context=_context())
+        return _executor
+
+
+def shutdown_processes() -> None:
+    """Stop the shared workers, dropping queued chunks."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def map_chunks(
+    func: Callable[..., Any],
+    tasks: Sequence[Sequence[Any]],
+    workers: Optional[int] = None,
+    cancel: Optional[threading.Event] = None
+) -> List[Any]:
+    """
+    ``[func(*task) for task in tasks]``, run on the shared pool.
+
+    Args:
+        func: Module-level function (pickled by reference)
+        tasks: Argument tuples, one per chunk
+        workers: Chunks of this call in flight at once (None = the pool
+            size, 1 or a single task = run inline)
+        cancel: Set by the caller to abandon the call between chunks
+
+    Returns:
+        Results in task order
+
+    Raises:
+        CancelledError: ``cancel`` was set before every chunk finished
+    """
+    workers = min(workers or process_pool_size(), process_pool_size())
+    if workers == 1 or len(tasks) <= 1:
+        results = []
+        for task in tasks:
+            if cancel is not None and cancel.is_set():
+                raise CancelledError()
+            results.append(func(*task))
+        return results
+
+    executor = shared_executor()
+    results: List[Any] = [None] * len(tasks)
+    pending = {}
+    queued = iter(enumerate(tasks))
+    poll = CANCEL_POLL_SECONDS if cancel is not None else None
+    try:
+        while True:
+            if cancel is not None and cancel.is_set():
+                raise CancelledError()
+            # Keep at most `workers` chunks queued so concurrent calls interleave fairly
+            for index, task in queued:
+                pending[executor.submit(func, *task)] = index
+                if len(pending) >= workers:
+                    break
+            if not pending:
+                return results
+            done, _ = wait(pending, timeout=poll, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,125 @@
+"""
+Weighted number sampling with alias tables.
+
+Each number gets a weight derived from its statistics (frequency, current
+delay or an even mix of both). The weights are compiled once into a Vose
+alias table, after which every draw costs O(1): one uniform index and one
+coin flip. Games are built by successive draws that skip numbers already in
+the game, i.e. weighted sampling without replacement.
+"""
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from lottery_engine.statistics import HistoryStatistics
+
+WEIGHTINGS = ('frequency', 'delay', 'mixed')
+
+
+def number_weights(statistics: HistoryStatistics, weighting: str) -> np.ndarray:
+    """
+    Per-number weights (index ``number - 1``) for a weighting strategy.
+
+    Counts are smoothed by one so numbers never drawn (or just drawn) keep a
+    small chance instead of being excluded.
+    """
+    if weighting not in WEIGHTINGS:
+        raise ValueError(f"Unknown weighting {weighting!r}; expected one of {WEIGHTINGS}")
+    frequency = statistics.frequency + 1.0
+    delay = statistics.delay + 1.0
+    if weighting == 'frequency':
+        return frequency
+    if weighting == 'delay':
+        return delay
+    return frequency / frequency.sum() + delay / delay.sum()
+
+
+@dataclass(frozen=True)
+class AliasTable:
+    """Vose alias table over indices ``0 .. len(probability) - 1``."""
+    probability: np.ndarray  # float64, chance of keeping the drawn column
+    alias: np.ndarray        # intp, column used otherwise
+
+    @classmethod
+    def build(cls, weights: Iterable[float]) -> 'AliasTable':
+        weights = np.asarray(weights, dtype=np.float64)
+        size = len(weights)
+        if size == 0 or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Weights must be non-negative with a positive sum")
+
+        scaled = weights * size / weights.sum()
+        probability = np.ones(size, dtype=np.float64)
+        alias = np.arange(size, dtype=np.intp)
+        small = [i for i in range(size) if scaled[i] < 1.0]
+        large = [i for i in range(size) if scaled[i] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Leftovers are 1 up to rounding error
+        for index in small + large:
+            probability[index] = 1.0
+
+        probability.setflags(write=False)
+        alias.setflags(write=False)
+        return cls(probability=probability, alias=alias)
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def draw(self, rng: np.random.Generator, size) -> np.ndarray:
+        """Draw indices with replacement; ``size`` may be an int or a shape."""
+        columns = rng.integers(len(self), size=size)
+        keep = rng.random(size) < self.probability[columns]
+        return np.where(keep, columns, self.alias[columns])
+
+    def sample_games(
+        self,
+        rng: np.random.Generator,
+        games_count: int,
+        numbers_count: int,
+        fixed_numbers: Iterable[int] = ()
+    ) -> np.ndarray:
+        """
+        Draw games of distinct numbers (index ``i`` is number ``i + 1``).
+
+        Returns:
+            (games_count, numbers_count) int64 array with sorted rows
+        """
+        fixed = sorted(set(fixed_numbers))
+        if not len(fixed) <= numbers_count <= len(self):
+            raise ValueError(
+                f"Impossível montar jogos de {numbers_count} números a partir de {len(self)}"
+            )
+        drawable = self._support()
+        drawable[[number - 1 for number in fixed]] = False
+        if numbers_count - len(fixed) > int(drawable.sum()):
+            raise ValueError("Números com peso positivo insuficientes para completar os jogos")
+
+        chosen = np.zeros((games_count, len(self)), dtype=bool)
+        chosen[:, [number - 1 for number in fixed]] = True
+        filled = np.full(games_count, len(fixed), dtype=np.int64)
+
+        pending = np.flatnonzero(filled < numbers_count)
+        while len(pending):
+            # A few draws per missing slot; rows still short go round again
+            width = 2 * (numbers_count - int(filled[pending].min()))
+            draws = self.draw(rng, (len(pending), width))
+            for column in range(width):
+                picks = draws[:, column]
+                new = ~chosen[pending, picks] & (filled[pending] < numbers_count)
+                chosen[pending[new], picks[new]] = True
+                filled[pending[new]] += 1
+            pending = pending[filled[pending] < numbers_count]
+
+        _, columns = np.nonzero(chosen)
+        return (columns + 1).reshape(games_count, numbers_count).astype(np.int64)
+
+    def _support(self) -> np.ndarray:
+        """Indices that can actually be drawn."""
+        support = self.probability > 0
+        support[self.alias[self.probability < 1]] = True
+        return support
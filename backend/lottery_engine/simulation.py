@@ -0,0 +1,185 @@
+"""
+Monte Carlo simulation of synthetic draws against a ticket set.
+
+Draws are generated in vectorized batches (uniform keys, partial argsort),
+packed into bitmask words and scored against the tickets' masks with one
+popcount per (draw, ticket) pair. Only the words a lottery actually uses are
+compared, so lotteries up to 64 numbers cost a single AND + popcount.
+
+Batches are grouped into chunks fanned out over the shared process pool
+(``lottery_engine.processes``). Each chunk seeds its own generator from
+``(seed, chunk index)``, so a seeded run gives the same result with any
+number of workers.
+"""
+import threading
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from lottery_engine.bitmask import WORD_BITS, masks_from_matrix, masks_from_numbers, popcount
+from lottery_engine.checker import tier_histogram
+from lottery_engine.prizes import prize_tiers
+from lottery_engine.processes import map_chunks
+
+CHUNK_DRAWS = 200_000
+# (draw, ticket) pairs scored per batch
+BATCH_CELLS = 4_000_000
+
+
+def random_draw_masks(
+    rng: np.random.Generator,
+    draws: int,
+    total_numbers: int,
+    numbers_to_pick: int
+) -> np.ndarray:
+    """
+    Draw ``numbers_to_pick`` distinct numbers out of ``total_numbers``, ``draws`` times.
+
+    Returns:
+        (draws, MASK_WORDS) uint64 masks
+    """
+    keys = rng.random((draws, total_numbers))
+    picks = np.argpartition(keys, numbers_to_pick - 1, axis=1)[:, :numbers_to_pick]
+    matrix = np.zeros((draws, total_numbers), dtype=bool)
+    np.put_along_axis(matrix, picks, True, axis=1)
+    return masks_from_matrix(matrix)
+
+
+def _run_chunk(
+    tickets: np.ndarray,
+    chunk: int,
+    draws: int,
+    total_numbers: int,
+    numbers_to_pick: int,
+    seed: int
+) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng([seed, chunk])
+    words = -(-total_numbers // WORD_BITS)
+    batch = max(1, BATCH_CELLS // len(tickets))
+
+    per_ticket = np.zeros((len(tickets), numbers_to_pick + 1), dtype=np.int64)
+    best = np.zeros(numbers_to_pick + 1, dtype=np.int64)
+    offsets = np.arange(len(tickets)) * (numbers_to_pick + 1)
+
+    for start in range(0, draws, batch):
+        masks = random_draw_masks(rng, min(batch, draws - start), total_numbers, numbers_to_pick)
+        # (draws, tickets) hit counts
+        hits = popcount(masks[:, None, :words] & tickets[None, :, :words])
+        per_ticket += np.bincount(
+            (hits + offsets).ravel(), minlength=per_ticket.size
+        ).reshape(per_ticket.shape)
+        best += np.bincount(hits.max(axis=1), minlength=numbers_to_pick + 1)
+    return {'per_ticket': per_ticket, 'best': best}
+
+
+def simulate_draws(
+    combinations: Iterable[Iterable[int]],
+    total_numbers: int,
+    numbers_to_pick: int,
+    draws: int,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    chunk_draws: int = CHUNK_DRAWS,
+    cancel: Optional[threading.Event] = None
+) -> Dict[str, object]:
+    """
+    Score a ticket set against ``draws`` synthetic contests.
+
+    Args:
+        combinations: Tickets (any size)
+        total_numbers: Numbers in the lottery's range (1..total_numbers)
+        numbers_to_pick: Numbers drawn per contest
+        draws: Synthetic contests to simulate
+        seed: Seed for reproducible runs (random when omitted, and returned)
+        workers: Chunks run at once on the shared process pool (None = the
+            whole pool, 1 = run inline)
+        chunk_draws: Contests per pool task
+        cancel: Set to abandon the run; no further chunk starts and
+            ``concurrent.futures.CancelledError`` is raised
+
+    Returns:
+        Dict with seed, draws, ``per_ticket`` ((tickets, numbers_to_pick + 1)
+        hit counts) and ``best`` (histogram of the best ticket per contest)
+    """
+    tickets = masks_from_numbers(combinations)
+    if not len(tickets):
+        raise ValueError("Informe ao menos um jogo")
+    if not 1 <= numbers_to_pick <= total_numbers:
+        raise ValueError(f"Impossível sortear {numbers_to_pick} de {total_numbers} números")
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % (1 << 63))
+
+    chunks = [
+        (index, min(chunk_draws, draws - start))
+        for index, start in enumerate(range(0, draws, chunk_draws))
+    ]
+    args = (total_numbers, numbers_to_pick, seed)
+
+    # Ticket masks are a few words per ticket: they travel with each chunk
+    tasks = [(tickets, index, size, *args) for index, size in chunks]
+    results = map_chunks(_run_chunk, tasks, workers, cancel)
+
+    per_ticket = np.zeros((len(tickets), numbers_to_pick + 1), dtype=np.int64)
+    best = np.zeros(numbers_to_pick + 1, dtype=np.int64)
+    for result in results:
+        per_ticket += result['per_ticket']
+        best += result['best']
+    return {'seed': seed, 'draws': draws, 'per_ticket': per_ticket, 'best': best}
+
+
+def summarize_simulation(
+    lottery_type: str,
+    result: Dict[str, object],
+    prize_values: Optional[Dict[str, float]] = None,
+    ticket_cost: Optional[float] = None
+) -> Dict[str, object]:
+    """
+    Hit distributions, tier odds and estimated returns of a simulation.
+
+    Args:
+        lottery_type: Type of lottery (selects the prize tiers)
+        result: Output of ``simulate_draws``
+        prize_values: Prize per winning ticket, by tier name
+        ticket_cost: Cost of the whole ticket set per contest
+
+    Returns:
+        Dict with hit_histogram (all tickets), best_histogram (best ticket per
+        contest), prize_tiers, per-tier odds and, when prize values are given,
+        expected_prize per contest and expected_return (prize / cost)
+    """
+    draws = result['draws']
+    totals = result['per_ticket'].sum(axis=0)
+    histogram = {hit: int(count) for hit, count in enumerate(totals)}
+    best = {hit: int(count) for hit, count in enumerate(result['best'])}
+    tiers = tier_histogram(lottery_type, histogram)
+
+    # A contest reaches a tier when its best ticket hits at least that many
+    cumulative_best = np.cumsum(result['best'][::-1])[::-1]
+    odds = {}
+    for hits, name in sorted(prize_tiers(lottery_type).items(), reverse=True):
+        at_least = int(cumulative_best[hits]) if hits < len(cumulative_best) else 0
+        odds[name] = {
+            'winning_tickets_per_contest': histogram.get(hits, 0) / draws if draws else 0.0,
+            'contest_probability': at_least / draws if draws else 0.0,
+        }
+
+    summary = {
+        'draws': draws,
+        'seed': result['seed'],
+        'hit_histogram': histogram,
+        'best_histogram': best,
+        'prize_tiers': tiers,
+        'winners': sum(tiers.values()),
+        'odds': odds,
+    }
+    if prize_values:
+        unknown = set(prize_values) - set(odds)
+        if unknown:
+            raise ValueError(f"Faixas de prêmio desconhecidas: {sorted(unknown)}")
+        expected = sum(
+            odds[name]['winning_tickets_per_contest'] * value
+            for name, value in prize_values.items()
+        )
+        summary['expected_prize'] = expected
+        summary['expected_return'] = expected / ticket_cost if ticket_cost else None
+    return summary
@@ -0,0 +1,220 @@
+"""
+Precomputed Lotofácil combination space.
+
+Lotofácil has only C(25, 15) = 3,268,760 possible games. The build step
+enumerates every one of them once as a uint32 bitmask (bit ``n - 1`` marks
+number ``n``), in ascending mask order, and stores per-game feature columns
+next to it as ``.npy`` files. At runtime the files are memory-mapped, so
+filtered sampling is a vectorized scan over the columns followed by a
+uniform draw among the matching rows, no trial-and-error needed.
+"""
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from lottery_engine.bitmask import encode_mask
+
+TOTAL_NUMBERS = 25
+NUMBERS_TO_PICK = 15
+CARD_SIDE = 5  # the Lotofácil card is a 5 x 5 grid: rows 1-5, 6-10, ...
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23)
+
+# Feature columns stored next to the masks: name -> (dtype, columns)
+FEATURES: Dict[str, Tuple[str, int]] = {
+    'sum': ('<u2', 1),
+    'odd': ('u1', 1),
+    'primes': ('u1', 1),
+    'max_run': ('u1', 1),
+    'runs': ('u1', 1),
+    'rows': ('u1', CARD_SIDE),
+    'columns': ('u1', CARD_SIDE),
+}
+
+_CHUNK = 1 << 18
+_BIT_VALUES = np.arange(TOTAL_NUMBERS, dtype=np.uint32)
+_NUMBERS = np.arange(1, TOTAL_NUMBERS + 1, dtype=np.uint16)
+
+
+def _bits(masks: np.ndarray) -> np.ndarray:
+    """Expand uint32 masks into a (games, TOTAL_NUMBERS) 0/1 uint8 matrix."""
+    return ((masks[:, None] >> _BIT_VALUES) & 1).astype(np.uint8)
+
+
+def _popcount32(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(values)
+    as_bytes = values.view(np.uint8).reshape(-1, 4)
+    return np.unpackbits(as_bytes, axis=1).sum(axis=1, dtype=np.uint8)
+
+
+def enumerate_masks() -> np.ndarray:
+    """All 15-of-25 masks in ascending order (colexicographic order of the games)."""
+    chunks = []
+    for start in range(0, 1 << TOTAL_NUMBERS, 1 << 20):
+        values = np.arange(start, start + (1 << 20), dtype=np.uint32)
+        chunks.append(values[_popcount32(values) == NUMBERS_TO_PICK])
+    return np.concatenate(chunks)
+
+
+def compute_features(masks: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Derive the feature columns of a batch of masks.
+
+    Returns:
+        Dict keyed like ``FEATURES``: sum, odd and prime counts, longest run
+        of consecutive numbers, number of runs, and how many numbers fall in
+        each row and column of the card
+    """
+    bits = _bits(masks)
+    max_run = np.zeros(len(masks), dtype=np.uint8)
+    run = np.zeros(len(masks), dtype=np.uint8)
+    for column in range(TOTAL_NUMBERS):
+        run = (run + 1) * bits[:, column]
+        np.maximum(max_run, run, out=max_run)
+
+    grid = bits.reshape(len(masks), CARD_SIDE, CARD_SIDE)
+    # A run starts wherever a number is present and its predecessor is not
+    starts = bits[:, 0] + (bits[:, 1:] & ~bits[:, :-1] & 1).sum(axis=1, dtype=np.uint8)
+    return {
+        'sum': bits @ _NUMBERS,
+        'odd': bits[:, ::2].sum(axis=1, dtype=np.uint8),
+        'primes': bits[:, [p - 1 for p in PRIMES]].sum(axis=1, dtype=np.uint8),
+        'max_run': max_run,
+        'runs': starts.astype(np.uint8),
+        'rows': grid.sum(axis=2, dtype=np.uint8),
+        'columns': grid.sum(axis=1, dtype=np.uint8),
+    }
+
+
+def build_space(directory: Union[str, os.PathLike]) -> int:
+    """
+    Enumerate the full combination space into ``directory``.
+
+    Writes ``masks.npy`` plus one ``.npy`` file per feature column, filled
+    chunk by chunk through memory maps to keep peak memory low.
+
+    Returns:
+        Number of combinations written
+    """
+    os.makedirs(directory, exist_ok=True)
+    masks = enumerate_masks()
+    np.save(os.path.join(directory, 'masks.npy'), masks)
+
+    outputs = {
+        name: np.lib.format.open_memmap(
+            os.path.join(directory, f'{name}.npy'), mode='w+', dtype=dtype,
+            shape=(len(masks),) if columns == 1 else (len(masks), columns)
+        )
+        for name, (dtype, columns) in FEATURES.items()
+    }
+    for start in range(0, len(masks), _CHUNK):
+        features = compute_features(masks[start:start + _CHUNK])
+        for name, values in features.items():
+            outputs[name][start:start + _CHUNK] = values
+    for output in outputs.values():
+        output.flush()
+    return len(masks)
+
+
+@dataclass(frozen=True)
+class SpaceFilters:
+    """Inclusive bounds on the feature columns; None leaves a bound open."""
+    min_sum: Optional[int] = None
+    max_sum: Optional[int] = None
+    min_odd: Optional[int] = None
+    max_odd: Optional[int] = None
+    min_primes: Optional[int] = None
+    max_primes: Optional[int] = None
+    max_run: Optional[int] = None
+    min_per_row: Optional[int] = None
+    max_per_row: Optional[int] = None
+    min_per_column: Optional[int] = None
+    max_per_column: Optional[int] = None
+    fixed_numbers: Tuple[int, ...] = ()
+    excluded_numbers: Tuple[int, ...] = ()
+
+
+def _apply_bounds(selected: np.ndarray, values: np.ndarray, low, high) -> None:
+    if low is not None:
+        selected &= values >= low
+    if high is not None:
+        selected &= values <= high
+
+
+@dataclass(frozen=True)
+class CombinationSpace:
+    """Memory-mapped combination table with its feature columns."""
+    masks: np.ndarray
+    features: Dict[str, np.ndarray]
+
+    @classmethod
+    def open(cls, directory: Union[str, os.PathLike]) -> 'CombinationSpace':
+        """Map a space written by ``build_space``; raises FileNotFoundError if it was never built."""
+        return cls(
+            masks=np.load(os.path.join(directory, 'masks.npy'), mmap_mode='r'),
+            features={
+                name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+                for name in FEATURES
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def select(self, filters: SpaceFilters) -> np.ndarray:
+        """Boolean selector of the combinations matching every filter."""
+        selected = np.ones(len(self), dtype=bool)
+        _apply_bounds(selected, self.features['sum'], filters.min_sum, filters.max_sum)
+        _apply_bounds(selected, self.features['odd'], filters.min_odd, filters.max_odd)
+        _apply_bounds(selected, self.features['primes'], filters.min_primes, filters.max_primes)
+        _apply_bounds(selected, self.features['max_run'], None, filters.max_run)
+        if filters.min_per_row is not None or filters.max_per_row is not None:
+            rows = self.features['rows']
+            _apply_bounds(selected, rows.min(axis=1), filters.min_per_row, None)
+            _apply_bounds(selected, rows.max(axis=1), None, filters.max_per_row)
+        if filters.min_per_column is not None or filters.max_per_column is not None:
+            columns = self.features['columns']
+            _apply_bounds(selected, columns.min(axis=1), filters.min_per_column, None)
+            _apply_bounds(selected, columns.max(axis=1), None, filters.max_per_column)
+        if filters.fixed_numbers:
+            fixed = np.uint32(encode_mask(filters.fixed_numbers))
+            selected &= (self.masks & fixed) == fixed
+        if filters.excluded_numbers:
+            selected &= (self.masks & np.uint32(encode_mask(filters.excluded_numbers))) == 0
+        return selected
+
+    def count(self, filters: SpaceFilters) -> int:
+        """Number of combinations matching the filters."""
+        return int(self.select(filters).sum())
+
+    def sample(
+        self,
+        selected: np.ndarray,
+        count: int,
+        rng: Optional[np.random.Generator] = None
+    ) -> np.ndarray:
+        """
+        Draw up to ``count`` distinct combinations uniformly among the matches.
+
+        Args:
+            selected: Boolean selector from ``select``
+            count: How many games to draw
+            rng: Random generator (a fresh one when omitted)
+
+        Returns:
+            (games, NUMBERS_TO_PICK) array of sorted numbers; fewer rows than
+            requested when not enough combinations match
+        """
+        rng = rng or np.random.default_rng()
+        matches = np.flatnonzero(selected)
+        chosen = rng.choice(matches, size=min(count, len(matches)), replace=False)
+        return decode_masks(self.masks[np.sort(chosen)])
+
+
+def decode_masks(masks: Iterable[int]) -> np.ndarray:
+    """Decode uint32 masks into a (games, NUMBERS_TO_PICK) array of sorted numbers."""
+    masks = np.asarray(masks, dtype=np.uint32)
+    _, columns = np.nonzero(_bits(masks))
+    return (columns + 1).reshape(len(masks), NUMBERS_TO_PICK).astype(np.int64)
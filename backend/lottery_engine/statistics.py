@@ -0,0 +1,214 @@
+"""
+Vectorized number statistics.
+
+The draw history of a lottery is loaded once into a contests x numbers
+incidence matrix and every per-number metric is derived from it in a single
+pass, instead of re-scanning all draws for each number.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+def build_incidence_matrix(
+    draws: Iterable[Sequence[int]],
+    total_numbers: int
+) -> np.ndarray:
+    """
+    Build a boolean (draws x numbers) matrix where column ``n - 1`` marks number ``n``.
+
+    Numbers outside ``1..total_numbers`` are ignored, matching the ranges
+    used by the statistics services.
+
+    Args:
+        draws: Drawn numbers of each contest, in contest order (a 2-D integer
+            array is accepted when every row has the same length)
+        total_numbers: Highest number of the lottery
+
+    Returns:
+        Boolean matrix of shape (len(draws), total_numbers)
+    """
+    if isinstance(draws, np.ndarray) and draws.ndim == 2:
+        # Rectangular input: one row per draw, no Python-level flattening
+        matrix = np.zeros((len(draws), total_numbers), dtype=bool)
+        rows = np.repeat(np.arange(len(draws), dtype=np.intp), draws.shape[1])
+        cols = draws.astype(np.intp, copy=False).ravel() - 1
+        valid = (cols >= 0) & (cols < total_numbers)
+        matrix[rows[valid], cols[valid]] = True
+        return matrix
+
+    draws = list(draws)
+    matrix = np.zeros((len(draws), total_numbers), dtype=bool)
+    if not draws:
+        return matrix
+
+    lengths = np.fromiter((len(d) for d in draws), dtype=np.intp, count=len(draws))
+    rows = np.repeat(np.arange(len(draws), dtype=np.intp), lengths)
+    cols = np.fromiter(
+        (n for d in draws for n in d), dtype=np.intp, count=int(lengths.sum())
+    ) - 1
+    valid = (cols >= 0) & (cols < total_numbers)
+    matrix[rows[valid], cols[valid]] = True
+    return matrix
+
+
+@dataclass(frozen=True)
+class HistoryStatistics:
+    """Per-number statistics for one lottery, indexed by ``number - 1``."""
+    latest_contest: int
+    frequency: np.ndarray
+    last_draw_contest: np.ndarray  # -1 when the number was never drawn
+    delay: np.ndarray
+    max_delay: np.ndarray
+    average_delay: np.ndarray
+    gap_sum: np.ndarray
+    gap_count: np.ndarray
+
+    @property
+    def total_numbers(self) -> int:
+        return len(self.frequency)
+
+    def as_rows(self) -> List[Dict[str, Any]]:
+        """Return one dict per number using the ``NumberStatistics`` field names."""
+        return [
+            {
+                'number': index + 1,
+                'frequency': int(self.frequency[index]),
+                'last_draw_contest': (
+                    int(self.last_draw_contest[index])
+                    if self.last_draw_contest[index] >= 0 else None
+                ),
+                'delay': int(self.delay[index]),
+                'max_delay': int(self.max_delay[index]),
+                'average_delay': float(self.average_delay[index]),
+                'gap_sum': int(self.gap_sum[index]),
+                'gap_count': int(self.gap_count[index]),
+            }
+            for index in range(self.total_numbers)
+        ]
+
+
+def compute_statistics(
+    contest_numbers: Sequence[int],
+    matrix: np.ndarray
+) -> HistoryStatistics:
+    """
+    Derive frequency and delay metrics for every number in one pass.
+
+    Gaps are measured in contest numbers between consecutive appearances,
+    the current delay is the distance from the last appearance to the latest
+    contest (0 for numbers never drawn).
+
+    Args:
+        contest_numbers: Contest number of each matrix row, ascending
+        matrix: Incidence matrix from ``build_incidence_matrix``
+
+    Returns:
+        HistoryStatistics with one entry per number
+    """
+    contests = np.asarray(contest_numbers, dtype=np.int64)
+    total_numbers = matrix.shape[1]
+
+    if len(contests) == 0:
+        zeros = np.zeros(total_numbers, dtype=np.int64)
+        return HistoryStatistics(
+            latest_contest=0,
+            frequency=zeros,
+            last_draw_contest=np.full(total_numbers, -1, dtype=np.int64),
+            delay=zeros.copy(),
+            max_delay=zeros.copy(),
+            average_delay=np.zeros(total_numbers, dtype=np.float64),
+            gap_sum=zeros.copy(),
+            gap_count=zeros.copy(),
+        )
+
+    latest_contest = int(contests[-1])
+    frequency = matrix.sum(axis=0, dtype=np.int64)
+    seen = frequency > 0
+
+    # First and last appearance per number (row indices)
+    first_row = matrix.argmax(axis=0)
+    last_row = len(contests) - 1 - matrix[::-1].argmax(axis=0)
+
+    last_draw_contest = np.where(seen, contests[last_row], -1)
+    first_draw_contest = np.where(seen, contests[first_row], -1)
+    delay = np.where(seen, latest_contest - last_draw_contest, 0)
+
+    # Consecutive gaps telescope, so their sum is last - first
+    gap_count = np.maximum(frequency - 1, 0)
+    gap_sum = np.where(seen, last_draw_contest - first_draw_contest, 0)
+    average_delay = np.divide(
+        gap_sum, gap_count,
+        out=np.zeros(total_numbers, dtype=np.float64),
+        where=gap_count > 0
+    )
+
+    # Max gap: walk appearances grouped by number (transpose keeps them sorted)
+    number_idx, row_idx = np.nonzero(matrix.T)
+    max_delay = np.zeros(total_numbers, dtype=np.int64)
+    if len(row_idx) > 1:
+        gaps = np.diff(contests[row_idx])
+        same_number = number_idx[1:] == number_idx[:-1]
+        np.maximum.at(max_delay, number_idx[1:][same_number], gaps[same_number])
+
+    return HistoryStatistics(
+        latest_contest=latest_contest,
+        frequency=frequency,
+        last_draw_contest=last_draw_contest,
+        delay=delay,
+        max_delay=max_delay,
+        average_delay=average_delay,
+        gap_sum=gap_sum,
+        gap_count=gap_count,
+    )
+
+
+def latest_contest(rows: Iterable[Dict[str, Any]]) -> Optional[int]:
+    """
+    Recover the latest contest already folded into a set of statistics rows.
+
+    Every drawn number satisfies ``last_draw_contest + delay == latest``.
+
+    Returns:
+        Latest contest number, or None when no number was ever drawn
+    """
+    contests = [
+        row['last_draw_contest'] + row['delay']
+        for row in rows
+        if row['last_draw_contest'] is not None
+    ]
+    return max(contests) if contests else None
+
+
+def apply_draw(
+    rows: Iterable[Dict[str, Any]],
+    contest_number: int,
+    numbers: Iterable[int]
+) -> None:
+    """
+    Fold one new draw into existing statistics rows, in place.
+
+    Uses the running gap counters so each row is updated in O(1); the draw
+    must be newer than every contest already counted (see ``latest_contest``).
+
+    Args:
+        rows: Statistics dicts as produced by ``HistoryStatistics.as_rows``
+        contest_number: Contest number of the new draw
+        numbers: Numbers drawn in that contest
+    """
+    drawn = set(numbers)
+    for row in rows:
+        last = row['last_draw_contest']
+        if row['number'] in drawn:
+            if last is not None:
+                gap = contest_number - last
+                row['gap_sum'] += gap
+                row['gap_count'] += 1
+                row['max_delay'] = max(row['max_delay'], gap)
+                row['average_delay'] = row['gap_sum'] / row['gap_count']
+            row['frequency'] += 1
+            row['last_draw_contest'] = contest_number
+            row['delay'] = 0
+        elif last is not None:
+            row['delay'] = contest_number - last
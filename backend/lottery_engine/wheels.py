@@ -0,0 +1,298 @@
+"""
+Reduced wheels ("fechamentos") as covering designs.
+
+A wheel over ``v`` chosen numbers is a set of games of ``k`` numbers such
+that whenever ``m`` of the drawn numbers fall inside the chosen ones, at
+least one game hits ``t`` of them. That is the lotto design L(v, k, m, t):
+every m-subset (target) must meet some k-subset (block) in ``t`` or more
+elements.
+
+The solver works on positions ``0 .. v - 1`` with blocks and targets as
+uint32 bitmasks and runs greedy set cover in one of two ways:
+
+* incremental: exact gains are kept up to date by enumerating, for each
+  newly covered target, the blocks that cover it. Total work is
+  ``targets x neighbourhood``, tiny when ``t`` is close to ``k`` (e.g.
+  21 numbers guaranteeing 14 in Lotofácil).
+* lazy: gains are upper bounds, re-scored in batches against the uncovered
+  targets only when they reach the top. Bounds are also tightened after
+  every pick using the overlap with the picked block, which depends only on
+  the size of the intersection. Best when few blocks are needed.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from itertools import combinations
+from math import comb
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MAX_WHEEL_NUMBERS = 32
+MAX_SUBSETS = 2_000_000
+# Incremental updates above this many neighbour visits switch to lazy greedy
+MAX_INCREMENTAL_WORK = 200_000_000
+# Direct mask -> index lookup tables are used up to 2**24 entries
+_MAX_LOOKUP_BITS = 24
+_LAZY_BATCH = 256
+# Neighbour masks materialized per update step
+_UPDATE_CHUNK = 1 << 22
+
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+@dataclass(frozen=True)
+class WheelDesign:
+    """Solved design over positions ``0 .. v - 1``."""
+    v: int
+    k: int
+    m: int
+    t: int
+    blocks: np.ndarray  # int64 (games, k), sorted positions
+    complete: bool      # False when the time budget forced the fallback
+    solve_seconds: float
+
+    def games(self, numbers: List[int]) -> List[List[int]]:
+        """Map the design onto concrete numbers (sorted ascending)."""
+        chosen = np.sort(np.asarray(numbers, dtype=np.int64))
+        return chosen[self.blocks].tolist()
+
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    """Element-wise popcount of a uint32 array of any shape."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks)
+    masks = np.ascontiguousarray(masks, dtype=np.uint32)
+    return _POPCOUNT_TABLE[masks.view(np.uint8)].reshape(masks.shape + (4,)).sum(axis=-1, dtype=np.uint8)
+
+
+def _masks(positions: np.ndarray) -> np.ndarray:
+    """OR the bits of the positions on the last axis."""
+    if positions.shape[-1] == 0:
+        return np.zeros(positions.shape[:-1], dtype=np.uint32)
+    return np.bitwise_or.reduce(np.left_shift(np.uint32(1), positions.astype(np.uint32)), axis=-1)
+
+
+def _positions(masks: np.ndarray, v: int) -> np.ndarray:
+    """Sorted set positions of equal-popcount masks, shape (len(masks), popcount)."""
+    bits = (masks[:, None] >> np.arange(v, dtype=np.uint32)) & np.uint32(1)
+    _, columns = np.nonzero(bits)
+    return columns.reshape(len(masks), -1).astype(np.intp)
+
+
+def _combinations(n: int, r: int) -> np.ndarray:
+    combos = list(combinations(range(n), r))
+    return np.array(combos, dtype=np.intp).reshape(len(combos), r)
+
+
+def _subset_masks(v: int, size: int) -> np.ndarray:
+    """All size-subsets of 0..v-1 as masks, ascending."""
+    return np.sort(_masks(_combinations(v, size)))
+
+
+def _indexer(masks: np.ndarray, v: int) -> Callable[[np.ndarray], np.ndarray]:
+    """Map masks (known to be in ``masks``) to their index in the sorted array."""
+    if v <= _MAX_LOOKUP_BITS:
+        lookup = np.zeros(1 << v, dtype=np.int32)
+        lookup[masks] = np.arange(len(masks), dtype=np.int32)
+        return lambda query: lookup[query]
+    return lambda query: np.searchsorted(masks, query)
+
+
+def _neighbour_count(v: int, p: int, q: int, t: int) -> int:
+    """q-subsets meeting a fixed p-subset in at least t elements."""
+    return sum(comb(p, j) * comb(v - p, q - j) for j in range(t, min(p, q) + 1))
+
+
+def _neighbours(centres: np.ndarray, v: int, p: int, q: int, t: int) -> np.ndarray:
+    """
+    Masks of every q-subset meeting each p-subset centre in ``t`` or more elements.
+
+    Each neighbour keeps ``j`` of the centre's positions and adds ``q - j``
+    from outside it.
+
+    Returns:
+        (len(centres), _neighbour_count(v, p, q, t)) uint32 array
+    """
+    inside = _positions(centres, v)
+    outside = _positions(~centres & np.uint32((1 << v) - 1), v)
+    parts = []
+    for j in range(t, min(p, q) + 1):
+        if q - j > v - p:
+            continue
+        dropped = _masks(inside[:, _combinations(p, p - j)])
+        added = _masks(outside[:, _combinations(v - p, q - j)])
+        kept = centres[:, None] ^ dropped
+        parts.append((kept[:, :, None] | added[:, None, :]).reshape(len(centres), -1))
+    return np.concatenate(parts, axis=1)
+
+
+def _overlap_table(v: int, k: int, m: int, t: int) -> np.ndarray:
+    """
+    ``table[i]``: targets covered by both of two blocks sharing ``i`` positions.
+
+    The four regions (both blocks, only the first, only the second, neither)
+    have sizes i, k - i, k - i and v - 2k + i; a target takes x1..x4 from
+    them and is covered by both when x1 + x2 >= t and x1 + x3 >= t.
+    """
+    table = np.zeros(k + 1, dtype=np.int64)
+    for i in range(max(0, 2 * k - v), k + 1):
+        rest = v - 2 * k + i
+        for x1 in range(i + 1):
+            for x2 in range(k - i + 1):
+                for x3 in range(k - i + 1):
+                    x4 = m - x1 - x2 - x3
+                    if 0 <= x4 <= rest and x1 + x2 >= t and x1 + x3 >= t:
+                        table[i] += comb(i, x1) * comb(k - i, x2) * comb(k - i, x3) * comb(rest, x4)
+    return table
+
+
+def check_parameters(v: int, k: int, m: int, t: int) -> None:
+    """Raise ValueError unless L(v, k, m, t) is well defined and small enough to solve."""
+    if not 1 <= k <= v <= MAX_WHEEL_NUMBERS:
+        raise ValueError(f"Escolha entre {k} e {MAX_WHEEL_NUMBERS} números para jogos de {k}")
+    if not 1 <= m <= v:
+        raise ValueError(f"A condição de sorteio deve estar entre 1 e {v} números")
+    if not 1 <= t <= min(k, m):
+        raise ValueError(f"A garantia deve estar entre 1 e {min(k, m)} acertos")
+    if comb(v, k) > MAX_SUBSETS or comb(v, m) > MAX_SUBSETS:
+        raise ValueError("Fechamento grande demais para ser calculado")
+
+
+def _greedy_incremental(v, k, m, t, blocks, targets, deadline) -> Tuple[List[int], np.ndarray]:
+    block_index = _indexer(blocks, v)
+    target_index = _indexer(targets, v)
+    # Every block starts with the same gain (symmetry)
+    gains = np.full(len(blocks), _neighbour_count(v, k, m, t), dtype=np.int64)
+    covered = np.zeros(len(targets), dtype=bool)
+    chunk = max(1, _UPDATE_CHUNK // _neighbour_count(v, m, k, t))
+    chosen = []
+
+    while not covered.all() and time.monotonic() < deadline:
+        block = int(gains.argmax())
+        chosen.append(block)
+        reached = target_index(_neighbours(blocks[[block]], v, k, m, t)[0])
+        new = reached[~covered[reached]]
+        covered[new] = True
+        # Each newly covered target stops counting towards every block that covers it
+        for start in range(0, len(new), chunk):
+            centres = targets[new[start:start + chunk]]
+            losers = block_index(_neighbours(centres, v, m, k, t).ravel())
+            gains -= np.bincount(losers, minlength=len(blocks))
+
+    return chosen, targets[~covered]
+
+
+def _greedy_lazy(v, k, m, t, blocks, targets, deadline) -> Tuple[List[int], np.ndarray]:
+    bounds = np.full(len(blocks), _neighbour_count(v, k, m, t), dtype=np.int64)
+    caps = bounds[0] - _overlap_table(v, k, m, t)
+    uncovered = targets
+    chosen = []
+
+    while len(uncovered) and time.monotonic() < deadline:
+        best_gain, best_block, best_hits = -1, -1, None
+        while True:
+            # Re-score the highest bounds in one batch
+            top = np.argpartition(-bounds, min(_LAZY_BATCH, len(bounds) - 1))[:_LAZY_BATCH]
+            top = top[bounds[top] > best_gain]
+            if not len(top):
+                break
+            hits = _popcount(blocks[top][:, None] & uncovered[None, :]) >= t
+            gains = hits.sum(axis=1)
+            bounds[top] = gains
+            winner = int(gains.argmax())
+            if gains[winner] > best_gain:
+                best_gain, best_block, best_hits = int(gains[winner]), int(top[winner]), hits[winner]
+
+        chosen.append(best_block)
+        uncovered = uncovered[~best_hits]
+        # A block's gain cannot exceed what it does not share with the pick
+        np.minimum(bounds, caps[_popcount(blocks & blocks[best_block])], out=bounds)
+        bounds[best_block] = -1
+
+    return chosen, uncovered
+
+
+def solve_wheel(v: int, k: int, m: int, t: int, time_budget: float = 30.0) -> WheelDesign:
+    """
+    Build a wheel L(v, k, m, t) by greedy set cover.
+
+    The budget is checked between picks. Once it runs out, the remaining
+    targets are covered one at a time by the first block that covers each;
+    the result is still a valid wheel, just larger than the greedy one.
+
+    Returns:
+        WheelDesign with ``complete`` telling whether greedy finished
+    """
+    check_parameters(v, k, m, t)
+    started = time.monotonic()
+    blocks = _subset_masks(v, k)
+    targets = _subset_masks(v, m)
+
+    work = len(targets) * _neighbour_count(v, m, k, t)
+    greedy = _greedy_incremental if work <= MAX_INCREMENTAL_WORK else _greedy_lazy
+    chosen, uncovered = greedy(v, k, m, t, blocks, targets, started + time_budget)
+    complete = not len(uncovered)
+
+    while len(uncovered):
+        block = int(np.flatnonzero(_popcount(blocks & uncovered[0]) >= t)[0])
+        chosen.append(block)
+        uncovered = uncovered[_popcount(uncovered & blocks[block]) < t]
+
+    return WheelDesign(
+        v=v, k=k, m=m, t=t,
+        blocks=_positions(blocks[sorted(chosen)], v).astype(np.int64),
+        complete=complete,
+        solve_seconds=time.monotonic() - started,
+    )
+
+
+def verify_wheel(design: WheelDesign) -> bool:
+    """Check the covering guarantee exhaustively."""
+    targets = _subset_masks(design.v, design.m)
+    covered = np.zeros(len(targets), dtype=bool)
+    for block in _masks(design.blocks):
+        covered |= _popcount(targets & block) >= design.t
+    return bool(covered.all())
+
+
+class WheelCache:
+    """Process-wide cache of solved designs keyed by (v, k, m, t)."""
+
+    def __init__(self, time_budget: float = 30.0):
+        self.time_budget = time_budget
+        self._designs: Dict[Tuple[int, int, int, int], WheelDesign] = {}
+        self._solving: Dict[Tuple[int, int, int, int], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, v: int, k: int, m: int, t: int) -> Tuple[WheelDesign, bool]:
+        """
+        Return the design and whether it came from the cache.
+
+        Each design is solved under its own lock, so concurrent requests for
+        the same design wait for one solver instead of racing, while other
+        designs (cached or not) proceed. The shared lock only guards the
+        dictionaries.
+        """
+        key = (v, k, m, t)
+        design: Optional[WheelDesign] = self._designs.get(key)
+        if design is not None:
+            return design, True
+        with self._lock:
+            design = self._designs.get(key)
+            if design is not None:
+                return design, True
+            solving = self._solving.setdefault(key, threading.Lock())
+        with solving:
+            design = self._designs.get(key)
+            if design is not None:
+                return design, True
+            try:
+                design = solve_wheel(v, k, m, t, self.time_budget)
+                with self._lock:
+                    self._designs[key] = design
+            finally:
+                # Drop the per-design lock even when the solver raises
+                with self._lock:
+                    self._solving.pop(key, None)
+            return design, False
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Backfill numbers bitmask columns for draws and user combinations
+"""
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import update
+from app.db.session import SessionLocal
+from app.models import Draw, UserCombination
+from lottery_engine import encode_words
+
+BATCH_SIZE = 1000
+
+
+def backfill_masks(model):
+    """Recompute numbers_mask_low/high for every row of a model"""
+    db = SessionLocal()
+    
+    try:
+        rows = db.query(model.id, model.numbers).all()
+        print(f"Backfilling {len(rows)} rows of {model.__tablename__}...")
+        
+        for start in range(0, len(rows), BATCH_SIZE):
+            params = []
+            for row in rows[start:start + BATCH_SIZE]:
+                low, high = encode_words(row.numbers or [])
+                params.append({"id": row.id, "numbers_mask_low": low, "numbers_mask_high": high})
+            db.execute(update(model), params)
+        
+        db.commit()
+        print(f"✅ {model.__tablename__} backfilled")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    backfill_masks(Draw)
+    backfill_masks(UserCombination)
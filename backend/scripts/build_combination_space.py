@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Precompute the Lotofácil combination space with its feature columns
+"""
+import sys
+from pathlib import Path
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings
+from lottery_engine import build_space
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else settings.COMBINATION_SPACE_DIR
+    print(f"Building combination space in {output}...")
+    total = build_space(output)
+    print(f"✅ {total} combinations written")
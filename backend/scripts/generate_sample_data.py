@@ -2,6 +2,7 @@
 """
 Generate sample draw data for testing
 """
+import asyncio
 import sys
 import random
 from datetime import datetime, timedelta
@@ -10,11 +11,19 @@ from pathlib import Path
 # Add app directory to path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal, async_engine
 from app.models import Draw, LotteryConfiguration
 from app.services import StatisticsService
 
 
+async def calculate_statistics(lottery_type: str):
+    """Recalculate statistics through the async service"""
+    async with AsyncSessionLocal() as db:
+        await StatisticsService.calculate_statistics(db, lottery_type)
+    # Each asyncio.run gets a new loop; don't keep connections bound to this one
+    await async_engine.dispose()
+
+
 def generate_sample_draws(lottery_type: str, count: int = 100):
     """Generate sample draw data"""
     db = SessionLocal()
@@ -68,7 +77,7 @@ def generate_sample_draws(lottery_type: str, count: int = 100):
         
         # Calculate statistics
         print(f"Calculating statistics for {lottery_type}...")
-        StatisticsService.calculate_statistics(db, lottery_type)
+        asyncio.run(calculate_statistics(lottery_type))
         print(f"✅ Statistics calculated for {lottery_type}")
         
     except Exception as e:
@@ -0,0 +1,92 @@
+"""
+Shared fixtures: an isolated SQLite database seeded with a small history
+"""
+import os
+from datetime import date, timedelta
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.db.session import Base, get_db, get_session_factory
+from app.models import Draw, LotteryConfiguration
+from app.services.history import draw_histories
+from app.services.statistics import statistics_cache
+
+HISTORY = {
+    1: list(range(1, 16)),
+    2: list(range(11, 26)),
+    4: list(range(1, 11)) + [21, 22, 23, 24, 25],
+}
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    session.add(LotteryConfiguration(
+        lottery_type="LOTOFACIL",
+        total_numbers=25,
+        numbers_to_pick=15,
+        min_bet_numbers=15,
+        max_bet_numbers=20,
+    ))
+    for contest, numbers in HISTORY.items():
+        session.add(Draw(
+            lottery_type="LOTOFACIL",
+            contest_number=contest,
+            draw_date=date(2024, 1, 1) + timedelta(days=contest),
+            numbers=numbers,
+        ))
+    session.commit()
+    draw_histories.invalidate()
+    statistics_cache.store.clear()
+
+    yield session
+
+    session.close()
+    engine.dispose()
+    draw_histories.invalidate()
+
+
+@pytest.fixture
+def async_session(db):
+    """Async sessions on the seeded file, as the API sees it"""
+    # Tests run several event loops (asyncio.run, TestClient): no pooled connections
+    engine = create_async_engine(db.get_bind().url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool)
+    yield async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture
+def client(async_session):
+    from app.main import app
+
+    async def override_get_db():
+        async with async_session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: async_session
+    # One event loop for the whole test, as under uvicorn
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def process_pool():
+    """Two shared worker processes, whatever the CPU count of the test machine"""
+    from lottery_engine.processes import configure_processes, shutdown_processes
+
+    shutdown_processes()
+    configure_processes(2)
+    yield
+    shutdown_processes()
+    configure_processes(None)
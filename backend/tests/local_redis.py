@@ -0,0 +1,207 @@
+"""
+In-process stand-in for a Redis server.
+
+Test support only. Speaks enough of the RESP2 protocol for the shared
+caches (strings with expiry, NX/XX sets, counters, deletes) so real Redis
+clients, Django's ``RedisCache`` and ``AsyncRedisStore``, can run against
+it in the FastAPI and Django test suites without a Redis install. Data
+lives in one dict guarded by a lock; each connection is served by its own
+thread.
+"""
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+_Value = Tuple[bytes, Optional[float]]
+
+
+class _Error(Exception):
+    pass
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: '_Server'
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            # Inline command (e.g. "PING" typed into a socket)
+            return line.split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self) -> None:
+        while True:
+            try:
+                args = self._read_command()
+            except (ConnectionError, ValueError):
+                return
+            if not args:
+                return
+            try:
+                reply = self.server.owner.execute(args)
+            except _Error as e:
+                reply = e
+            self.wfile.write(_encode(reply))
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    owner: 'LocalRedisServer'
+
+
+def _encode(reply) -> bytes:
+    if isinstance(reply, _Error):
+        return b'-ERR ' + str(reply).encode() + b'\r\n'
+    if reply is None:
+        return b'$-1\r\n'
+    if reply is True:
+        return b'+OK\r\n'
+    if isinstance(reply, int):
+        return b':%d\r\n' % reply
+    if isinstance(reply, bytes):
+        return b'$%d\r\n%s\r\n' % (len(reply), reply)
+    if isinstance(reply, list):
+        return b'*%d\r\n' % len(reply) + b''.join(_encode(item) for item in reply)
+    raise TypeError(reply)
+
+
+class LocalRedisServer:
+    """
+    Threaded RESP server on localhost.
+
+    Usage::
+
+        with LocalRedisServer() as server:
+            client = redis.Redis.from_url(server.url)
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self._data: Dict[bytes, _Value] = {}
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.owner = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'redis://{host}:{port}/0'
+
+    def start(self) -> 'LocalRedisServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'LocalRedisServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _live(self, key: bytes) -> Optional[_Value]:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def execute(self, args: List[bytes]):
+        """Run one command under the data lock and return its reply."""
+        name = args[0].upper().decode()
+        handler = getattr(self, f'_cmd_{name.lower()}', None)
+        if handler is None:
+            raise _Error(f"unknown command '{name}'")
+        with self._lock:
+            return handler(*args[1:])
+
+    def _cmd_ping(self, *args):
+        return args[0] if args else True
+
+    def _cmd_client(self, *args):
+        return True
+
+    def _cmd_select(self, db):
+        return True
+
+    def _cmd_get(self, key):
+        entry = self._live(key)
+        return None if entry is None else entry[0]
+
+    def _cmd_set(self, key, value, *options):
+        expires = None
+        nx = xx = False
+        options = list(options)
+        while options:
+            option = options.pop(0).upper()
+            if option in (b'EX', b'PX'):
+                amount = int(options.pop(0))
+                if amount <= 0:
+                    raise _Error('invalid expire time in set')
+                expires = time.monotonic() + (amount if option == b'EX' else amount / 1000)
+            elif option == b'NX':
+                nx = True
+            elif option == b'XX':
+                xx = True
+            else:
+                raise _Error('syntax error')
+        exists = self._live(key) is not None
+        if (nx and exists) or (xx and not exists):
+            return None
+        self._data[key] = (value, expires)
+        return True
+
+    def _cmd_incrby(self, key, delta):
+        entry = self._live(key)
+        try:
+            value = int(entry[0] if entry else 0) + int(delta)
+        except ValueError:
+            raise _Error('value is not an integer or out of range')
+        self._data[key] = (str(value).encode(), entry[1] if entry else None)
+        return value
+
+    def _cmd_incr(self, key):
+        return self._cmd_incrby(key, b'1')
+
+    def _cmd_decrby(self, key, delta):
+        return self._cmd_incrby(key, str(-int(delta)).encode())
+
+    def _cmd_exists(self, *keys):
+        return sum(self._live(key) is not None for key in keys)
+
+    def _cmd_del(self, *keys):
+        return sum(self._data.pop(key, None) is not None for key in keys if self._live(key) is not None)
+
+    def _cmd_pexpire(self, key, milliseconds):
+        entry = self._live(key)
+        if entry is None:
+            return 0
+        self._data[key] = (entry[0], time.monotonic() + int(milliseconds) / 1000)
+        return 1
+
+    def _cmd_expire(self, key, seconds):
+        return self._cmd_pexpire(key, int(seconds) * 1000)
+
+    def _cmd_pttl(self, key):
+        entry = self._live(key)
+        if entry is None:
+            return -2
+        return -1 if entry[1] is None else int((entry[1] - time.monotonic()) * 1000)
+
+    def _cmd_flushdb(self, *args):
+        self._data.clear()
+        return True
+
+    _cmd_flushall = _cmd_flushdb
@@ -29,3 +29,173 @@ def test_placeholder():
 #     response = client.get("/health")
 #     assert response.status_code == 200
 #     assert response.json()["status"] == "healthy"
+
+
+def test_list_draws(client):
+    response = client.get("/api/lotteries/LOTOFACIL/draws", params={"limit": 2})
+
+    assert response.status_code == 200
+    page = response.json()
+    assert [draw["contest_number"] for draw in page["items"]] == [4, 2]
+    assert page["prev"] is None
+
+    older = client.get("/api/lotteries/LOTOFACIL/draws", params={"limit": 2, "cursor": page["next"]}).json()
+    assert [draw["contest_number"] for draw in older["items"]] == [1]
+    assert older["next"] is None
+
+    newer = client.get("/api/lotteries/LOTOFACIL/draws", params={"limit": 2, "cursor": older["prev"]}).json()
+    assert [draw["contest_number"] for draw in newer["items"]] == [4, 2]
+    assert newer["prev"] is None and newer["next"] == page["next"]
+
+
+def test_list_draws_rejects_bad_cursor(client):
+    response = client.get("/api/lotteries/LOTOFACIL/draws", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+def test_latest_draw_not_found(client):
+    response = client.get("/api/lotteries/QUINA/draws/latest")
+
+    assert response.status_code == 404
+
+
+def test_statistics_are_republished_on_recalculate(client, db):
+    from datetime import date
+    from app.models import Draw
+
+    assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+    stats = client.get("/api/statistics/LOTOFACIL").json()
+    assert len(stats) == 25
+    assert stats[0]["number"] == 1 and stats[0]["frequency"] == 2
+
+    db.add(Draw(lottery_type="LOTOFACIL", contest_number=5, draw_date=date(2024, 1, 6), numbers=list(range(1, 16))))
+    db.commit()
+    assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+
+    assert client.get("/api/statistics/LOTOFACIL", params={"limit": 1}).json()[0]["frequency"] == 3
+    frequent = client.get("/api/statistics/LOTOFACIL/frequent", params={"limit": 3}).json()
+    assert [row["frequency"] for row in frequent] == [3, 3, 3]
+
+
+def test_statistics_through_shared_cache(client, monkeypatch):
+    from redis.asyncio import Redis
+    from app.services.statistics import statistics_cache
+    from lottery_engine import AsyncRedisStore
+    from tests.local_redis import LocalRedisServer
+
+    with LocalRedisServer() as server:
+        monkeypatch.setattr(statistics_cache, "store", AsyncRedisStore(Redis.from_url(server.url)))
+        assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+
+        stats = client.get("/api/statistics/LOTOFACIL").json()
+        assert len(stats) == 25 and stats[0]["frequency"] == 2
+        assert client.get("/api/statistics/LOTOFACIL/delayed", params={"limit": 1}).json()[0]["delay"] == 2
+
+
+def test_conditional_get_skips_the_database(client, monkeypatch):
+    from app.db.session import get_db
+    from app.main import app
+
+    assert client.get("/api/statistics/LOTOFACIL").headers.get("etag") is None
+    assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+
+    response = client.get("/api/statistics/LOTOFACIL")
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+    assert response.status_code == 200 and etag.startswith('W/"LOTOFACIL-4-')
+
+    def no_database():
+        raise AssertionError("304 must not open a session")
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, no_database)
+    paths = (
+        "/api/statistics/LOTOFACIL/frequent",
+        "/api/lotteries/LOTOFACIL/draws",
+        "/api/lotteries/LOTOFACIL/draws/latest",
+    )
+    for path in paths:
+        response = client.get(path, headers={"If-None-Match": f'"other", {etag}'})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+    assert client.get("/api/statistics/LOTOFACIL", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+
+def test_etag_changes_with_new_draws(client, db):
+    from datetime import date
+    from app.models import Draw
+
+    assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+    etag = client.get("/api/lotteries/LOTOFACIL/draws/latest").headers["etag"]
+
+    db.add(Draw(lottery_type="LOTOFACIL", contest_number=5, draw_date=date(2024, 1, 6), numbers=list(range(1, 16))))
+    db.commit()
+    assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+
+    response = client.get("/api/lotteries/LOTOFACIL/draws/latest", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["contest_number"] == 5
+    assert response.headers["etag"] != etag
+
+
+def test_statistics_response_bytes_are_cached(client, monkeypatch):
+    from app.services import StatisticsService
+
+    assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+    first = client.get("/api/statistics/LOTOFACIL", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["vary"] == "Accept-Encoding"
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("cached response must not be rebuilt")
+
+    monkeypatch.setattr(StatisticsService, "get_statistics", fail)
+    second = client.get("/api/statistics/LOTOFACIL", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in second.headers
+    assert second.json() == first.json() and len(second.json()) == 25
+
+    # Other parameters are another entry, built by the service
+    with pytest.raises(AssertionError, match="rebuilt"):
+        client.get("/api/statistics/LOTOFACIL", params={"limit": 3})
+
+
+def test_lotteries_list_and_latest_draw_are_cached(client, monkeypatch):
+    lotteries = client.get("/api/lotteries/")
+    assert lotteries.status_code == 200
+    assert "LOTOFACIL" in [row["lottery_type"] for row in lotteries.json()]
+    assert client.get("/api/lotteries/").content == lotteries.content
+
+    assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+    latest = client.get("/api/lotteries/LOTOFACIL/draws/latest").json()
+    assert latest["contest_number"] == 4 and latest["numbers"] == list(range(1, 11)) + [21, 22, 23, 24, 25]
+    assert client.get("/api/lotteries/LOTOFACIL/draws/latest").json() == latest
+    assert "numbers_mask_low" not in latest and "numbers_mask_high" not in latest
+    assert client.get("/api/lotteries/LOTOFACIL/draws/4").json() == latest
+
+
+def test_choose_encoding():
+    from app.core.responses import choose_encoding, encode_body
+
+    encoded = encode_body(b"[" + b"1," * 400 + b"1]")
+    assert choose_encoding(encoded, "gzip, deflate") == "gzip"
+    assert choose_encoding(encoded, "gzip;q=0, deflate") == "identity"
+    assert choose_encoding(encoded, "") == "identity"
+    assert choose_encoding(encode_body(b"[]"), "gzip") == "identity"
+
+
+def test_statistics_upsert_without_on_conflict(client, db, monkeypatch):
+    """Dialects without ON CONFLICT fall back to select-then-bulk-write"""
+    from datetime import date
+    from app.db import upsert
+    from app.models import Draw, NumberStatistics
+
+    monkeypatch.setattr(upsert, "UPSERT_DIALECTS", {})
+    assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+    db.add(Draw(lottery_type="LOTOFACIL", contest_number=5, draw_date=date(2024, 1, 6), numbers=list(range(1, 16))))
+    db.commit()
+    assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+
+    db.expire_all()
+    stats = db.query(NumberStatistics).filter_by(lottery_type="LOTOFACIL").order_by(NumberStatistics.number).all()
+    assert len(stats) == 25
+    assert stats[0].frequency == 3 and stats[0].last_draw_contest == 5
+    assert stats[24].delay == 1
@@ -0,0 +1,100 @@
+"""
+Tests for the strategy backtesting engine
+"""
+import threading
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pytest
+
+from lottery_engine import build_incidence_matrix, compute_statistics, run_backtest
+from lottery_engine.backtest import _state_after
+
+
+def _history(draws=60, seed=3):
+    rng = np.random.default_rng(seed)
+    rows = [rng.choice(25, 15, replace=False) + 1 for _ in range(draws)]
+    return np.arange(1, draws + 1) * 2, build_incidence_matrix(rows, 25)
+
+
+def test_state_matches_full_statistics():
+    contests, matrix = _history()
+
+    frequency, last_seen = _state_after(contests, matrix, 40)
+    statistics = compute_statistics(contests[:41], matrix[:41])
+
+    assert (frequency == statistics.frequency).all()
+    assert (last_seen == statistics.last_draw_contest).all()
+
+
+def test_frequent_pool_scores_against_next_draw():
+    contests, matrix = _history()
+
+    # 20-number games from a 20-number pool are the pool itself
+    result = run_backtest(contests, matrix, 20, games_per_contest=1, strategies=['frequent'], workers=1)
+
+    expected = []
+    for index in range(len(contests) - 1):
+        top = np.argsort(-matrix[:index + 1].sum(axis=0), kind='stable')[:20]
+        expected.append(int(matrix[index + 1, top].sum()))
+    assert (result['counts']['frequent'] == np.bincount(expected, minlength=21)).all()
+    assert result['steps'] == len(contests) - 1
+    assert result['first_contest'] == contests[1]
+
+
+def test_results_do_not_depend_on_workers(process_pool):
+    contests, matrix = _history()
+    options = dict(games_per_contest=5, seed=11, chunk_size=16)
+
+    inline = run_backtest(contests, matrix, 15, workers=1, **options)
+    pooled = run_backtest(contests, matrix, 15, workers=2, **options)
+
+    for strategy, counts in inline['counts'].items():
+        assert counts.sum() == 5 * (len(contests) - 1)
+        assert (counts == pooled['counts'][strategy]).all()
+
+
+def test_backtest_endpoint(client):
+    payload = {"lottery_type": "LOTOFACIL", "games_per_contest": 3, "seed": 1}
+
+    response = client.post("/api/backtest/", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["contests"] == 2
+    assert data["first_contest"] == 2
+    assert data["strategies"]["random"]["games"] == 6
+    assert set(data["strategies"]["mixed"]["prize_tiers"]) == {
+        "15 acertos", "14 acertos", "13 acertos", "12 acertos", "11 acertos"
+    }
+
+
+def test_backtest_rejects_unknown_strategy(client):
+    payload = {"lottery_type": "LOTOFACIL", "strategies": ["hot"]}
+
+    response = client.post("/api/backtest/", json=payload)
+
+    assert response.status_code == 400
+
+
+def test_chunks_share_one_capped_process_pool(process_pool):
+    from lottery_engine.processes import shared_executor
+
+    contests, matrix = _history()
+    run_backtest(contests, matrix, 15, games_per_contest=2, seed=1, workers=8, chunk_size=16)
+    executor = shared_executor()
+    run_backtest(contests, matrix, 15, games_per_contest=2, seed=2, workers=8, chunk_size=16)
+
+    assert shared_executor() is executor
+    assert executor._max_workers == 2
+    assert executor._mp_context.get_start_method() != "fork"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cancelled_backtest_stops_between_chunks(process_pool, workers):
+    contests, matrix = _history()
+    cancel = threading.Event()
+    cancel.set()
+
+    with pytest.raises(CancelledError):
+        run_backtest(contests, matrix, 15, seed=1, workers=workers, chunk_size=16, cancel=cancel)
@@ -0,0 +1,41 @@
+"""
+Tests for bitmask encoding of lottery numbers
+"""
+import numpy as np
+
+from lottery_engine import (
+    build_incidence_matrix,
+    decode_mask,
+    encode_mask,
+    encode_words,
+    join_mask,
+    masks_from_matrix,
+    masks_from_numbers,
+    match_count,
+    popcount,
+)
+
+
+def test_round_trip_through_stored_words():
+    numbers = [1, 7, 13, 63, 64, 65, 80]
+
+    low, high = encode_words(numbers)
+
+    # Number 64 sets the sign bit of the low word
+    assert low < 0
+    assert decode_mask(join_mask(low, high)) == numbers
+
+
+def test_match_count():
+    assert match_count(encode_mask(range(1, 16)), encode_mask(range(11, 26))) == 5
+
+
+def test_vectorized_encoding_matches_scalar():
+    games = [[1, 2, 3, 80], [5, 64, 65], [25]]
+
+    from_numbers = masks_from_numbers(games)
+    from_matrix = masks_from_matrix(build_incidence_matrix(games, 80))
+
+    assert np.array_equal(from_numbers, from_matrix)
+    assert popcount(from_numbers).tolist() == [4, 3, 1]
+    assert popcount(from_numbers & from_numbers[0]).tolist() == [4, 0, 0]
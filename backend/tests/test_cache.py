@@ -0,0 +1,150 @@
+"""
+Tests for the versioned write-through cache
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from datetime import datetime, timezone
+
+from lottery_engine import (
+    AsyncRedisStore,
+    AsyncVersionedCache,
+    MemoryStore,
+    VersionedCache,
+    pack_rows,
+    unpack_rows,
+)
+from tests.local_redis import LocalRedisServer
+
+
+@pytest.fixture
+def redis_server():
+    with LocalRedisServer() as server:
+        yield server
+
+
+def test_memory_store_api():
+    store = MemoryStore()
+
+    assert store.add("a", 1) is True
+    assert store.add("a", 2) is False
+    assert store.incr("a") == 2
+    with pytest.raises(ValueError):
+        store.incr("missing")
+    assert store.get("missing", "default") == "default"
+
+    store.set("short", 1, timeout=0.01)
+    time.sleep(0.02)
+    assert store.get("short") is None
+    assert store.delete("a") is True
+
+
+def test_publish_switches_versions_and_drops_the_old_value():
+    store = MemoryStore()
+    cache = VersionedCache(store, "stats")
+
+    first = cache.publish("QUINA", [1])
+    assert cache.get_or_build("QUINA", lambda: pytest.fail("should be cached")) == [1]
+
+    second = cache.publish("QUINA", [2])
+    assert second == first + 1
+    assert cache.get_or_build("QUINA", lambda: pytest.fail("should be cached")) == [2]
+    assert store.get(f"stats:QUINA:v{first}") is None
+
+
+def test_concurrent_misses_build_once():
+    cache = VersionedCache(MemoryStore(), "stats")
+    builds = []
+
+    def build():
+        builds.append(1)
+        time.sleep(0.05)
+        return "rows"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_build("QUINA", build)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert builds == [1]
+    assert results == ["rows"] * 8
+
+
+def test_waits_for_another_process_rebuilding():
+    store = MemoryStore()
+    cache = VersionedCache(store, "stats", poll_interval=0.01)
+    other = VersionedCache(store, "stats")
+
+    # Another process holds the rebuild lock for the current version
+    version = other.version("QUINA")
+    assert store.add(f"stats:QUINA:v{version}:lock", 1, 30)
+    threading.Timer(0.05, lambda: store.set(f"stats:QUINA:v{version}", "theirs")).start()
+
+    assert cache.get_or_build("QUINA", lambda: "ours") == "theirs"
+
+
+def test_async_concurrent_misses_build_once():
+    cache = AsyncVersionedCache(MemoryStore(), "stats")
+    builds = []
+
+    async def build():
+        builds.append(1)
+        await asyncio.sleep(0.01)
+        return "rows"
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_build("QUINA", build) for _ in range(10)))
+
+    assert asyncio.run(run()) == ["rows"] * 10
+    assert builds == [1]
+
+
+def test_pack_rows_round_trip():
+    rows = [
+        {"number": n, "frequency": n * 2, "average_delay": n / 3, "last_draw_contest": None,
+         "last_updated": datetime(2024, 1, n, tzinfo=timezone.utc)}
+        for n in range(1, 26)
+    ]
+
+    payload = pack_rows(rows)
+
+    assert unpack_rows(payload) == rows
+    assert len(payload) < 600
+    assert unpack_rows(pack_rows([])) == []
+
+
+def test_async_redis_store_against_local_server(redis_server):
+    from redis.asyncio import Redis
+
+    async def run():
+        store = AsyncRedisStore(Redis.from_url(redis_server.url), prefix="test")
+        try:
+            assert await store.add("counter", 5) is True
+            assert await store.add("counter", 7) is False
+            assert await store.incr("counter") == 6
+            with pytest.raises(ValueError):
+                await store.incr("missing")
+
+            await store.set("payload", b"\x00packed", timeout=0.05)
+            assert await store.get("payload") == b"\x00packed"
+            await asyncio.sleep(0.1)
+            assert await store.get("payload", "gone") == "gone"
+
+            # Another worker, with its own connection, sees the published version
+            other = AsyncRedisStore(Redis.from_url(redis_server.url), prefix="test")
+            await AsyncVersionedCache(store, "stats").publish("QUINA", b"v1")
+            await AsyncVersionedCache(store, "stats").publish("QUINA", b"v2")
+            assert await AsyncVersionedCache(other, "stats").get_or_build("QUINA", pytest.fail) == b"v2"
+            await other.close()
+        finally:
+            await store.close()
+
+    asyncio.run(run())
@@ -0,0 +1,143 @@
+"""
+Tests for the result checker endpoints
+"""
+import json
+
+
+def test_check_batch_json(client):
+    response = client.post("/api/checker/check-batch", json={
+        "lottery_type": "LOTOFACIL",
+        "contest_number": 2,
+        "combinations": [list(range(11, 26)), list(range(1, 16)), list(range(1, 11)) + [11, 12, 13, 14, 15]],
+    })
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["found"] is True
+    assert data["contest_number"] == 2
+    assert data["hits"] == [15, 5, 5]
+    assert data["hit_histogram"]["15"] == 1
+    assert data["prize_tiers"]["15 acertos"] == 1
+    assert data["winners"] == 1
+
+
+def test_check_batch_ndjson(client):
+    lines = [json.dumps(list(range(1, 16))), json.dumps({"numbers": list(range(11, 26))})]
+    response = client.post(
+        "/api/checker/check-batch?lottery_type=LOTOFACIL",
+        content="\n".join(lines) + "\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["contest_number"] == 4
+    assert data["hits"] == [10, 5]
+    assert data["winners"] == 0
+
+
+def test_check_batch_unknown_contest(client):
+    response = client.post("/api/checker/check-batch", json={
+        "lottery_type": "LOTOFACIL",
+        "contest_number": 3,
+        "combinations": [list(range(1, 16))],
+    })
+
+    assert response.status_code == 200
+    assert response.json()["found"] is False
+
+
+def test_check_batch_rejects_invalid_tickets(client):
+    for ticket in ([0] + list(range(1, 15)), [1] + list(range(1, 15)), list(range(1, 10)), list(range(20, 35))):
+        response = client.post("/api/checker/check-batch", json={
+            "lottery_type": "LOTOFACIL",
+            "contest_number": 2,
+            "combinations": [ticket],
+        })
+        assert response.status_code == 400, ticket
+
+    response = client.post(
+        "/api/checker/check-batch?lottery_type=LOTOFACIL",
+        content=json.dumps([True] + list(range(2, 16))) + "\n",
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 400
+
+
+def test_check_history(client):
+    response = client.post("/api/checker/check-history", json={
+        "lottery_type": "LOTOFACIL",
+        "combinations": [list(range(1, 16))],
+    })
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_draws"] == 3
+    result = data["results"][0]
+    assert result["hit_histogram"]["15"] == 1
+    assert result["hit_histogram"]["10"] == 1
+    assert result["hit_histogram"]["5"] == 1
+    assert result["best_hits"] == 15
+    assert result["best_contests"] == [1]
+    assert result["prize_contests"] == [
+        {"contest_number": 1, "draw_date": "2024-01-02", "hits": 15, "tier": "15 acertos"}
+    ]
+
+
+def test_check_history_unknown_lottery(client):
+    response = client.post("/api/checker/check-history", json={
+        "lottery_type": "NOPE",
+        "combinations": [[1, 2, 3]],
+    })
+
+    assert response.status_code == 404
+
+
+def test_check_history_rejects_invalid_tickets(client):
+    response = client.post("/api/checker/check-history", json={
+        "lottery_type": "LOTOFACIL",
+        "combinations": [list(range(20, 35))],
+    })
+
+    assert response.status_code == 400
+
+
+def test_check_multi_number_bet(client):
+    response = client.post("/api/checker/check", json={
+        "lottery_type": "LOTOFACIL",
+        "contest_number": 2,
+        "numbers": list(range(7, 26)),
+    })
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["match_count"] == 15
+    assert data["is_winner"] is True
+    assert data["sub_game_tiers"]["15 acertos"] == 1
+    assert data["sub_game_tiers"]["14 acertos"] == 60
+
+
+def test_check_batch_and_history_score_multi_number_bets(client):
+    numbers = list(range(7, 26))
+    response = client.post("/api/checker/check-batch", json={
+        "lottery_type": "LOTOFACIL",
+        "contest_number": 2,
+        "combinations": [numbers],
+    })
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["hits"] == [15]
+    assert data["prize_tiers"]["15 acertos"] == 1
+    assert data["prize_tiers"]["14 acertos"] == 60
+    assert data["winners"] == 1
+
+    response = client.post("/api/checker/check-history", json={
+        "lottery_type": "LOTOFACIL",
+        "combinations": [numbers],
+    })
+
+    assert response.status_code == 200
+    result = response.json()["results"][0]
+    assert result["prize_tiers"]["14 acertos"] >= 60
+    assert {"contest_number": 2, "draw_date": "2024-01-03", "hits": 15, "tier": "15 acertos"} in result["prize_contests"]
@@ -0,0 +1,59 @@
+"""
+Tests for the colex rank/unrank codec
+"""
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from lottery_engine import rank_combination, rank_combinations, unrank_combination, unrank_combinations
+
+
+def test_ranks_enumerate_colex_order():
+    games = sorted(combinations(range(1, 9), 3), key=lambda game: game[::-1])
+
+    assert [rank_combination(game) for game in games] == list(range(comb(8, 3)))
+    assert [unrank_combination(rank, 3) for rank in range(comb(8, 3))] == [list(g) for g in games]
+
+
+def test_batch_round_trip():
+    rng = np.random.default_rng(3)
+    games = np.sort(np.array([rng.choice(80, 20, replace=False) + 1 for _ in range(500)]), axis=1)
+
+    ranks = rank_combinations(games)
+
+    assert ranks.tolist() == [rank_combination(game) for game in games.tolist()]
+    assert (unrank_combinations(ranks, 20) == games).all()
+
+
+def test_rank_ignores_number_order():
+    assert rank_combination([15, 1, 7]) == rank_combination([1, 7, 15])
+    assert rank_combinations(np.array([[25, 1, 2]]))[0] == rank_combination([1, 2, 25])
+
+
+def test_generator_rank_encoding(client):
+    response = client.post("/api/generator/generate?encoding=rank", json={
+        "lottery_type": "LOTOFACIL",
+        "numbers_count": 15,
+        "games_count": 3,
+    })
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["metadata"]["encoding"] == "rank"
+    assert all(isinstance(rank, int) and 0 <= rank < comb(25, 15) for rank in data["combinations"])
+
+
+def test_combination_rank_encoding(client):
+    created = client.post("/api/combinations/", json={
+        "lottery_type": "LOTOFACIL",
+        "numbers": list(range(11, 26)),
+    }).json()
+
+    response = client.get(f"/api/combinations/{created['id']}?encoding=rank")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["rank"] == comb(25, 15) - 1
+    assert data["numbers_count"] == 15
+    assert "numbers" not in data
@@ -0,0 +1,130 @@
+"""
+Tests for the DP counting sampler
+"""
+from itertools import combinations
+
+import numpy as np
+
+from lottery_engine import ConstrainedSampler, CountingFilters, constrained_sampler
+from lottery_engine import counting
+
+FILTERS = CountingFilters(
+    min_sum=30, max_sum=70, min_odd=1, max_odd=4, max_run=2, fixed_numbers=(3,), excluded_numbers=(7, 8)
+)
+
+
+def _max_run(game):
+    best = run = 1
+    for previous, number in zip(game, game[1:]):
+        run = run + 1 if number == previous + 1 else 1
+        best = max(best, run)
+    return best
+
+
+def _passes(game, filters):
+    odd = sum(number % 2 for number in game)
+    return (
+        filters.min_sum <= sum(game) <= filters.max_sum
+        and filters.min_odd <= odd <= filters.max_odd
+        and _max_run(game) <= filters.max_run
+        and set(filters.fixed_numbers) <= set(game)
+        and not set(filters.excluded_numbers) & set(game)
+    )
+
+
+def test_count_matches_enumeration():
+    expected = [game for game in combinations(range(1, 21), 6) if _passes(game, FILTERS)]
+
+    sampler = ConstrainedSampler(20, 6, FILTERS)
+
+    assert sampler.count == len(expected)
+    # Every position maps to a distinct valid game
+    games = sampler.games_at(np.arange(sampler.count))
+    assert sorted(map(tuple, games.tolist())) == expected
+
+
+def test_unfiltered_count_is_binomial():
+    assert ConstrainedSampler(60, 6, CountingFilters()).count == 50_063_860
+
+
+def test_samples_are_valid_and_distinct():
+    sampler = ConstrainedSampler(60, 6, CountingFilters(min_sum=150, max_sum=220, min_odd=2, max_odd=4, max_run=2))
+
+    games = sampler.sample(500, np.random.default_rng(0))
+
+    assert len({tuple(game) for game in games.tolist()}) == 500
+    for game in games.tolist():
+        assert 150 <= sum(game) <= 220
+        assert _max_run(game) <= 2
+
+
+def test_samples_are_uniform():
+    sampler = ConstrainedSampler(12, 3, CountingFilters(min_sum=15, max_sum=20))
+
+    games = sampler.sample(60_000, np.random.default_rng(1), replace=True)
+
+    _, counts = np.unique(games, axis=0, return_counts=True)
+    assert len(counts) == sampler.count
+    expected = 60_000 / sampler.count
+    assert np.abs(counts - expected).max() < 6 * np.sqrt(expected)
+
+
+def test_count_endpoint(client):
+    payload = {
+        "lottery_type": "LOTOFACIL",
+        "numbers_count": 15,
+        "filters": {"min_sum": 180, "max_sum": 210, "min_odd": 7, "max_odd": 9},
+    }
+
+    response = client.post("/api/generator/count", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert 0 < data["matching_combinations"] < data["total_combinations"] == 3_268_760
+
+
+def test_constrained_mode(client):
+    payload = {
+        "lottery_type": "LOTOFACIL",
+        "numbers_count": 16,
+        "games_count": 20,
+        "fixed_numbers": [1],
+        "mode": "constrained",
+        "filters": {"max_run": 4, "excluded_numbers": [25]},
+    }
+
+    response = client.post("/api/generator/generate", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["metadata"]["matching_combinations"] > 0
+    for game in data["combinations"]:
+        assert len(game) == 16 and 1 in game and 25 not in game
+        assert _max_run(game) <= 4
+
+
+def test_constrained_mode_rejects_unsupported_filters(client):
+    payload = {
+        "lottery_type": "LOTOFACIL",
+        "numbers_count": 15,
+        "games_count": 1,
+        "mode": "constrained",
+        "filters": {"min_per_row": 2},
+    }
+
+    response = client.post("/api/generator/generate", json=payload)
+
+    assert response.status_code == 400
+
+
+def test_sampler_cache_is_bounded_by_table_bytes(monkeypatch):
+    monkeypatch.setattr(counting, "_cache", counting.OrderedDict())
+    first = constrained_sampler(25, 15, CountingFilters(max_sum=200))
+    monkeypatch.setattr(counting, "CACHE_MAX_BYTES", first.nbytes)
+
+    assert constrained_sampler(25, 15, CountingFilters(max_sum=200)) is first
+    second = constrained_sampler(25, 15, CountingFilters(max_sum=190))
+
+    # Both do not fit: the least recently used sampler is dropped
+    assert list(counting._cache.values()) == [second]
+    assert constrained_sampler(25, 15, CountingFilters(max_sum=200)) is not first
@@ -0,0 +1,95 @@
+"""
+Tests for chunked CSV / NDJSON / Parquet / Arrow exports
+"""
+import csv
+import io
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from lottery_engine import DRAW_EXPORT_COLUMNS, STATISTICS_EXPORT_COLUMNS, ExportWriter, export_chunks
+
+ROWS = [
+    ("LOTOFACIL", contest, date(2024, 1, contest), list(range(contest, contest + 15)), None,
+     Decimal("1500000.50") if contest % 2 else None, contest % 3, contest % 2 == 0, None)
+    for contest in range(1, 8)
+]
+
+
+def export(rows, fmt, columns=DRAW_EXPORT_COLUMNS, chunk_rows=3):
+    return b"".join(export_chunks(rows, columns, fmt, chunk_rows=chunk_rows))
+
+
+def test_csv_and_ndjson_encoding():
+    table = list(csv.DictReader(io.StringIO(export(ROWS, "csv").decode())))
+    assert len(table) == 7
+    assert table[0]["draw_date"] == "2024-01-01"
+    assert table[0]["numbers"] == " ".join(map(str, range(1, 16)))
+    assert table[0]["prize_amount"] == "1500000.50" and table[1]["prize_amount"] == ""
+
+    lines = export(ROWS, "ndjson").decode().splitlines()
+    assert len(lines) == 7
+    assert json.loads(lines[1])["numbers"] == list(range(2, 17))
+    assert json.loads(lines[1])["accumulated"] is True
+
+
+def test_empty_exports_keep_headers():
+    assert export([], "csv").decode().startswith("lottery_type,contest_number")
+    assert export([], "ndjson") == b""
+
+
+def test_parquet_writes_one_row_group_per_chunk():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    data = export(ROWS, "parquet")
+    parquet = pq.ParquetFile(io.BytesIO(data))
+    assert parquet.num_row_groups == 3
+    table = parquet.read()
+    assert table.column("contest_number").to_pylist() == list(range(1, 8))
+    assert table.column("numbers").to_pylist()[0] == list(range(1, 16))
+    assert table.column("prize_amount").to_pylist()[0] == Decimal("1500000.50")
+
+    # A schema fixed up front: an all-null chunk keeps the column types
+    stats = [("LOTOFACIL", 1, 2, None, 0, 1, 1.5, datetime(2024, 1, 1, tzinfo=timezone.utc))]
+    table = pq.read_table(io.BytesIO(export(stats, "parquet", STATISTICS_EXPORT_COLUMNS)))
+    assert str(table.schema.field("last_draw_contest").type) == "int64"
+
+
+def test_arrow_stream():
+    pa = pytest.importorskip("pyarrow")
+
+    table = pa.ipc.open_stream(export(ROWS, "arrow")).read_all()
+    assert table.num_rows == 7
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        ExportWriter(DRAW_EXPORT_COLUMNS, "xlsx")
+
+
+def test_export_endpoints(client):
+    response = client.get("/api/lotteries/LOTOFACIL/export/draws", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="lotofacil_draws.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["contest_number"]) for row in rows] == [1, 2, 4]
+
+    assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+    response = client.get("/api/lotteries/LOTOFACIL/export/statistics", params={"format": "ndjson"})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["number"] for line in lines] == list(range(1, 26))
+
+    assert client.get("/api/lotteries/QUINA/export/draws").status_code == 404
+    assert client.get("/api/lotteries/LOTOFACIL/export/draws", params={"format": "xlsx"}).status_code == 422
+
+
+def test_parquet_export_endpoint(client):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    response = client.get("/api/lotteries/LOTOFACIL/export/draws", params={"format": "parquet"})
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.column("contest_number").to_pylist() == [1, 2, 4]
@@ -0,0 +1,132 @@
+"""
+Tests for bulk game generation
+"""
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from lottery_engine import iter_unique_games, rank_combinations
+
+
+def test_iter_unique_games_is_exhaustive_and_distinct():
+    games = np.concatenate(list(iter_unique_games(range(1, 9), 3, 56, batch_size=10)))
+
+    assert games.shape == (56, 3)
+    assert len(np.unique(rank_combinations(games))) == 56
+
+
+def test_iter_unique_games_honours_fixed_numbers():
+    rng = np.random.default_rng(5)
+    games = np.concatenate(list(iter_unique_games(range(1, 26), 15, 20_000, [3, 7], rng)))
+
+    assert len(np.unique(rank_combinations(games))) == 20_000
+    assert (games == 3).any(axis=1).all() and (games == 7).any(axis=1).all()
+    assert (np.diff(games, axis=1) > 0).all()
+
+
+def test_iter_unique_games_samples_ranks_near_capacity():
+    rng = np.random.default_rng(3)
+    games = np.concatenate(list(iter_unique_games(range(1, 21), 15, 11_628, [2], rng, batch_size=1000)))
+
+    # The whole space: every game once, in random order
+    assert len(games) == 11_628
+    ranks = rank_combinations(games)
+    assert len(np.unique(ranks)) == len(games)
+    assert (games == 2).any(axis=1).all()
+    assert not (np.diff(ranks) > 0).all()
+
+
+def test_iter_unique_games_rejects_impossible_requests():
+    with pytest.raises(ValueError):
+        iter_unique_games(range(1, 9), 3, 57)
+
+
+def test_bulk_ndjson_is_reproducible(client):
+    payload = {"lottery_type": "LOTOFACIL", "numbers_count": 15, "games_count": 500,
+               "fixed_numbers": [1], "seed": 11}
+
+    response = client.post("/api/generator/bulk", json=payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    games = [json.loads(line) for line in response.text.splitlines()]
+    assert len(games) == 500 and len({tuple(g) for g in games}) == 500
+    assert all(len(g) == 15 and 1 in g for g in games)
+    assert client.post("/api/generator/bulk", json=payload).text == response.text
+
+
+def test_bulk_csv(client):
+    response = client.post("/api/generator/bulk?format=csv", json={
+        "lottery_type": "LOTOFACIL", "numbers_count": 16, "games_count": 10,
+    })
+
+    lines = response.text.splitlines()
+    assert lines[0] == ",".join(f"n{i}" for i in range(1, 17))
+    assert len(lines) == 11
+
+
+def test_bulk_rejects_invalid_fixed_numbers(client):
+    response = client.post("/api/generator/bulk", json={
+        "lottery_type": "LOTOFACIL", "numbers_count": 15, "games_count": 10, "fixed_numbers": [26],
+    })
+
+    assert response.status_code == 400
+
+
+def test_bulk_whole_space(client):
+    fixed = list(range(1, 13))
+    response = client.post("/api/generator/bulk", json={
+        "lottery_type": "LOTOFACIL", "numbers_count": 15, "games_count": 286, "fixed_numbers": fixed,
+    })
+
+    games = {tuple(json.loads(line)) for line in response.text.splitlines()}
+    assert len(games) == 286
+    assert all(set(fixed) <= set(game) for game in games)
+
+
+def test_alias_table_matches_weights():
+    from lottery_engine import AliasTable
+
+    weights = np.arange(1, 11, dtype=float)
+    draws = AliasTable.build(weights).draw(np.random.default_rng(2), 200_000)
+
+    observed = np.bincount(draws, minlength=10) / len(draws)
+    assert np.abs(observed - weights / weights.sum()).max() < 0.005
+
+
+def test_alias_table_is_cached_per_snapshot(async_session):
+    from app.services.history import get_draw_history
+
+    async def load():
+        async with async_session() as session:
+            return await get_draw_history(session, "LOTOFACIL")
+
+    history = asyncio.run(load())
+
+    assert history.alias_table("delay") is history.alias_table("delay")
+
+
+def test_weighted_mode(client):
+    response = client.post("/api/generator/generate", json={
+        "lottery_type": "LOTOFACIL",
+        "numbers_count": 15,
+        "games_count": 20,
+        "fixed_numbers": [4],
+        "mode": "weighted",
+        "weighting": "frequency",
+    })
+
+    assert response.status_code == 200
+    games = response.json()["combinations"]
+    assert len(games) == 20
+    assert all(len(set(g)) == 15 and 4 in g and g == sorted(g) for g in games)
+
+
+def test_bulk_without_fixed_numbers(client):
+    response = client.post("/api/generator/bulk", json={
+        "lottery_type": "LOTOFACIL", "numbers_count": 15, "games_count": 5,
+    })
+
+    assert len(response.text.splitlines()) == 5
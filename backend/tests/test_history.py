@@ -0,0 +1,88 @@
+"""
+Tests for draw history snapshots and their registry
+"""
+import asyncio
+from datetime import date
+
+import pytest
+
+from lottery_engine import AsyncHistoryRegistry, DrawHistory, HistoryRegistry
+
+CONFIG = {
+    "lottery_type": "QUINA",
+    "total_numbers": 80,
+    "numbers_to_pick": 5,
+    "min_bet_numbers": 5,
+    "max_bet_numbers": 15,
+}
+ROWS = [
+    (10, date(2024, 1, 1), [5, 1, 80, 40, 65]),
+    (11, date(2024, 1, 2), [2, 3, 4, 5, 6]),
+    (13, date(2024, 1, 4), [1, 2, 70, 71, 72]),
+]
+
+
+def test_snapshot_lookups():
+    history = DrawHistory.from_rows(CONFIG, "v1", ROWS)
+
+    assert len(history) == 3
+    assert history.latest_contest == 13
+    assert history.index_of() == 2
+    assert history.index_of(11) == 1
+    assert history.index_of(12) is None
+    assert history.draw_date(0) == date(2024, 1, 1)
+    assert history.drawn_numbers(0) == [1, 5, 40, 65, 80]
+    assert history.mask(0) == sum(1 << (n - 1) for n in [1, 5, 40, 65, 80])
+    assert history.ranked_numbers("frequency", 2) == [1, 2]
+
+
+def test_snapshot_is_read_only():
+    history = DrawHistory.from_rows(CONFIG, "v1", ROWS)
+
+    with pytest.raises(ValueError):
+        history.matrix[0, 0] = False
+
+
+def test_registry_reloads_only_when_version_changes():
+    versions = {"QUINA": 1}
+    loads = []
+
+    def load(key, version):
+        loads.append(version)
+        return DrawHistory.from_rows(CONFIG, version, ROWS)
+
+    registry = HistoryRegistry(load=load, version=lambda key: versions[key], revalidate_after=0)
+
+    first = registry.get("QUINA")
+    assert registry.get("QUINA") is first
+    assert loads == [1]
+
+    versions["QUINA"] = 2
+    assert registry.get("QUINA").version == 2
+    assert loads == [1, 2]
+
+    registry.invalidate("QUINA")
+    registry.get("QUINA")
+    assert loads == [1, 2, 2]
+
+
+def test_async_registry_loads_once_for_concurrent_callers():
+    loads = []
+
+    async def version(key):
+        await asyncio.sleep(0)
+        return 1
+
+    async def load(key, version):
+        loads.append(version)
+        await asyncio.sleep(0.01)
+        return DrawHistory.from_rows(CONFIG, version, ROWS)
+
+    registry = AsyncHistoryRegistry(load=load, version=version)
+
+    async def run():
+        return await asyncio.gather(*(registry.get("QUINA") for _ in range(10)))
+
+    snapshots = asyncio.run(run())
+    assert loads == [1]
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
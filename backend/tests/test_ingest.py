@@ -0,0 +1,176 @@
+"""
+Tests for bulk ingestion of official result files
+"""
+import io
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.models import Draw, NumberStatistics
+from lottery_engine import DrawColumns, IngestReport, iter_draw_batches
+from lottery_engine.ingest import parse_money, read_csv_rows
+
+HEADER = (
+    "Concurso;Data Sorteio;"
+    + ";".join(f"Bola{i}" for i in range(1, 16))
+    + ";Ganhadores 15 acertos;Rateio 15 acertos;Acumulado 15 acertos\n"
+)
+
+
+ADMIN = {"X-API-Key": "test-admin-key"}
+
+
+@pytest.fixture
+def admin_key(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", ADMIN["X-API-Key"])
+
+
+def result_file(rows):
+    lines = [HEADER]
+    for contest, numbers, *extra in rows:
+        winners, prize, accumulated = extra or ("0", "R$0,00", "SIM")
+        draw_date = f"{contest % 28 + 1:02d}/02/2024"
+        lines.append(";".join([str(contest), draw_date, *map(str, numbers), winners, prize, accumulated]) + "\n")
+    return "".join(lines).encode("utf-8-sig")
+
+
+def test_header_columns_ignore_case_and_accents():
+    columns = DrawColumns.from_header(
+        ["CONCURSO", "Data do Sorteio", "Bola 2", "Bola 1", "Rateio 6 acertos", "Estimativa Prêmio"]
+    )
+    assert columns.contest == 0 and columns.draw_date == 1
+    assert columns.numbers == (3, 2)
+    assert columns.prize == 4 and columns.next_prize == 5
+
+    with pytest.raises(ValueError):
+        DrawColumns.from_header(["Concurso", "Data"])
+
+
+def test_parse_money_formats():
+    assert parse_money("R$ 1.234.567,89") == Decimal("1234567.89")
+    assert parse_money(1500.5) == Decimal("1500.50")
+    assert parse_money("-") is None
+
+
+def test_batches_validate_rows_and_report_errors():
+    good = list(range(1, 16))
+    stream = io.BytesIO(result_file([
+        (10, good, "2", "R$ 1.500,00", "NÃO"),
+        (11, good[:-1] + [26]),   # out of range
+        (12, good[:-1] + [1]),    # repeated number
+        (13, good[:-1]),          # too few numbers
+        (14, good),
+        (10, list(range(11, 26))),  # later row for the same contest wins
+    ]) + b";;\n")
+
+    report = IngestReport()
+    batches = list(iter_draw_batches(read_csv_rows(stream), 25, 15, report, batch_rows=2))
+    draws = [draw for batch in batches for draw in batch]
+
+    assert report.rows == 6 and report.error_count == 3
+    assert [line for line, _ in report.errors] == [3, 4, 5]
+    assert [draw["contest_number"] for draw in draws] == [10, 14, 10]
+    first = draws[0]
+    assert first["draw_date"] == date(2024, 2, 11)
+    assert first["winners_count"] == 2 and first["prize_amount"] == Decimal("1500.00")
+    assert first["accumulated"] is False
+    assert draws[-1]["numbers"] == list(range(11, 26))
+
+
+def test_import_endpoint_upserts_and_refreshes_statistics(client, db, admin_key):
+    assert client.post("/api/statistics/LOTOFACIL/calculate").status_code == 200
+
+    rows = [(contest, list(range(1, 16)) if contest % 2 else list(range(11, 26))) for contest in range(5, 2005)]
+    response = client.post(
+        "/api/lotteries/LOTOFACIL/draws/import",
+        headers=ADMIN,
+        files={"file": ("lotofacil.csv", result_file(rows), "text/csv")},
+    )
+    assert response.status_code == 200
+    assert response.json()["loaded"] == 2000 and response.json()["error_count"] == 0
+
+    db.expire_all()
+    assert db.query(Draw).filter_by(lottery_type="LOTOFACIL").count() == 2003
+    stats = {s.number: s for s in db.query(NumberStatistics).filter_by(lottery_type="LOTOFACIL")}
+    assert stats[1].last_draw_contest == 2003 and stats[25].last_draw_contest == 2004
+    assert stats[11].frequency == 2002
+
+    # A correction of an already counted contest updates it and rebuilds the statistics
+    response = client.post(
+        "/api/lotteries/LOTOFACIL/draws/import",
+        headers=ADMIN,
+        files={"file": ("fix.csv", result_file([(2, list(range(1, 16)))]), "text/csv")},
+    )
+    assert response.status_code == 200
+    db.expire_all()
+    assert db.query(Draw).filter_by(lottery_type="LOTOFACIL", contest_number=2).one().numbers == list(range(1, 16))
+    assert db.query(NumberStatistics).filter_by(lottery_type="LOTOFACIL", number=25).one().frequency == 1001
+
+
+def test_import_endpoint_rejects_invalid_files(client, db, admin_key):
+    bad = result_file([(5, list(range(1, 16))), (6, list(range(1, 15)))])
+
+    response = client.post(
+        "/api/lotteries/LOTOFACIL/draws/import", headers=ADMIN, files={"file": ("bad.csv", bad, "text/csv")}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"]["errors"][0]["line"] == 3
+    assert db.query(Draw).filter_by(lottery_type="LOTOFACIL").count() == 3
+
+    response = client.post(
+        "/api/lotteries/LOTOFACIL/draws/import",
+        headers=ADMIN,
+        params={"strict": "false"},
+        files={"file": ("bad.csv", bad, "text/csv")},
+    )
+    assert response.status_code == 200
+    assert response.json()["loaded"] == 1 and response.json()["error_count"] == 1
+
+    response = client.post(
+        "/api/lotteries/QUINA/draws/import", headers=ADMIN, files={"file": ("q.csv", bad, "text/csv")}
+    )
+    assert response.status_code == 404
+    response = client.post(
+        "/api/lotteries/LOTOFACIL/draws/import",
+        headers=ADMIN,
+        files={"file": ("empty.csv", b"Concurso;Data\n", "text/csv")},
+    )
+    assert response.status_code == 400
+    assert "Concurso" in response.json()["detail"]["message"]
+
+
+def test_import_endpoint_requires_the_admin_key(client, db, monkeypatch):
+    from app.core.config import settings
+
+    upload = {"file": ("lotofacil.csv", result_file([(5, list(range(1, 16)))]), "text/csv")}
+    # Disabled until a key is configured
+    assert client.post("/api/lotteries/LOTOFACIL/draws/import", headers=ADMIN, files=upload).status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", ADMIN["X-API-Key"])
+    assert client.post("/api/lotteries/LOTOFACIL/draws/import", files=upload).status_code == 401
+    assert client.post(
+        "/api/lotteries/LOTOFACIL/draws/import", headers={"X-API-Key": "wrong"}, files=upload
+    ).status_code == 401
+    assert db.query(Draw).filter_by(lottery_type="LOTOFACIL").count() == 3
+
+
+def test_import_without_on_conflict(client, db, admin_key, monkeypatch):
+    from app.db import upsert
+
+    monkeypatch.setattr(upsert, "UPSERT_DIALECTS", {})
+    rows = [(2, list(range(1, 16))), (5, list(range(11, 26)))]
+    response = client.post(
+        "/api/lotteries/LOTOFACIL/draws/import",
+        headers=ADMIN,
+        files={"file": ("lotofacil.csv", result_file(rows), "text/csv")},
+    )
+
+    assert response.status_code == 200
+    db.expire_all()
+    draws = {d.contest_number: d for d in db.query(Draw).filter_by(lottery_type="LOTOFACIL")}
+    assert sorted(draws) == [1, 2, 4, 5]
+    assert draws[2].numbers == list(range(1, 16)) and draws[2].updated_at is not None
+    assert draws[5].numbers_mask_low != 0
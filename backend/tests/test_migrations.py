@@ -0,0 +1,87 @@
+"""
+Tests for the Alembic upgrades of databases created before the new columns
+"""
+from pathlib import Path
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+
+from app.core.config import settings
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[1] / "alembic"
+
+
+def upgrade(monkeypatch, url, revision="head"):
+    # No ini file: keep the test run's logging configuration
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+    command.upgrade(config, revision)
+
+
+def test_gap_counters_are_added_and_recovered(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'old.db'}"
+    engine = sa.create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(sa.text(
+            "CREATE TABLE number_statistics (id INTEGER PRIMARY KEY, lottery_type VARCHAR(20), "
+            "number INTEGER, frequency INTEGER, last_draw_contest INTEGER, delay INTEGER, "
+            "max_delay INTEGER, average_delay FLOAT, last_updated DATETIME)"
+        ))
+        connection.execute(sa.text(
+            "INSERT INTO number_statistics (lottery_type, number, frequency, average_delay) "
+            "VALUES ('LOTOFACIL', 1, 5, 2.5), ('LOTOFACIL', 2, 1, 0), ('LOTOFACIL', 3, 0, 0)"
+        ))
+
+    upgrade(monkeypatch, url, "3f1c2a9d7b10")
+
+    with engine.connect() as connection:
+        rows = connection.execute(sa.text(
+            "SELECT number, gap_count, gap_sum FROM number_statistics ORDER BY number"
+        )).all()
+    assert [tuple(row) for row in rows] == [(1, 4, 10), (2, 0, 0), (3, 0, 0)]
+    engine.dispose()
+
+
+def test_upgrade_skips_tables_that_do_not_exist_yet(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'empty.db'}"
+
+    upgrade(monkeypatch, url)
+
+    engine = sa.create_engine(url)
+    assert not sa.inspect(engine).has_table("number_statistics")
+    engine.dispose()
+
+
+def test_number_masks_are_added_and_backfilled(tmp_path, monkeypatch):
+    from lottery_engine import encode_words
+
+    url = f"sqlite:///{tmp_path / 'old.db'}"
+    engine = sa.create_engine(url)
+    with engine.begin() as connection:
+        connection.execute(sa.text(
+            "CREATE TABLE draw (id INTEGER PRIMARY KEY, lottery_type VARCHAR(20), "
+            "contest_number INTEGER, draw_date DATE, numbers JSON)"
+        ))
+        connection.execute(sa.text(
+            "CREATE TABLE user_combination (id INTEGER PRIMARY KEY, lottery_type VARCHAR(20), numbers JSON)"
+        ))
+        connection.execute(sa.text(
+            "INSERT INTO draw (lottery_type, contest_number, draw_date, numbers) "
+            "VALUES ('QUINA', 1, '2024-01-01', '[1, 2, 64, 65, 80]')"
+        ))
+        connection.execute(sa.text(
+            "INSERT INTO user_combination (lottery_type, numbers) VALUES ('LOTOFACIL', '[3, 25]')"
+        ))
+
+    upgrade(monkeypatch, url)
+
+    with engine.connect() as connection:
+        draw = connection.execute(sa.text("SELECT numbers_mask_low, numbers_mask_high FROM draw")).one()
+        combination = connection.execute(sa.text(
+            "SELECT numbers_mask_low, numbers_mask_high FROM user_combination"
+        )).one()
+    assert tuple(draw) == encode_words([1, 2, 64, 65, 80])
+    assert tuple(combination) == encode_words([3, 25])
+    engine.dispose()
@@ -0,0 +1,57 @@
+"""
+Tests for exact prize odds and multi-number bet scoring
+"""
+from itertools import combinations
+from math import comb
+
+from lottery_engine import bet_odds, hit_counts, score_bet, sub_game_hits
+
+
+def test_hit_counts_cover_every_draw():
+    counts = hit_counts(25, 15, 18)
+
+    assert sum(counts) == comb(25, 15)
+    assert counts[15] == comb(18, 15)
+
+
+def test_sub_game_hits_match_expansion():
+    bet = list(range(1, 19))
+    drawn = set(range(5, 20))
+    expected = {}
+    for game in combinations(bet, 15):
+        hits = len(drawn.intersection(game))
+        expected[hits] = expected.get(hits, 0) + 1
+
+    assert sub_game_hits(18, len(drawn.intersection(bet)), 15) == expected
+
+
+def test_single_game_odds():
+    sena = bet_odds("MEGA_SENA", 60, 6, 6)["tiers"]["Sena"]
+
+    assert sena["one_in"] == 50_063_860
+    assert bet_odds("LOTOFACIL", 25, 15, 15)["tiers"]["15 acertos"]["one_in"] == 3_268_760
+
+
+def test_twenty_number_bet():
+    odds = bet_odds("LOTOFACIL", 25, 15, 20)
+
+    assert odds["sub_games"] == 15_504
+    assert odds["tiers"]["15 acertos"]["probability"] == comb(20, 15) / comb(25, 15)
+    assert score_bet("LOTOFACIL", 20, 15, 15) == {
+        "15 acertos": 1, "14 acertos": 75, "13 acertos": 1050, "12 acertos": 4550, "11 acertos": 6825,
+    }
+
+
+def test_odds_endpoint(client):
+    response = client.get("/api/checker/odds/LOTOFACIL?bet_size=16")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["sub_games"] == 16
+    assert data["tiers"]["15 acertos"]["one_in"] == comb(25, 15) / 16
+
+
+def test_odds_endpoint_rejects_bet_size(client):
+    response = client.get("/api/checker/odds/LOTOFACIL?bet_size=21")
+
+    assert response.status_code == 400
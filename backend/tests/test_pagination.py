@@ -0,0 +1,67 @@
+"""
+Tests for keyset pagination of draws
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from lottery_engine import LAST_PAGE, Cursor, decode_cursor, encode_cursor, keyset_page, scan_descending
+
+CONTESTS = list(range(1, 11))
+
+
+def fetch(cursor, limit):
+    """Emulate the indexed range scan for a cursor"""
+    if scan_descending(cursor):
+        rows = [c for c in reversed(CONTESTS) if cursor is None or c < cursor.contest]
+    else:
+        rows = [c for c in CONTESTS if c > cursor.contest]
+    return [SimpleNamespace(contest_number=c) for c in rows[:limit + 1]]
+
+
+def page_at(token, limit=4):
+    cursor = decode_cursor(token) if token else None
+    page = keyset_page(fetch(cursor, limit), limit, cursor)
+    return [row.contest_number for row in page.items], page
+
+
+def test_cursor_round_trip():
+    cursor = Cursor(3285, "prev")
+    token = encode_cursor(cursor)
+    assert decode_cursor(token) == cursor
+    assert token.isascii() and "=" not in token
+
+
+@pytest.mark.parametrize("token", ["", "!!", encode_cursor(Cursor(1)) + "x", "WzEsInNpZGV3YXlzIl0"])
+def test_invalid_cursors(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+
+def test_walks_forward_and_back():
+    contests, first = page_at(None)
+    assert contests == [10, 9, 8, 7] and not first.has_previous
+
+    contests, second = page_at(first.next_cursor)
+    assert contests == [6, 5, 4, 3]
+
+    contests, third = page_at(second.next_cursor)
+    assert contests == [2, 1] and not third.has_next
+
+    contests, back = page_at(third.prev_cursor)
+    assert contests == [6, 5, 4, 3] and back.next_cursor == second.next_cursor
+
+    contests, start = page_at(back.prev_cursor)
+    assert contests == [10, 9, 8, 7] and not start.has_previous
+
+
+def test_last_page_holds_the_oldest_draws():
+    contests, page = page_at(encode_cursor(LAST_PAGE))
+    assert contests == [4, 3, 2, 1]
+    assert not page.has_next
+    assert page_at(page.prev_cursor)[0] == [8, 7, 6, 5]
+
+
+def test_empty_page():
+    page = keyset_page([], 4)
+    assert page.items == [] and not page.has_next and not page.has_previous
@@ -0,0 +1,98 @@
+"""
+Tests for the Monte Carlo prize simulation
+"""
+import threading
+from concurrent.futures import CancelledError
+from math import comb
+
+import numpy as np
+import pytest
+
+from lottery_engine import popcount, random_draw_masks, simulate_draws, summarize_simulation
+
+TICKET = list(range(1, 16))
+
+
+def test_random_draws_pick_distinct_numbers_in_range():
+    masks = random_draw_masks(np.random.default_rng(0), 1000, 80, 5)
+
+    assert (popcount(masks) == 5).all()
+    assert (masks[:, 1] >> np.uint64(16) == 0).all()  # nothing above 80
+
+
+def test_hit_distribution_matches_hypergeometric_odds():
+    result = simulate_draws([TICKET], 25, 15, 200_000, seed=3, workers=1)
+
+    per_ticket = result['per_ticket'][0]
+    assert per_ticket.sum() == 200_000
+    for hits in (9, 11, 13):
+        exact = comb(15, hits) * comb(10, 15 - hits) / comb(25, 15)
+        assert abs(per_ticket[hits] / 200_000 - exact) < 0.005
+
+
+def test_seeded_runs_do_not_depend_on_workers(process_pool):
+    tickets = [TICKET, list(range(6, 21)), list(range(11, 26))]
+    options = dict(seed=8, chunk_draws=5_000)
+
+    inline = simulate_draws(tickets, 25, 15, 20_000, workers=1, **options)
+    pooled = simulate_draws(tickets, 25, 15, 20_000, workers=2, **options)
+
+    assert (inline['per_ticket'] == pooled['per_ticket']).all()
+    assert (inline['best'] == pooled['best']).all()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_cancelled_simulation_stops_between_chunks(process_pool, workers):
+    cancel = threading.Event()
+    cancel.set()
+
+    with pytest.raises(CancelledError):
+        simulate_draws([TICKET], 25, 15, 20_000, seed=8, workers=workers, chunk_draws=5_000, cancel=cancel)
+
+
+def test_expected_return():
+    result = simulate_draws([TICKET, TICKET], 25, 15, 10_000, seed=1, workers=1)
+
+    summary = summarize_simulation('LOTOFACIL', result, {'11 acertos': 6.0}, ticket_cost=6.0)
+
+    eleven = result['per_ticket'][:, 11].sum() / 10_000
+    assert summary['odds']['11 acertos']['winning_tickets_per_contest'] == eleven
+    # Identical tickets: the group wins exactly when one ticket does
+    assert summary['odds']['11 acertos']['contest_probability'] >= eleven / 2
+    assert summary['expected_return'] == eleven
+
+
+def test_simulation_endpoint(client):
+    payload = {
+        "lottery_type": "LOTOFACIL",
+        "combinations": [TICKET, list(range(5, 21))],
+        "draws": 5000,
+        "seed": 2,
+        "prize_values": {"11 acertos": 6, "12 acertos": 12},
+        "ticket_cost": 51,
+    }
+
+    response = client.post("/api/simulation/", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_tickets"] == 2
+    assert sum(data["hit_histogram"].values()) == 10_000
+    assert sum(data["best_histogram"].values()) == 5000
+    assert data["expected_return"] is not None
+
+
+def test_simulation_rejects_invalid_tickets(client):
+    payload = {"lottery_type": "LOTOFACIL", "combinations": [list(range(1, 11))], "draws": 10}
+
+    response = client.post("/api/simulation/", json=payload)
+
+    assert response.status_code == 400
+
+
+def test_simulation_draws_are_capped(client):
+    payload = {"lottery_type": "LOTOFACIL", "combinations": [TICKET], "draws": 10**9}
+
+    response = client.post("/api/simulation/", json=payload)
+
+    assert response.status_code == 413
@@ -0,0 +1,97 @@
+"""
+Tests for the precomputed Lotofácil combination space
+"""
+from math import comb
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from lottery_engine import CombinationSpace, SpaceFilters, build_space
+
+
+@pytest.fixture(scope="session")
+def space_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("space")
+    build_space(directory)
+    return directory
+
+
+@pytest.fixture
+def space(space_dir):
+    return CombinationSpace.open(space_dir)
+
+
+def test_enumerates_every_combination(space):
+    assert len(space) == comb(25, 15)
+    assert (np.diff(space.masks.astype(np.int64)) > 0).all()
+    # First game in mask order is 1..15
+    assert space.features["sum"][0] == 120
+    assert space.features["max_run"][0] == 15
+    assert space.features["rows"][0].tolist() == [5, 5, 5, 0, 0]
+
+
+def test_sample_honours_filters(space):
+    filters = SpaceFilters(min_sum=190, max_sum=200, min_odd=7, max_odd=8,
+                           max_run=4, fixed_numbers=(1, 25), excluded_numbers=(13,))
+    selected = space.select(filters)
+    games = space.sample(selected, 20, np.random.default_rng(1))
+
+    assert len(games) == 20
+    for game in games.tolist():
+        assert 190 <= sum(game) <= 200
+        assert sum(n % 2 for n in game) in (7, 8)
+        assert {1, 25} <= set(game) and 13 not in game
+    assert len({tuple(game) for game in games.tolist()}) == 20
+
+
+def test_sample_returns_fewer_games_when_filters_are_tight(space):
+    # Only 11..25 sums to 270
+    selected = space.select(SpaceFilters(min_sum=270))
+
+    assert space.sample(selected, 5).tolist() == [list(range(11, 26))]
+
+
+def test_generate_space_mode(client, space_dir, monkeypatch):
+    monkeypatch.setattr(settings, "COMBINATION_SPACE_DIR", str(space_dir))
+
+    response = client.post("/api/generator/generate", json={
+        "lottery_type": "LOTOFACIL",
+        "numbers_count": 15,
+        "games_count": 3,
+        "fixed_numbers": [5],
+        "mode": "space",
+        "filters": {"min_per_row": 3, "max_per_row": 3},
+    })
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["metadata"]["matching_combinations"] > 0
+    for game in data["combinations"]:
+        assert 5 in game
+        assert all(sum(1 for n in game if (n - 1) // 5 == row) == 3 for row in range(5))
+
+
+def test_generate_space_mode_requires_lotofacil_games(client):
+    response = client.post("/api/generator/generate", json={
+        "lottery_type": "LOTOFACIL",
+        "numbers_count": 16,
+        "games_count": 1,
+        "mode": "space",
+    })
+
+    assert response.status_code == 400
+
+
+def test_generate_space_mode_rejects_numbers_outside_the_card(client, space_dir, monkeypatch):
+    monkeypatch.setattr(settings, "COMBINATION_SPACE_DIR", str(space_dir))
+
+    for payload in ({"fixed_numbers": [26]}, {"fixed_numbers": [40]}, {"filters": {"excluded_numbers": [0, 33]}}):
+        response = client.post("/api/generator/generate", json={
+            "lottery_type": "LOTOFACIL",
+            "numbers_count": 15,
+            "games_count": 1,
+            "mode": "space",
+            **payload,
+        })
+        assert response.status_code == 400, payload
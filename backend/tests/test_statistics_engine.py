@@ -0,0 +1,72 @@
+"""
+Tests for the vectorized statistics engine
+"""
+import random
+
+from lottery_engine import apply_draw, build_incidence_matrix, compute_statistics, latest_contest
+
+
+def _reference_statistics(contests, draws, total_numbers):
+    """Per-number rescan, as the services used to do it"""
+    latest = contests[-1]
+    rows = []
+    for number in range(1, total_numbers + 1):
+        frequency, last_seen, delays = 0, None, []
+        for contest, numbers in zip(contests, draws):
+            if number in numbers:
+                frequency += 1
+                if last_seen is not None:
+                    delays.append(contest - last_seen)
+                last_seen = contest
+        rows.append({
+            "number": number,
+            "frequency": frequency,
+            "last_draw_contest": last_seen,
+            "delay": latest - last_seen if last_seen else 0,
+            "max_delay": max(delays) if delays else 0,
+            "average_delay": sum(delays) / len(delays) if delays else 0.0,
+            "gap_sum": sum(delays),
+            "gap_count": len(delays),
+        })
+    return rows
+
+
+def test_matches_reference_implementation():
+    rng = random.Random(42)
+    contests = sorted(rng.sample(range(1, 400), 200))
+    draws = [sorted(rng.sample(range(1, 61), 6)) for _ in contests]
+
+    matrix = build_incidence_matrix(draws, 60)
+    result = compute_statistics(contests, matrix)
+
+    assert result.latest_contest == contests[-1]
+    assert result.as_rows() == _reference_statistics(contests, draws, 60)
+
+
+def test_ignores_out_of_range_numbers():
+    matrix = build_incidence_matrix([[0, 1, 2], [2, 11]], 10)
+
+    assert matrix.shape == (2, 10)
+    assert matrix.sum() == 3
+    assert not matrix[:, 9].any()
+
+
+def test_empty_history():
+    result = compute_statistics([], build_incidence_matrix([], 25))
+
+    rows = result.as_rows()
+    assert len(rows) == 25
+    assert all(row["frequency"] == 0 and row["last_draw_contest"] is None for row in rows)
+
+
+def test_apply_draw_matches_full_rebuild():
+    rng = random.Random(7)
+    contests = list(range(1, 151))
+    draws = [sorted(rng.sample(range(1, 26), 15)) for _ in contests]
+
+    rows = compute_statistics(contests[:100], build_incidence_matrix(draws[:100], 25)).as_rows()
+    for contest, numbers in zip(contests[100:], draws[100:]):
+        assert latest_contest(rows) < contest
+        apply_draw(rows, contest, numbers)
+
+    assert rows == compute_statistics(contests, build_incidence_matrix(draws, 25)).as_rows()
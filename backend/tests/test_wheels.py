@@ -0,0 +1,96 @@
+"""
+Tests for the covering-design wheel solver
+"""
+import threading
+import time
+
+import pytest
+
+from lottery_engine import WheelCache, solve_wheel, verify_wheel
+from lottery_engine import wheels
+from lottery_engine.wheels import _greedy_lazy, _subset_masks
+
+
+def test_incremental_wheel_covers_every_target():
+    design = solve_wheel(18, 15, 15, 14)
+
+    assert design.complete
+    assert verify_wheel(design)
+    assert design.blocks.shape[1] == 15
+    assert len(design.blocks) < 816  # C(18, 15): far from the full wheel
+
+
+def test_lazy_greedy_covers_every_target():
+    blocks, targets = _subset_masks(10, 6), _subset_masks(10, 6)
+
+    chosen, uncovered = _greedy_lazy(10, 6, 6, 4, blocks, targets, time.monotonic() + 60)
+
+    assert len(uncovered) == 0
+    assert len(chosen) <= 5
+
+
+def test_time_budget_falls_back_to_valid_wheel():
+    design = solve_wheel(19, 15, 15, 14, time_budget=0)
+
+    assert not design.complete
+    assert verify_wheel(design)
+
+
+def test_wheel_cache_solves_designs_independently(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def fake_solve(v, k, m, t, time_budget):
+        calls.append((v, k, m, t))
+        if v == 21:
+            release.wait(5)
+        return (v, k, m, t)
+
+    monkeypatch.setattr(wheels, "solve_wheel", fake_solve)
+    cache = WheelCache()
+    slow = [threading.Thread(target=cache.get, args=(21, 15, 15, 12)) for _ in range(2)]
+    for thread in slow:
+        thread.start()
+
+    # A slow solve does not hold up other designs
+    assert cache.get(18, 15, 15, 14) == ((18, 15, 15, 14), False)
+    assert cache.get(18, 15, 15, 14) == ((18, 15, 15, 14), True)
+
+    release.set()
+    for thread in slow:
+        thread.join()
+    assert calls.count((21, 15, 15, 12)) == 1
+    assert cache.get(21, 15, 15, 12) == ((21, 15, 15, 12), True)
+
+
+def test_wheel_cache_releases_the_design_lock_when_the_solver_fails(monkeypatch):
+    def failing_solve(v, k, m, t, time_budget):
+        raise MemoryError
+
+    monkeypatch.setattr(wheels, "solve_wheel", failing_solve)
+    cache = WheelCache()
+    with pytest.raises(MemoryError):
+        cache.get(18, 15, 15, 14)
+
+    assert cache._solving == {}
+
+
+def test_wheel_endpoint(client):
+    numbers = list(range(1, 19))
+    payload = {"lottery_type": "LOTOFACIL", "numbers": numbers, "guarantee": 14}
+
+    response = client.post("/api/generator/wheel", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["metadata"]["if_drawn"] == 15
+    assert all(len(game) == 15 and set(game) <= set(numbers) for game in data["combinations"])
+    assert client.post("/api/generator/wheel", json=payload).json()["metadata"]["cached"]
+
+
+def test_wheel_endpoint_rejects_out_of_range_numbers(client):
+    response = client.post("/api/generator/wheel", json={
+        "lottery_type": "LOTOFACIL", "numbers": list(range(10, 28)), "guarantee": 14,
+    })
+
+    assert response.status_code == 400
@@ -0,0 +1,125 @@
+"""
+Tests for the CPU worker pool and its back-pressure
+"""
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.core.workers import WorkerPool, WorkerPoolBusy, WorkerTaskTimeout, cpu_pool
+
+
+def test_pool_runs_tasks_and_frees_slots():
+    pool = WorkerPool(size=2, queue_depth=1)
+
+    async def run():
+        return await asyncio.gather(*(pool.run(pow, n, 2) for n in range(3)))
+
+    assert asyncio.run(run()) == [0, 1, 4]
+    assert pool.in_flight == 0
+    pool.shutdown()
+
+
+def test_pool_rejects_when_saturated():
+    pool = WorkerPool(size=1, queue_depth=1)
+    release = threading.Event()
+
+    async def run():
+        tasks = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(WorkerPoolBusy):
+            await pool.run(pow, 2, 2)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(run()) == [True, True]
+    pool.shutdown()
+
+
+def test_pool_timeout_keeps_slot_until_task_stops():
+    pool = WorkerPool(size=1, queue_depth=0)
+
+    async def run():
+        with pytest.raises(WorkerTaskTimeout):
+            await pool.run(time.sleep, 0.3, timeout=0.05)
+        # The sleeping thread still holds the only slot
+        assert pool.in_flight == 1
+        with pytest.raises(WorkerPoolBusy):
+            await pool.run(pow, 2, 2)
+        await asyncio.sleep(0.4)
+        return await pool.run(pow, 2, 2)
+
+    assert asyncio.run(run()) == 4
+    pool.shutdown()
+
+
+def test_pool_timeout_cancels_cancellable_tasks():
+    pool = WorkerPool(size=1, queue_depth=0)
+
+    def task(cancel):
+        return cancel.wait(5)
+
+    async def run():
+        with pytest.raises(WorkerTaskTimeout):
+            await pool.run(task, timeout=0.05, cancellable=True)
+        # The task saw the event and gave its slot back
+        await asyncio.sleep(0.1)
+        assert pool.in_flight == 0
+        return await pool.run(pow, 2, 2)
+
+    assert asyncio.run(run()) == 4
+    pool.shutdown()
+
+
+def test_process_pool_runs_service_tasks():
+    from app.services.generator import _pool_games, _weighted_games
+    from lottery_engine import AliasTable
+
+    pool = WorkerPool(kind="process", size=1)
+    table = AliasTable.build(np.arange(1, 26, dtype=float))
+
+    async def run():
+        return await asyncio.gather(
+            pool.run(_pool_games, list(range(1, 26)), 15, 3, [7]),
+            pool.run(_weighted_games, table, 3, 15, [7]),
+        )
+
+    try:
+        for games in asyncio.run(run()):
+            assert len(games) == 3
+            assert all(len(set(game)) == 15 and 7 in game for game in games)
+    finally:
+        pool.shutdown()
+
+
+def test_unknown_pool_kind():
+    with pytest.raises(ValueError):
+        WorkerPool(kind="gpu")
+
+
+def test_saturated_pool_returns_429_and_cheap_endpoints_stay_up(client, monkeypatch):
+    monkeypatch.setattr(cpu_pool, "_in_flight", cpu_pool.capacity)
+
+    response = client.post("/api/generator/generate", json={
+        "lottery_type": "LOTOFACIL",
+        "numbers_count": 15,
+        "games_count": 5,
+    })
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+
+    assert client.post("/api/generator/bulk", json={
+        "lottery_type": "LOTOFACIL",
+        "numbers_count": 15,
+        "games_count": 5,
+    }).status_code == 429
+
+    assert client.post("/api/checker/check-history", json={
+        "lottery_type": "LOTOFACIL",
+        "combinations": [list(range(1, 16))],
+    }).status_code == 429
+
+    assert client.get("/health").status_code == 200
+    assert client.get("/api/lotteries/LOTOFACIL/draws").status_code == 200
@@ -10,11 +10,16 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Shared lottery engine lives in the FastAPI backend tree
+sys.path.append(str(BASE_DIR / 'backend'))
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
@@ -48,6 +53,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'lotteries.middleware.DataVersionConditionalMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -124,16 +130,51 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
-# Cache configuration (in-memory for development)
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'lottery-cache',
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000
+# Cache configuration: Redis shared by every worker when REDIS_URL is set,
+# otherwise in-memory per process (development). Namespaces and TTLs of the
+# lottery caches are declared in lottery_engine.cache.CACHE_TTLS.
+REDIS_URL = os.environ.get('REDIS_URL')
+# Must match the FastAPI CACHE_KEY_PREFIX: both stacks read each other's keys
+CACHE_KEY_PREFIX = os.environ.get('CACHE_KEY_PREFIX', 'lotofacil')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            # Same key layout as the FastAPI AsyncRedisStore
+            'KEY_FUNCTION': 'lottery_engine.cache.make_cache_key',
         }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'lottery-cache',
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000
+            }
+        }
+    }
+
+# Draw history snapshots are revalidated against the database at most this often
+DRAW_HISTORY_REVALIDATE_SECONDS = 60
+
+# Time budget for the greedy wheel solver before it falls back to a quick cover (seconds)
+WHEEL_TIME_BUDGET_SECONDS = 30
+
+# Processes shared by every backtest and simulation (None = one per CPU)
+PROCESS_POOL_SIZE = None
+
+# Chunks of one strategy backtest run at once on the shared processes (None = all of them)
+BACKTEST_WORKERS = None
+
+# Chunks of one Monte Carlo simulation run at once on the shared processes (None = all of them)
+SIMULATION_WORKERS = None
+
+# Precomputed Lotofácil combination space (built by `manage.py build_combination_space`)
+COMBINATION_SPACE_DIR = BASE_DIR / 'data' / 'lotofacil_space'
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
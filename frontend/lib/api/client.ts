@@ -30,6 +30,12 @@ export interface Draw {
   updated_at?: string;
 }
 
+export interface DrawPage {
+  items: Draw[];
+  next: string | null;
+  prev: string | null;
+}
+
 export interface NumberStatistics {
   id: number;
   lottery_type: string;
@@ -124,8 +130,11 @@ class ApiClient {
     return this.fetchApi<LotteryConfig>(`/api/lotteries/${lotteryType}`);
   }
 
-  async getDraws(lotteryType: string, limit: number = 20, offset: number = 0): Promise<Draw[]> {
-    return this.fetchApi<Draw[]>(`/api/lotteries/${lotteryType}/draws?limit=${limit}&offset=${offset}`);
+  async getDraws(lotteryType: string, limit: number = 20, cursor?: string): Promise<DrawPage> {
+    const params = new URLSearchParams();
+    params.append('limit', limit.toString());
+    if (cursor) params.append('cursor', cursor);
+    return this.fetchApi<DrawPage>(`/api/lotteries/${lotteryType}/draws?${params.toString()}`);
   }
 
   async getLatestDraw(lotteryType: string): Promise<Draw> {
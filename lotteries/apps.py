@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class LotteriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'lotteries'
+
+    def ready(self):
+        # Connect the draw history invalidation signals
+        from . import history  # noqa: F401
+
+        # Size the process pool shared by backtests and simulations
+        from django.conf import settings
+        from lottery_engine import configure_processes
+
+        configure_processes(settings.PROCESS_POOL_SIZE)
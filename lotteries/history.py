@@ -0,0 +1,79 @@
+"""
+Process-wide draw history snapshots.
+
+Services read draws, dates and derived statistics from an immutable
+DrawHistory instead of querying the ORM on every request. The snapshot is
+revalidated against a cheap version query and reloaded when draws change.
+"""
+import json
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from lottery_engine import DrawHistory, HistoryRegistry, validators_key
+from .models import Draw, LotteryConfiguration
+
+CONFIG_FIELDS = ['lottery_type', 'total_numbers', 'numbers_to_pick', 'min_bet_numbers', 'max_bet_numbers']
+
+
+def _history_version(lottery_type: str):
+    """Identify the current draw data (and configuration) of a lottery."""
+    draws = Draw.objects.filter(lottery_type=lottery_type).aggregate(
+        count=Count('id'),
+        latest=Max('contest_number'),
+        updated=Max('updated_at'),
+    )
+    config = LotteryConfiguration.objects.filter(
+        lottery_type=lottery_type
+    ).values_list(*CONFIG_FIELDS).first()
+    return (draws['count'], draws['latest'], draws['updated'], config)
+
+
+def _load_history(lottery_type: str, version) -> DrawHistory:
+    """Load every draw of a lottery into a new snapshot."""
+    config = LotteryConfiguration.objects.values(*CONFIG_FIELDS).get(lottery_type=lottery_type)
+    rows = (
+        Draw.objects.filter(lottery_type=lottery_type)
+        .order_by('contest_number')
+        .values_list('contest_number', 'draw_date', 'numbers')
+    )
+    return DrawHistory.from_rows(
+        config,
+        version,
+        (
+            (contest, draw_date, json.loads(numbers) if isinstance(numbers, str) else numbers)
+            for contest, draw_date, numbers in rows
+        )
+    )
+
+
+draw_histories = HistoryRegistry(
+    load=_load_history,
+    version=_history_version,
+    revalidate_after=getattr(settings, 'DRAW_HISTORY_REVALIDATE_SECONDS', 60),
+)
+
+
+def get_draw_history(lottery_type: str) -> DrawHistory:
+    """
+    Get the current draw history snapshot of a lottery.
+    
+    Raises:
+        LotteryConfiguration.DoesNotExist: If the lottery is not configured
+    """
+    return draw_histories.get(lottery_type)
+
+
+def invalidate_lottery(lottery_type: str) -> None:
+    """Drop this process' snapshot and the lottery's HTTP validators after its draws change."""
+    draw_histories.invalidate(lottery_type)
+    # Until statistics are republished, pages are rendered in full rather than risk a stale 304
+    cache.delete(validators_key(lottery_type))
+
+
+@receiver(post_save, sender=Draw)
+@receiver(post_delete, sender=Draw)
+def invalidate_draw_history(sender, instance, **kwargs):
+    """Invalidate as soon as a draw changes (bulk writes call ``invalidate_lottery`` themselves)."""
+    invalidate_lottery(instance.lottery_type)
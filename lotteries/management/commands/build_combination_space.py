@@ -0,0 +1,23 @@
+"""
+Management command to precompute the Lotofácil combination space.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from lottery_engine import build_space
+
+
+class Command(BaseCommand):
+    help = 'Enumerate every Lotofácil combination with its feature columns into memory-mappable files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=str(settings.COMBINATION_SPACE_DIR),
+            help='Directory to write the combination space to',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Gerando espaço de combinações em {options["output"]}...')
+        total = build_space(options['output'])
+        self.stdout.write(self.style.SUCCESS(f'✓ {total} combinações geradas'))
@@ -15,6 +15,11 @@ class Command(BaseCommand):
             type=str,
             help='Specific lottery type to process (e.g., MEGA_SENA, LOTOFACIL)',
         )
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only compare stored statistics against a full rebuild, without saving',
+        )
 
     def handle(self, *args, **options):
         lottery_types = []
@@ -25,6 +30,10 @@ class Command(BaseCommand):
             lottery_types = [choice[0] for choice in LotteryType.choices]
         
         for lottery_type in lottery_types:
+            if options['verify']:
+                self.verify(lottery_type)
+                continue
+            
             self.stdout.write(f'Calculando estatísticas para {lottery_type}...')
             
             try:
@@ -44,3 +53,19 @@ class Command(BaseCommand):
         self.stdout.write(
             self.style.SUCCESS('\n✅ Processo concluído!')
         )
+    
+    def verify(self, lottery_type):
+        """Report numbers whose stored statistics diverge from a full rebuild."""
+        self.stdout.write(f'Verificando estatísticas para {lottery_type}...')
+        mismatches = StatisticsService.verify_statistics(lottery_type)
+        
+        if mismatches:
+            self.stdout.write(
+                self.style.ERROR(
+                    f'✗ Estatísticas divergentes para {lottery_type}: {mismatches}'
+                )
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f'✓ Estatísticas consistentes para {lottery_type}')
+            )
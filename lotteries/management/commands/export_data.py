@@ -0,0 +1,53 @@
+"""
+Management command to export draw history and statistics to files.
+"""
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from lottery_engine import EXPORT_DATASETS, EXPORT_FORMATS
+from lotteries.models import LotteryType
+from lotteries.services import ExportService
+
+
+class Command(BaseCommand):
+    help = 'Export draw history and number statistics as CSV, NDJSON, Parquet or Arrow'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lottery',
+            type=str,
+            help='Specific lottery type to export (default: all)',
+        )
+        parser.add_argument(
+            '--dataset',
+            action='append',
+            choices=list(EXPORT_DATASETS),
+            help='Dataset to export (repeatable; default: all)',
+        )
+        parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='parquet', help='Output format')
+        parser.add_argument('--output', type=str, default='.', help='Directory for the exported files')
+
+    def handle(self, *args, **options):
+        lottery_types = [options['lottery']] if options['lottery'] else [choice[0] for choice in LotteryType.choices]
+        datasets = options['dataset'] or list(EXPORT_DATASETS)
+        fmt = options['format']
+        output = Path(options['output'])
+        output.mkdir(parents=True, exist_ok=True)
+
+        started = time.perf_counter()
+        for lottery_type in lottery_types:
+            for dataset in datasets:
+                path = output / f'{lottery_type.lower()}_{dataset}.{fmt}'
+                try:
+                    with open(path, 'wb') as f:
+                        for chunk in ExportService.export(lottery_type, dataset, fmt):
+                            f.write(chunk)
+                except ImportError:
+                    path.unlink(missing_ok=True)
+                    raise CommandError(f'Formato {fmt} indisponível: instale o pacote pyarrow')
+                self.stdout.write(f'  {path} ({path.stat().st_size} bytes)')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ Exportação concluída em {time.perf_counter() - started:.2f}s')
+        )
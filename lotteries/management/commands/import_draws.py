@@ -0,0 +1,65 @@
+"""
+Management command to bulk load draws from official result files.
+"""
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from lottery_engine import INGEST_FORMATS, IngestError
+from lotteries.services import DrawIngestService
+
+
+class Command(BaseCommand):
+    help = 'Load (or correct) draws from an official CSV/XLSX result file and refresh statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('lottery', type=str, help='Lottery type (e.g., LOTOFACIL)')
+        parser.add_argument('file', type=str, help='Result file (.csv or .xlsx)')
+        parser.add_argument(
+            '--format',
+            choices=INGEST_FORMATS,
+            help='File format (default: from the file extension)',
+        )
+        parser.add_argument('--encoding', default='utf-8-sig', help='Text encoding of CSV files')
+        parser.add_argument(
+            '--partial',
+            action='store_true',
+            help='Load the valid rows even if some rows are invalid',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['file'])
+        fmt = options['format'] or path.suffix.lstrip('.').lower()
+        if fmt not in INGEST_FORMATS:
+            raise CommandError(f'Formato não suportado: {path.suffix or path.name} (use --format)')
+
+        self.stdout.write(f'Importando {path} para {options["lottery"]}...')
+        started = time.perf_counter()
+        try:
+            with open(path, 'rb') as f:
+                result = DrawIngestService.ingest(
+                    options['lottery'],
+                    f,
+                    fmt=fmt,
+                    encoding=options['encoding'],
+                    strict=not options['partial'],
+                )
+        except IngestError as e:
+            self.report_errors(e.report.errors)
+            raise CommandError(str(e))
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        except ImportError:
+            raise CommandError('Arquivos XLSX exigem o pacote openpyxl')
+
+        self.report_errors([(error['line'], error['message']) for error in result['errors']])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ {result["loaded"]} concursos importados de {result["rows"]} linhas '
+                f'em {time.perf_counter() - started:.2f}s'
+            )
+        )
+
+    def report_errors(self, errors):
+        for line, message in errors:
+            self.stdout.write(self.style.ERROR(f'  linha {line}: {message}'))
@@ -0,0 +1,51 @@
+"""
+Management command to backtest generation strategies over the draw history.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from lottery_engine import STRATEGIES
+from lotteries.services import BacktestService
+
+
+class Command(BaseCommand):
+    help = 'Replay the draw history and score each generation strategy against the next draw'
+
+    def add_arguments(self, parser):
+        parser.add_argument('lottery', type=str, help='Lottery type (e.g., LOTOFACIL)')
+        parser.add_argument('--numbers', type=int, help='Numbers per game (default: numbers drawn)')
+        parser.add_argument('--games', type=int, default=10, help='Games per strategy and contest')
+        parser.add_argument(
+            '--strategy',
+            action='append',
+            choices=STRATEGIES,
+            help='Strategy to run (repeatable; default: all)',
+        )
+        parser.add_argument('--warmup', type=int, default=1, help='Draws known before the first game')
+        parser.add_argument('--seed', type=int, help='Seed for a reproducible run')
+        parser.add_argument('--workers', type=int, help='Chunks run at once on the shared worker processes (default: PROCESS_POOL_SIZE)')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Executando backtest para {options["lottery"]}...')
+        try:
+            result = BacktestService.run_backtest(
+                options['lottery'],
+                numbers_count=options['numbers'],
+                games_per_contest=options['games'],
+                strategies=options['strategy'],
+                warmup=options['warmup'],
+                seed=options['seed'],
+                workers=options['workers'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f'{result["contests"]} concursos ({result["first_contest"]}-{result["last_contest"]}), '
+            f'{result["games_per_contest"]} jogos de {result["numbers_count"]} números, seed {result["seed"]}'
+        )
+        for strategy, summary in result['strategies'].items():
+            tiers = ', '.join(f'{name}: {count}' for name, count in summary['prize_tiers'].items())
+            self.stdout.write(
+                f'  {strategy}: média {summary["mean_hits"]:.3f} acertos, '
+                f'{summary["winners"]}/{summary["games"]} premiados ({tiers})'
+            )
+        self.stdout.write(self.style.SUCCESS('✓ Backtest concluído'))
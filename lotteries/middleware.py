@@ -0,0 +1,53 @@
+"""
+Conditional GET for the lottery read views.
+
+Each lottery's ETag and Last-Modified are derived from its data version
+(latest contest counted and statistics update time) and cached whenever its
+statistics are published. A client revalidating an unchanged page gets a
+304 before the view runs, without touching the ORM.
+"""
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from lottery_engine import validators_key
+
+# Views whose content only changes with the lottery's data version
+CONDITIONAL_VIEWS = {'lotteries:dashboard', 'lotteries:draws', 'lotteries:statistics'}
+
+
+class DataVersionConditionalMiddleware:
+    """Answer If-None-Match / If-Modified-Since for the lottery read views."""
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        response = self.get_response(request)
+        validators = getattr(request, '_data_validators', None)
+        if validators is not None and response.status_code == 200:
+            response.headers.setdefault('ETag', validators['etag'])
+            response.headers.setdefault('Last-Modified', validators['last_modified'])
+        return response
+    
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        match = request.resolver_match
+        if match is None or match.view_name not in CONDITIONAL_VIEWS:
+            return None
+        
+        # Unknown until the lottery's statistics are published: let the view answer
+        validators = cache.get(validators_key(view_kwargs['lottery_type']))
+        if validators is None:
+            return None
+        
+        request._data_validators = validators
+        response = get_conditional_response(
+            request,
+            etag=validators['etag'],
+            last_modified=parse_http_date_safe(validators['last_modified']),
+        )
+        if response is not None:
+            response.headers['ETag'] = validators['etag']
+            response.headers['Last-Modified'] = validators['last_modified']
+        return response
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:51
+
+from django.db import migrations, models
+
+
+def backfill_gap_counters(apps, schema_editor):
+    """Recover the running counters from the stored frequency and average."""
+    NumberStatistics = apps.get_model('lotteries', 'NumberStatistics')
+    stats = list(NumberStatistics.objects.all())
+    for stat in stats:
+        stat.gap_count = max(stat.frequency - 1, 0)
+        stat.gap_sum = round(stat.average_delay * stat.gap_count)
+    NumberStatistics.objects.bulk_update(stats, ['gap_sum', 'gap_count'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotteries', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='numberstatistics',
+            name='gap_count',
+            field=models.IntegerField(default=0, help_text='Quantidade de intervalos entre aparições consecutivas', verbose_name='Quantidade de Intervalos'),
+        ),
+        migrations.AddField(
+            model_name='numberstatistics',
+            name='gap_sum',
+            field=models.IntegerField(default=0, help_text='Soma dos intervalos entre aparições consecutivas', verbose_name='Soma dos Intervalos'),
+        ),
+        migrations.RunPython(backfill_gap_counters, migrations.RunPython.noop),
+    ]
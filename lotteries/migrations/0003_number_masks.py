@@ -0,0 +1,49 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:53
+
+import json
+
+from django.db import migrations, models
+
+from lottery_engine import encode_words
+
+
+def backfill_number_masks(apps, schema_editor):
+    """Compute the bitmask words for rows saved before the columns existed."""
+    for model_name in ('Draw', 'UserCombination'):
+        model = apps.get_model('lotteries', model_name)
+        rows = list(model.objects.only('id', 'numbers'))
+        for row in rows:
+            numbers = json.loads(row.numbers) if isinstance(row.numbers, str) else row.numbers
+            row.numbers_mask_low, row.numbers_mask_high = encode_words(numbers)
+        model.objects.bulk_update(rows, ['numbers_mask_low', 'numbers_mask_high'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lotteries', '0002_number_statistics_gap_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='draw',
+            name='numbers_mask_high',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Máscara dos Números (65-128)'),
+        ),
+        migrations.AddField(
+            model_name='draw',
+            name='numbers_mask_low',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Máscara dos Números (1-64)'),
+        ),
+        migrations.AddField(
+            model_name='usercombination',
+            name='numbers_mask_high',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Máscara dos Números (65-128)'),
+        ),
+        migrations.AddField(
+            model_name='usercombination',
+            name='numbers_mask_low',
+            field=models.BigIntegerField(default=0, editable=False, verbose_name='Máscara dos Números (1-64)'),
+        ),
+        migrations.RunPython(backfill_number_masks, migrations.RunPython.noop),
+    ]
@@ -7,8 +7,8 @@ Supports: Mega-Sena, Lotofácil, Quina, Dupla Sena, Super Sete
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.utils import timezone
 import json
+from lottery_engine import encode_words, join_mask
 
 
 class LotteryType(models.TextChoices):
@@ -67,6 +67,24 @@ class LotteryConfiguration(models.Model):
         return self.get_lottery_type_display()
 
 
+class DrawQuerySet(models.QuerySet):
+    """Query helpers for draws."""
+    
+    def containing(self, numbers):
+        """Filter draws whose numbers include all of ``numbers`` (bitwise, no JSON parsing)."""
+        low, high = encode_words(numbers)
+        queryset = self
+        if low:
+            queryset = queryset.alias(
+                low_hits=models.F('numbers_mask_low').bitand(low)
+            ).filter(low_hits=low)
+        if high:
+            queryset = queryset.alias(
+                high_hits=models.F('numbers_mask_high').bitand(high)
+            ).filter(high_hits=high)
+        return queryset
+
+
 class Draw(models.Model):
     """Historical draw/contest results."""
     lottery_type = models.CharField(
@@ -87,6 +105,17 @@ class Draw(models.Model):
         verbose_name='Números Sorteados',
         help_text='Lista de números sorteados'
     )
+    # Bitmask of numbers (bit n-1 = number n), split in two 64-bit words
+    numbers_mask_low = models.BigIntegerField(
+        verbose_name='Máscara dos Números (1-64)',
+        default=0,
+        editable=False
+    )
+    numbers_mask_high = models.BigIntegerField(
+        verbose_name='Máscara dos Números (65-128)',
+        default=0,
+        editable=False
+    )
     # For Dupla Sena (has 2 draws)
     numbers_second_draw = models.JSONField(
         verbose_name='Números do 2º Sorteio',
@@ -121,6 +150,8 @@ class Draw(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = DrawQuerySet.as_manager()
+    
     class Meta:
         verbose_name = 'Sorteio'
         verbose_name_plural = 'Sorteios'
@@ -134,6 +165,13 @@ class Draw(models.Model):
     def __str__(self):
         return f"{self.get_lottery_type_display()} - Concurso {self.contest_number}"
     
+    def save(self, *args, **kwargs):
+        self.numbers_mask_low, self.numbers_mask_high = encode_words(self.get_numbers_display())
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'numbers' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'numbers_mask_low', 'numbers_mask_high'}
+        super().save(*args, **kwargs)
+    
     def get_numbers_display(self):
         """Return formatted numbers for display."""
         if isinstance(self.numbers, str):
@@ -141,6 +179,11 @@ class Draw(models.Model):
         else:
             numbers = self.numbers
         return sorted(numbers)
+    
+    @property
+    def numbers_mask(self):
+        """Bitmask of the drawn numbers as a single int."""
+        return join_mask(self.numbers_mask_low, self.numbers_mask_high)
 
 
 class UserCombination(models.Model):
@@ -167,6 +210,16 @@ class UserCombination(models.Model):
         verbose_name='Números',
         help_text='Lista de números da combinação'
     )
+    numbers_mask_low = models.BigIntegerField(
+        verbose_name='Máscara dos Números (1-64)',
+        default=0,
+        editable=False
+    )
+    numbers_mask_high = models.BigIntegerField(
+        verbose_name='Máscara dos Números (65-128)',
+        default=0,
+        editable=False
+    )
     session_key = models.CharField(
         max_length=40,
         verbose_name='Chave de Sessão',
@@ -185,6 +238,13 @@ class UserCombination(models.Model):
     def __str__(self):
         return f"{self.name or 'Combinação'} - {self.get_lottery_type_display()}"
     
+    def save(self, *args, **kwargs):
+        self.numbers_mask_low, self.numbers_mask_high = encode_words(self.get_numbers_display())
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'numbers' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'numbers_mask_low', 'numbers_mask_high'}
+        super().save(*args, **kwargs)
+    
     def get_numbers_display(self):
         """Return formatted numbers for display."""
         if isinstance(self.numbers, str):
@@ -192,6 +252,11 @@ class UserCombination(models.Model):
         else:
             numbers = self.numbers
         return sorted(numbers)
+    
+    @property
+    def numbers_mask(self):
+        """Bitmask of the combination numbers as a single int."""
+        return join_mask(self.numbers_mask_low, self.numbers_mask_high)
 
 
 class NumberStatistics(models.Model):
@@ -231,6 +296,17 @@ class NumberStatistics(models.Model):
         default=0.0,
         help_text='Média de concursos entre aparições'
     )
+    # Running counters for incremental updates (average_delay = gap_sum / gap_count)
+    gap_sum = models.IntegerField(
+        verbose_name='Soma dos Intervalos',
+        default=0,
+        help_text='Soma dos intervalos entre aparições consecutivas'
+    )
+    gap_count = models.IntegerField(
+        verbose_name='Quantidade de Intervalos',
+        default=0,
+        help_text='Quantidade de intervalos entre aparições consecutivas'
+    )
     last_updated = models.DateTimeField(
         auto_now=True,
         verbose_name='Última Atualização'
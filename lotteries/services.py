@@ -3,17 +3,123 @@ Service classes for lottery business logic.
 
 Adapted from Android app specification to Django.
 """
+import math
 import random
-from typing import List, Dict, Set, Optional
+import numpy as np
+from typing import IO, Iterator, List, Dict, Optional, Tuple
+from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Count, Max, Min, Avg
+from lottery_engine import (
+    CACHE_TTLS,
+    EXPORT_CHUNK_ROWS,
+    EXPORT_DATASETS,
+    INGEST_BATCH_ROWS,
+    STRATEGIES,
+    CountingFilters,
+    HistoryStatistics,
+    IngestError,
+    IngestReport,
+    SpaceFilters,
+    VersionedCache,
+    WheelCache,
+    apply_draw,
+    bet_odds,
+    conditional_validators,
+    constrained_sampler,
+    count_hits,
+    decode_mask,
+    encode_mask,
+    encode_words,
+    export_chunks,
+    latest_contest,
+    iter_draw_batches,
+    masks_from_numbers,
+    pack_rows,
+    prize_tiers,
+    read_result_rows,
+    run_backtest,
+    score_bet,
+    simulate_draws,
+    summarize_backtest,
+    summarize_history,
+    summarize_hits,
+    summarize_simulation,
+    unpack_rows,
+    validators_key,
+)
+from lottery_engine.space import NUMBERS_TO_PICK as SPACE_NUMBERS_TO_PICK
+from .history import draw_histories, get_draw_history, invalidate_lottery
 from .models import Draw, NumberStatistics, LotteryType, LotteryConfiguration
+from .space import get_combination_space
+
+
+# Statistics rows per lottery (packed), republished under a new version on every recompute
+statistics_cache = VersionedCache(cache, namespace='stats')
 
 
 class StatisticsService:
     """Service for calculating and caching lottery statistics."""
     
-    CACHE_TIMEOUT = 3600  # 1 hour
+    STATISTICS_FIELDS = [
+        'number', 'frequency', 'last_draw_contest', 'delay',
+        'max_delay', 'average_delay', 'gap_sum', 'gap_count',
+    ]
+    
+    @staticmethod
+    def _compute_from_history(lottery_type: str) -> Optional[HistoryStatistics]:
+        """Reload the lottery's draw history snapshot and return its statistics."""
+        draw_histories.invalidate(lottery_type)
+        history = get_draw_history(lottery_type)
+        
+        if not len(history):
+            return None
+        
+        return history.statistics
+    
+    @staticmethod
+    def _save_rows(lottery_type: str, rows: List[Dict]) -> None:
+        """Persist all statistics rows of a lottery in a single bulk upsert."""
+        with transaction.atomic():
+            NumberStatistics.objects.bulk_create(
+                [NumberStatistics(lottery_type=lottery_type, **row) for row in rows],
+                update_conflicts=True,
+                unique_fields=['lottery_type', 'number'],
+                update_fields=StatisticsService.STATISTICS_FIELDS[1:] + ['last_updated'],
+            )
+    
+    @staticmethod
+    def _load_rows(lottery_type: str) -> List[Dict]:
+        """Read a lottery's statistics rows as plain dicts, ordered by number."""
+        return list(
+            NumberStatistics.objects.filter(lottery_type=lottery_type)
+            .order_by('number')
+            .values('id', *StatisticsService.STATISTICS_FIELDS, 'last_updated')
+        )
+    
+    @staticmethod
+    def _set_validators(lottery_type: str, rows: List[Dict]) -> None:
+        """Refresh the lottery's HTTP validators (its data version) from its rows."""
+        cache.set(
+            validators_key(lottery_type),
+            conditional_validators(lottery_type, rows),
+            CACHE_TTLS['validators'],
+        )
+    
+    @staticmethod
+    def _publish(lottery_type: str) -> None:
+        """Write-through: cache the rows just saved under a new version."""
+        rows = StatisticsService._load_rows(lottery_type)
+        statistics_cache.publish(lottery_type, pack_rows(rows))
+        StatisticsService._set_validators(lottery_type, rows)
+    
+    @staticmethod
+    def _build_rows(lottery_type: str) -> bytes:
+        """Cache-miss path of get_statistics: load and pack the rows."""
+        rows = StatisticsService._load_rows(lottery_type)
+        StatisticsService._set_validators(lottery_type, rows)
+        return pack_rows(rows)
     
     @staticmethod
     def calculate_statistics(lottery_type: str) -> None:
@@ -23,82 +129,112 @@ class StatisticsService:
         Args:
             lottery_type: Type of lottery (e.g., 'MEGA_SENA', 'LOTOFACIL')
         """
-        draws = Draw.objects.filter(lottery_type=lottery_type).order_by('-contest_number')
+        history_stats = StatisticsService._compute_from_history(lottery_type)
+        
+        if history_stats is None:
+            return
+        
+        StatisticsService._save_rows(lottery_type, history_stats.as_rows())
+        StatisticsService._publish(lottery_type)
+    
+    @staticmethod
+    def apply_draw(draw: Draw) -> None:
+        """
+        Incrementally fold a newly ingested draw into the stored statistics.
+        
+        Args:
+            draw: The newly saved Draw
+        """
+        StatisticsService.apply_draws(
+            draw.lottery_type, [(draw.contest_number, draw.get_numbers_display())]
+        )
+    
+    @staticmethod
+    def apply_draws(lottery_type: str, draws: List[Tuple[int, List[int]]]) -> None:
+        """
+        Incrementally fold newly ingested draws into the stored statistics.
+        
+        Updates each number's row in O(1) per draw from its running counters
+        and saves once. Falls back to a full rebuild when there are no
+        statistics yet or any draw is not newer than the latest contest
+        already counted (e.g. a correction).
         
-        if not draws.exists():
+        Args:
+            lottery_type: Type of lottery
+            draws: (contest_number, numbers) of each new draw
+        """
+        if not draws:
             return
+        draws = sorted(draws)
+        rows = list(
+            NumberStatistics.objects.filter(lottery_type=lottery_type)
+            .values(*StatisticsService.STATISTICS_FIELDS)
+        )
         
         config = LotteryConfiguration.objects.get(lottery_type=lottery_type)
-        latest_contest = draws.first().contest_number
-        
-        # Calculate statistics for each number
-        for number in range(1, config.total_numbers + 1):
-            frequency = 0
-            last_contest = None
-            delays = []
-            last_seen = None
-            
-            # Process draws chronologically
-            for draw in draws.order_by('contest_number'):
-                numbers = draw.get_numbers_display()
-                
-                if number in numbers:
-                    frequency += 1
-                    if last_seen is not None:
-                        delays.append(draw.contest_number - last_seen)
-                    last_seen = draw.contest_number
-                    last_contest = draw.contest_number
-            
-            # Calculate delay (contests since last appearance)
-            delay = latest_contest - last_contest if last_contest else 0
-            
-            # Calculate average and max delay
-            avg_delay = sum(delays) / len(delays) if delays else 0.0
-            max_delay = max(delays) if delays else 0
+        
+        latest = latest_contest(rows)
+        if len(rows) < config.total_numbers or latest is None or draws[0][0] <= latest:
+            StatisticsService.calculate_statistics(lottery_type)
+            return
+        
+        for contest_number, numbers in draws:
+            apply_draw(rows, contest_number, numbers)
+        StatisticsService._save_rows(lottery_type, rows)
+        draw_histories.invalidate(lottery_type)
+        StatisticsService._publish(lottery_type)
+    
+    @staticmethod
+    def verify_statistics(lottery_type: str) -> List[int]:
+        """
+        Compare stored statistics against a full rebuild from the draw history.
+        
+        Args:
+            lottery_type: Type of lottery
             
-            # Update or create statistics
-            NumberStatistics.objects.update_or_create(
-                lottery_type=lottery_type,
-                number=number,
-                defaults={
-                    'frequency': frequency,
-                    'last_draw_contest': last_contest,
-                    'delay': delay,
-                    'max_delay': max_delay,
-                    'average_delay': avg_delay,
-                }
-            )
+        Returns:
+            Numbers whose stored row differs from the rebuilt one
+        """
+        history_stats = StatisticsService._compute_from_history(lottery_type)
+        expected = history_stats.as_rows() if history_stats else []
         
-        # Invalidate cache
-        cache_key = f'stats_{lottery_type}'
-        cache.delete(cache_key)
+        stored = {
+            stat.number: stat
+            for stat in NumberStatistics.objects.filter(lottery_type=lottery_type)
+        }
+        mismatches = []
+        for row in expected:
+            stat = stored.get(row['number'])
+            if stat is None or any(
+                not math.isclose(getattr(stat, field), value) if field == 'average_delay'
+                else getattr(stat, field) != value
+                for field, value in row.items()
+            ):
+                mismatches.append(row['number'])
+        return mismatches
     
     @staticmethod
     def get_statistics(lottery_type: str, force_refresh: bool = False) -> List[NumberStatistics]:
         """
         Get statistics for a lottery type (cached).
         
+        Rows are cached as a compact packed payload under a versioned key;
+        concurrent misses (across threads and processes) share a single query.
+        
         Args:
             lottery_type: Type of lottery
-            force_refresh: Force recalculation of statistics
+            force_refresh: Re-read the rows and publish them as a new version
             
         Returns:
             List of NumberStatistics objects
         """
-        cache_key = f'stats_{lottery_type}'
-        
         if force_refresh:
-            cache.delete(cache_key)
-        
-        stats = cache.get(cache_key)
-        
-        if stats is None:
-            stats = list(NumberStatistics.objects.filter(
-                lottery_type=lottery_type
-            ).order_by('number'))
-            cache.set(cache_key, stats, StatisticsService.CACHE_TIMEOUT)
+            StatisticsService._publish(lottery_type)
         
-        return stats
+        rows = unpack_rows(statistics_cache.get_or_build(
+            lottery_type, lambda: StatisticsService._build_rows(lottery_type)
+        ))
+        return [NumberStatistics(lottery_type=lottery_type, **row) for row in rows]
     
     @staticmethod
     def get_most_frequent(lottery_type: str, limit: int = 10) -> List[NumberStatistics]:
@@ -126,7 +262,10 @@ class CombinationGeneratorService:
         fixed_numbers: Optional[List[int]] = None,
         include_frequent: bool = True,
         include_delayed: bool = True,
-        mix_strategy: bool = True
+        mix_strategy: bool = True,
+        mode: str = 'pool',
+        filters: Optional[Dict[str, any]] = None,
+        weighting: str = 'mixed'
     ) -> List[List[int]]:
         """
         Generate lottery combinations based on filters.
@@ -139,18 +278,37 @@ class CombinationGeneratorService:
             include_frequent: Include frequently drawn numbers
             include_delayed: Include delayed numbers
             mix_strategy: Mix different strategies
+            mode: 'pool' draws from the frequent/delayed pools, 'space' samples
+                uniformly from the precomputed Lotofácil space, 'weighted' draws
+                numbers with statistics-based weights, 'constrained' samples
+                uniformly under sum/odd/run filters for any lottery
+            filters: SpaceFilters fields for the 'space' mode, CountingFilters
+                fields for the 'constrained' mode
+            weighting: 'frequency', 'delay' or 'mixed' for the 'weighted' mode
             
         Returns:
             List of combinations (each combination is a list of numbers)
         """
-        config = LotteryConfiguration.objects.get(lottery_type=lottery_type)
-        stats = StatisticsService.get_statistics(lottery_type)
+        if mode == 'space':
+            return CombinationGeneratorService.sample_from_space(
+                lottery_type, numbers_count, games_count, fixed_numbers, filters
+            )
+        if mode == 'weighted':
+            return CombinationGeneratorService.sample_weighted(
+                lottery_type, numbers_count, games_count, fixed_numbers, weighting
+            )
+        if mode == 'constrained':
+            return CombinationGeneratorService.sample_constrained(
+                lottery_type, numbers_count, games_count, fixed_numbers, filters
+            )
+        
+        history = get_draw_history(lottery_type)
         
         fixed_numbers = fixed_numbers or []
         games = []
         
         # Build number pools based on filters
-        all_numbers = set(range(1, config.total_numbers + 1))
+        all_numbers = set(range(1, history.total_numbers + 1))
         
         if not include_frequent and not include_delayed:
             # Random selection from all numbers
@@ -159,12 +317,10 @@ class CombinationGeneratorService:
             available_numbers = set()
             
             if include_frequent:
-                frequent = StatisticsService.get_most_frequent(lottery_type, 20)
-                available_numbers.update([s.number for s in frequent])
+                available_numbers.update(history.ranked_numbers('frequency', 20))
             
             if include_delayed:
-                delayed = StatisticsService.get_most_delayed(lottery_type, 20)
-                available_numbers.update([s.number for s in delayed])
+                available_numbers.update(history.ranked_numbers('delay', 20))
             
             if mix_strategy and include_frequent and include_delayed:
                 # Add some random numbers for mixing
@@ -209,6 +365,150 @@ class CombinationGeneratorService:
         
         return games
     
+    @staticmethod
+    def sample_weighted(
+        lottery_type: str,
+        numbers_count: int,
+        games_count: int = 1,
+        fixed_numbers: Optional[List[int]] = None,
+        weighting: str = 'mixed'
+    ) -> List[List[int]]:
+        """
+        Draw games with per-number weights taken from the statistics.
+        
+        The weights are compiled into an alias table cached on the draw
+        history snapshot, so it is rebuilt only when the data changes and
+        each draw is O(1).
+        
+        Args:
+            lottery_type: Type of lottery
+            numbers_count: How many numbers in each game
+            games_count: How many games to generate
+            fixed_numbers: Numbers that must appear in all combinations
+            weighting: 'frequency', 'delay' or 'mixed'
+            
+        Returns:
+            List of combinations
+        """
+        history = get_draw_history(lottery_type)
+        fixed_numbers = fixed_numbers or []
+        invalid = [n for n in fixed_numbers if n < 1 or n > history.total_numbers]
+        if invalid:
+            raise ValueError(f'Números fixos fora do intervalo (1-{history.total_numbers}): {invalid}')
+        
+        table = history.alias_table(weighting)
+        games = table.sample_games(np.random.default_rng(), games_count, numbers_count, fixed_numbers)
+        return games.tolist()
+    
+    @staticmethod
+    def sample_from_space(
+        lottery_type: str,
+        numbers_count: int,
+        games_count: int = 1,
+        fixed_numbers: Optional[List[int]] = None,
+        filters: Optional[Dict[str, any]] = None
+    ) -> List[List[int]]:
+        """
+        Sample distinct games uniformly among those matching the filters.
+        
+        Indexes into the precomputed combination space, so even very tight
+        filters cost one vectorized scan instead of rejection sampling.
+        
+        Args:
+            lottery_type: Type of lottery (only Lotofácil is precomputed)
+            numbers_count: Numbers per game (must be 15)
+            games_count: How many games to generate
+            fixed_numbers: Numbers that must appear in all combinations
+            filters: SpaceFilters fields (sum, odd, primes, runs, row/column bounds)
+            
+        Returns:
+            List of combinations; shorter than games_count when fewer games match
+        """
+        if lottery_type != LotteryType.LOTOFACIL or numbers_count != SPACE_NUMBERS_TO_PICK:
+            raise ValueError('O modo space só está disponível para a Lotofácil com 15 números')
+        
+        filters = dict(filters or {})
+        filters['fixed_numbers'] = tuple(fixed_numbers or ())
+        filters['excluded_numbers'] = tuple(filters.get('excluded_numbers') or ())
+        space = get_combination_space()
+        return space.sample(space.select(SpaceFilters(**filters)), games_count).tolist()
+    
+    @staticmethod
+    def _constrained_sampler(
+        lottery_type: str,
+        numbers_count: int,
+        fixed_numbers: Optional[List[int]],
+        filters: Optional[Dict[str, any]]
+    ):
+        """Validate the filters and get the (cached) DP sampler for them."""
+        history = get_draw_history(lottery_type)
+        min_bet = history.min_bet_numbers or history.numbers_to_pick
+        max_bet = history.max_bet_numbers or history.numbers_to_pick
+        if not min_bet <= numbers_count <= max_bet:
+            raise ValueError(f'Jogos de {numbers_count} números não são permitidos')
+        
+        filters = {key: value for key, value in (filters or {}).items() if value not in (None, [])}
+        supported = set(CountingFilters.__dataclass_fields__) - {'fixed_numbers'}
+        unsupported = sorted(set(filters) - supported)
+        if unsupported:
+            raise ValueError(f'Filtros não suportados no modo constrained: {unsupported}')
+        
+        filters['fixed_numbers'] = tuple(sorted(set(fixed_numbers or ())))
+        filters['excluded_numbers'] = tuple(sorted(set(filters.get('excluded_numbers') or ())))
+        return constrained_sampler(history.total_numbers, numbers_count, CountingFilters(**filters))
+    
+    @staticmethod
+    def count_combinations(
+        lottery_type: str,
+        numbers_count: int,
+        fixed_numbers: Optional[List[int]] = None,
+        filters: Optional[Dict[str, any]] = None
+    ) -> int:
+        """
+        Exact number of games passing the filters, from DP count tables.
+        
+        Args:
+            lottery_type: Type of lottery
+            numbers_count: Numbers per game
+            fixed_numbers: Numbers that must appear in every game
+            filters: CountingFilters fields (sum, odd and run bounds, exclusions)
+            
+        Returns:
+            Number of matching games
+        """
+        return CombinationGeneratorService._constrained_sampler(
+            lottery_type, numbers_count, fixed_numbers, filters
+        ).count
+    
+    @staticmethod
+    def sample_constrained(
+        lottery_type: str,
+        numbers_count: int,
+        games_count: int = 1,
+        fixed_numbers: Optional[List[int]] = None,
+        filters: Optional[Dict[str, any]] = None
+    ) -> List[List[int]]:
+        """
+        Sample distinct games exactly uniformly among those passing the filters.
+        
+        Walks DP count tables instead of rejecting random games, so it works
+        for lotteries too large to enumerate (Mega-Sena, Quina).
+        
+        Args:
+            lottery_type: Type of lottery
+            numbers_count: Numbers per game
+            games_count: How many games to generate
+            fixed_numbers: Numbers that must appear in every game
+            filters: CountingFilters fields (sum, odd and run bounds, exclusions)
+            
+        Returns:
+            List of combinations; shorter than games_count when fewer games match
+        """
+        sampler = CombinationGeneratorService._constrained_sampler(
+            lottery_type, numbers_count, fixed_numbers, filters
+        )
+        return sampler.sample(games_count).tolist()
+    
     @staticmethod
     def validate_combination(
         lottery_type: str,
@@ -269,6 +569,190 @@ class CombinationGeneratorService:
         }
 
 
+# Solved designs depend only on (v, k, m, t), so they are shared by every lottery
+wheel_cache = WheelCache(time_budget=settings.WHEEL_TIME_BUDGET_SECONDS)
+
+
+class WheelGeneratorService:
+    """Service for generating reduced wheels (fechamentos)."""
+    
+    @staticmethod
+    def generate_wheel(
+        lottery_type: str,
+        numbers: List[int],
+        guarantee: int,
+        if_drawn: Optional[int] = None,
+        numbers_per_game: Optional[int] = None
+    ) -> Dict[str, any]:
+        """
+        Build the smallest set of games found with a hit guarantee.
+        
+        Whenever ``if_drawn`` of the drawn numbers are among ``numbers``, at
+        least one game hits ``guarantee`` of them. Designs are solved by a
+        greedy set-cover solver and cached per (v, k, m, t).
+        
+        Args:
+            lottery_type: Type of lottery
+            numbers: Chosen numbers to wheel
+            guarantee: Minimum hits guaranteed
+            if_drawn: Drawn numbers assumed inside the chosen ones
+                (default: every drawn number, capped at len(numbers))
+            numbers_per_game: Numbers per game (default: numbers_to_pick)
+            
+        Returns:
+            Dictionary with the games and solver metadata
+        """
+        history = get_draw_history(lottery_type)
+        min_bet = history.min_bet_numbers or history.numbers_to_pick
+        max_bet = history.max_bet_numbers or history.numbers_to_pick
+        
+        numbers_per_game = numbers_per_game or history.numbers_to_pick
+        if_drawn = if_drawn or min(history.numbers_to_pick, len(numbers))
+        
+        if len(numbers) != len(set(numbers)):
+            raise ValueError('Números duplicados encontrados')
+        invalid = [n for n in numbers if n < 1 or n > history.total_numbers]
+        if invalid:
+            raise ValueError(f'Números fora do intervalo válido (1-{history.total_numbers}): {invalid}')
+        if not min_bet <= numbers_per_game <= max_bet:
+            raise ValueError(f'Jogos de {numbers_per_game} números não são permitidos')
+        if if_drawn > history.numbers_to_pick:
+            raise ValueError(f'Apenas {history.numbers_to_pick} números são sorteados')
+        
+        design, cached = wheel_cache.get(len(numbers), numbers_per_game, if_drawn, guarantee)
+        games = design.games(numbers)
+        
+        return {
+            'lottery_type': lottery_type,
+            'numbers': sorted(numbers),
+            'combinations': games,
+            'numbers_per_game': numbers_per_game,
+            'total_games': len(games),
+            'guarantee': guarantee,
+            'if_drawn': if_drawn,
+            'complete': design.complete,
+            'cached': cached,
+        }
+
+
+class BacktestService:
+    """Service for backtesting generation strategies over the draw history."""
+    
+    @staticmethod
+    def run_backtest(
+        lottery_type: str,
+        numbers_count: Optional[int] = None,
+        games_per_contest: int = 10,
+        strategies: Optional[List[str]] = None,
+        warmup: int = 1,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, any]:
+        """
+        Score each strategy's games against the draw that followed.
+        
+        Statistics are replayed contest by contest, so every game only uses
+        what was known before the draw it is checked against.
+        
+        Args:
+            lottery_type: Type of lottery
+            numbers_count: Numbers per game (default: numbers_to_pick)
+            games_per_contest: Games each strategy plays per contest
+            strategies: Strategy names (default: all of STRATEGIES)
+            warmup: Draws known before the first game is played
+            seed: Seed for a reproducible run
+            workers: Chunks run at once on the shared processes (default: settings.BACKTEST_WORKERS)
+            
+        Returns:
+            Dictionary with the run parameters and per-strategy histograms
+        """
+        history = get_draw_history(lottery_type)
+        min_bet = history.min_bet_numbers or history.numbers_to_pick
+        max_bet = history.max_bet_numbers or history.numbers_to_pick
+        
+        numbers_count = numbers_count or history.numbers_to_pick
+        if not min_bet <= numbers_count <= max_bet:
+            raise ValueError(f'Jogos de {numbers_count} números não são permitidos')
+        
+        result = run_backtest(
+            history.contest_numbers,
+            history.matrix,
+            numbers_count,
+            games_per_contest=games_per_contest,
+            strategies=strategies or STRATEGIES,
+            seed=seed,
+            warmup=warmup,
+            workers=workers or settings.BACKTEST_WORKERS,
+        )
+        
+        return {
+            'lottery_type': lottery_type,
+            'numbers_count': numbers_count,
+            'games_per_contest': games_per_contest,
+            'contests': result['steps'],
+            'first_contest': result['first_contest'],
+            'last_contest': result['last_contest'],
+            'seed': result['seed'],
+            'strategies': summarize_backtest(lottery_type, result),
+        }
+
+
+class SimulationService:
+    """Service for Monte Carlo prize simulations."""
+    
+    @staticmethod
+    def simulate(
+        lottery_type: str,
+        combinations: List[List[int]],
+        draws: int = 1_000_000,
+        seed: Optional[int] = None,
+        prize_values: Optional[Dict[str, float]] = None,
+        ticket_cost: Optional[float] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, any]:
+        """
+        Score a ticket set (e.g. a bolão) against synthetic uniform draws.
+        
+        Args:
+            lottery_type: Type of lottery
+            combinations: Tickets to evaluate
+            draws: Synthetic contests to simulate
+            seed: Seed for a reproducible run
+            prize_values: Prize per winning ticket, by tier name
+            ticket_cost: Cost of the whole ticket set per contest
+            workers: Chunks run at once on the shared processes (default: settings.SIMULATION_WORKERS)
+            
+        Returns:
+            Dictionary with hit histograms, tier odds and estimated returns
+        """
+        history = get_draw_history(lottery_type)
+        min_bet = history.min_bet_numbers or history.numbers_to_pick
+        max_bet = history.max_bet_numbers or history.numbers_to_pick
+        
+        for numbers in combinations:
+            if len(numbers) != len(set(numbers)):
+                raise ValueError(f'Números duplicados encontrados: {numbers}')
+            if any(n < 1 or n > history.total_numbers for n in numbers):
+                raise ValueError(f'Números fora do intervalo válido (1-{history.total_numbers}): {numbers}')
+            if not min_bet <= len(numbers) <= max_bet:
+                raise ValueError(f'Jogos de {len(numbers)} números não são permitidos')
+        
+        result = simulate_draws(
+            combinations,
+            history.total_numbers,
+            history.numbers_to_pick,
+            draws,
+            seed=seed,
+            workers=workers or settings.SIMULATION_WORKERS,
+        )
+        
+        return {
+            'lottery_type': lottery_type,
+            'total_tickets': len(combinations),
+            **summarize_simulation(lottery_type, result, prize_values, ticket_cost),
+        }
+
+
 class ResultCheckerService:
     """Service for checking combinations against draw results."""
     
@@ -289,46 +773,291 @@ class ResultCheckerService:
         Returns:
             Dictionary with check results
         """
-        if contest_number:
-            draw = Draw.objects.filter(
-                lottery_type=lottery_type,
-                contest_number=contest_number
-            ).first()
-        else:
-            draw = Draw.objects.filter(
-                lottery_type=lottery_type
-            ).order_by('-contest_number').first()
+        try:
+            history = get_draw_history(lottery_type)
+        except LotteryConfiguration.DoesNotExist:
+            history = None
         
-        if not draw:
+        index = history.index_of(contest_number or None) if history is not None else None
+        
+        if index is None:
             return {
                 'found': False,
                 'message': 'Nenhum sorteio encontrado'
             }
         
-        drawn_numbers = set(draw.get_numbers_display())
-        user_numbers = set(numbers)
-        matches = drawn_numbers & user_numbers
+        # Popcount of the AND of both bitmasks
+        matches = decode_mask(history.mask(index) & encode_mask(numbers))
+        # Bets above the base game are scored as all their sub-games, in closed form
+        bet_size = len(set(numbers))
+        sub_game_tiers = score_bet(lottery_type, bet_size, len(matches), history.numbers_to_pick)
         
         return {
             'found': True,
-            'contest_number': draw.contest_number,
-            'draw_date': draw.draw_date,
-            'drawn_numbers': sorted(list(drawn_numbers)),
-            'user_numbers': sorted(list(user_numbers)),
-            'matches': sorted(list(matches)),
+            'contest_number': int(history.contest_numbers[index]),
+            'draw_date': history.draw_date(index),
+            'drawn_numbers': history.drawn_numbers(index),
+            'user_numbers': sorted(set(numbers)),
+            'matches': matches,
             'match_count': len(matches),
-            'is_winner': ResultCheckerService._is_winner(lottery_type, len(matches))
+            'is_winner': any(sub_game_tiers.values()),
+            'sub_game_tiers': sub_game_tiers if bet_size > history.numbers_to_pick else None,
         }
     
     @staticmethod
-    def _is_winner(lottery_type: str, match_count: int) -> bool:
-        """Determine if match count is a winning combination."""
-        # Simplified logic - would need actual prize tiers
-        winning_thresholds = {
-            'MEGA_SENA': 4,      # Quadra, Quina, Sena
-            'LOTOFACIL': 11,     # 11, 12, 13, 14, 15
-            'QUINA': 2,          # Duque, Terno, Quadra, Quina
-            'DUPLA_SENA': 3,     # Terno, Quadra, Quina, Sena
-            'SUPER_SETE': 3,     # 3+ columns
+    def check_batch(
+        lottery_type: str,
+        combinations: List[List[int]],
+        contest_number: Optional[int] = None
+    ) -> Dict[str, any]:
+        """
+        Check many combinations against a single draw.
+        
+        The draw is looked up once; hit counts come from a vectorized
+        popcount of each ticket's bitmask AND the draw's bitmask.
+        
+        Args:
+            lottery_type: Type of lottery
+            combinations: Tickets to check
+            contest_number: Specific contest to check (None = latest)
+            
+        Returns:
+            Dictionary with per-ticket hits and hit/prize tier histograms
+        """
+        try:
+            history = get_draw_history(lottery_type)
+        except LotteryConfiguration.DoesNotExist:
+            history = None
+        
+        index = history.index_of(contest_number or None) if history is not None else None
+        
+        if index is None:
+            return {
+                'found': False,
+                'message': 'Nenhum sorteio encontrado'
+            }
+        
+        hits = count_hits(masks_from_numbers(combinations), history.masks[index])
+        max_hits = max(history.numbers_to_pick, int(hits.max(initial=0)))
+        
+        return {
+            'found': True,
+            'contest_number': int(history.contest_numbers[index]),
+            'draw_date': history.draw_date(index),
+            'drawn_numbers': history.drawn_numbers(index),
+            'total_tickets': len(combinations),
+            'hits': hits.tolist(),
+            **summarize_hits(lottery_type, hits, max_hits)
+        }
+    
+    @staticmethod
+    def check_history(
+        lottery_type: str,
+        combinations: List[List[int]]
+    ) -> Dict[str, any]:
+        """
+        Check combinations against every draw in the lottery's history.
+        
+        All tickets are scored against all draws in one vectorized pass over
+        the in-memory snapshot, without touching the database per draw.
+        
+        Args:
+            lottery_type: Type of lottery
+            combinations: Tickets to check
+            
+        Returns:
+            Dictionary with, per ticket, the hit histogram, the contests that
+            reached a prize tier and the best result
+        """
+        history = get_draw_history(lottery_type)
+        tiers = prize_tiers(lottery_type)
+        
+        # (draws, tickets) hit matrix
+        hits = count_hits(masks_from_numbers(combinations), history.masks)
+        
+        results = []
+        for ticket, numbers in enumerate(combinations):
+            ticket_hits = hits[:, ticket]
+            max_hits = max(history.numbers_to_pick, int(ticket_hits.max(initial=0)))
+            summary = summarize_history(lottery_type, history.contest_numbers, ticket_hits, max_hits)
+            summary['prize_contests'] = [
+                {
+                    'contest_number': int(history.contest_numbers[index]),
+                    'draw_date': history.draw_date(index),
+                    'hits': int(ticket_hits[index]),
+                    'tier': tiers[int(ticket_hits[index])],
+                }
+                for index in summary['prize_contests']
+                if int(ticket_hits[index]) in tiers
+            ]
+            results.append({'numbers': sorted(numbers), **summary})
+        
+        return {
+            'lottery_type': lottery_type,
+            'total_draws': len(history),
+            'results': results
+        }
+    
+    @staticmethod
+    def bet_odds(lottery_type: str, bet_size: Optional[int] = None) -> Dict[str, any]:
+        """
+        Exact per-tier odds of a bet from hypergeometric tables.
+        
+        Args:
+            lottery_type: Type of lottery
+            bet_size: Numbers in the bet (default: numbers_to_pick)
+            
+        Returns:
+            Dictionary with sub-game count, hit probabilities and per-tier odds
+        """
+        history = get_draw_history(lottery_type)
+        min_bet = history.min_bet_numbers or history.numbers_to_pick
+        max_bet = history.max_bet_numbers or history.numbers_to_pick
+        
+        bet_size = bet_size or history.numbers_to_pick
+        if not min_bet <= bet_size <= max_bet:
+            raise ValueError(f'Apostas de {bet_size} números não são permitidas')
+        
+        return {
+            'lottery_type': lottery_type,
+            **bet_odds(lottery_type, history.total_numbers, history.numbers_to_pick, bet_size),
+        }
+
+
+class ExportService:
+    """Service for bulk exports of draws and statistics."""
+    
+    # Model and export order of each dataset
+    DATASET_QUERIES = {
+        'draws': (Draw, 'contest_number'),
+        'statistics': (NumberStatistics, 'number'),
+    }
+    
+    @staticmethod
+    def export(
+        lottery_type: str,
+        dataset: str,
+        fmt: str,
+        chunk_rows: int = EXPORT_CHUNK_ROWS
+    ) -> Iterator[bytes]:
+        """
+        Stream a lottery's full draw history or statistics, one chunk at a time.
+        
+        Rows are read with ``iterator()`` (a server-side cursor on PostgreSQL)
+        and encoded as they arrive, so memory stays constant whatever the
+        history size.
+        
+        Args:
+            lottery_type: Type of lottery
+            dataset: 'draws' or 'statistics'
+            fmt: 'csv', 'ndjson', 'parquet' or 'arrow' (the last two need pyarrow)
+            chunk_rows: Rows fetched and encoded together
+            
+        Returns:
+            Iterator of encoded byte chunks
+        """
+        if dataset not in ExportService.DATASET_QUERIES:
+            raise ValueError(f'Conjunto de dados desconhecido: {dataset}')
+        
+        model, order = ExportService.DATASET_QUERIES[dataset]
+        columns = EXPORT_DATASETS[dataset]
+        rows = (
+            model.objects.filter(lottery_type=lottery_type)
+            .order_by(order)
+            .values_list(*(name for name, _ in columns))
+            .iterator(chunk_size=chunk_rows)
+        )
+        return export_chunks(rows, columns, fmt, chunk_rows)
+
+
+class DrawIngestService:
+    """Service for bulk loading official draw result files."""
+    
+    # Columns refreshed when a contest is already stored (a correction)
+    UPSERT_FIELDS = [
+        'draw_date', 'numbers', 'numbers_second_draw', 'prize_amount', 'winners_count',
+        'accumulated', 'next_estimated_prize', 'numbers_mask_low', 'numbers_mask_high', 'updated_at',
+    ]
+    
+    @staticmethod
+    def _upsert(lottery_type: str, draws: List[Dict]) -> None:
+        """Insert or update one batch of draws with a single statement."""
+        objects = []
+        for draw in draws:
+            low, high = encode_words(draw['numbers'])
+            objects.append(Draw(
+                lottery_type=lottery_type, numbers_mask_low=low, numbers_mask_high=high, **draw
+            ))
+        Draw.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=['lottery_type', 'contest_number'],
+            update_fields=DrawIngestService.UPSERT_FIELDS,
+        )
+    
+    @staticmethod
+    def ingest(
+        lottery_type: str,
+        stream: IO[bytes],
+        fmt: str = 'csv',
+        encoding: str = 'utf-8-sig',
+        strict: bool = True,
+        batch_rows: int = INGEST_BATCH_ROWS
+    ) -> Dict[str, any]:
+        """
+        Load a result file (CSV or XLSX) into the draws of a lottery.
+        
+        The file is parsed as a stream and validated in batches; each batch
+        is upserted with one INSERT ... ON CONFLICT, all inside a single
+        transaction. Statistics are then refreshed incrementally (or rebuilt
+        when the file corrects contests already counted).
+        
+        Args:
+            lottery_type: Type of lottery
+            stream: Binary file object
+            fmt: 'csv' or 'xlsx' (the latter needs openpyxl)
+            encoding: Text encoding of CSV files
+            strict: Reject the whole file when any row is invalid
+            batch_rows: Rows validated and upserted together
+            
+        Returns:
+            Dictionary with the rows read, draws loaded and row errors
+            
+        Raises:
+            IngestError: If the file is rejected (nothing is saved)
+        """
+        try:
+            config = LotteryConfiguration.objects.get(lottery_type=lottery_type)
+        except LotteryConfiguration.DoesNotExist:
+            raise ValueError(f'Loteria {lottery_type} não configurada')
+        
+        report = IngestReport()
+        loaded = []
+        with transaction.atomic():
+            try:
+                batches = iter_draw_batches(
+                    read_result_rows(stream, fmt, encoding),
+                    config.total_numbers,
+                    config.numbers_to_pick,
+                    report,
+                    batch_rows,
+                )
+                for batch in batches:
+                    DrawIngestService._upsert(lottery_type, batch)
+                    loaded.extend((draw['contest_number'], draw['numbers']) for draw in batch)
+            except (ValueError, UnicodeDecodeError) as e:
+                raise IngestError(str(e), report)
+            if strict and report.error_count:
+                raise IngestError(f'{report.error_count} linha(s) inválida(s); nada foi importado', report)
+        
+        invalidate_lottery(lottery_type)
+        # A contest may appear in several batches: the last row won the upsert
+        StatisticsService.apply_draws(lottery_type, list(dict(loaded).items()))
+        
+        return {
+            'lottery_type': lottery_type,
+            'rows': report.rows,
+            'loaded': len(dict(loaded)),
+            'error_count': report.error_count,
+            'errors': [{'line': line, 'message': message} for line, message in report.errors],
         }
-        return match_count >= winning_thresholds.get(lottery_type, 4)
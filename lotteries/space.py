@@ -0,0 +1,30 @@
+"""
+Access to the precomputed Lotofácil combination space.
+
+The space is built once by the ``build_combination_space`` management
+command and memory-mapped on first use; the mapping is shared by every
+request of the process.
+"""
+from functools import lru_cache
+from django.conf import settings
+from lottery_engine import CombinationSpace
+
+
+@lru_cache(maxsize=None)
+def _open_space(directory: str) -> CombinationSpace:
+    return CombinationSpace.open(directory)
+
+
+def get_combination_space() -> CombinationSpace:
+    """
+    Return the memory-mapped combination space.
+
+    Raises:
+        ValueError: If the space has not been built yet
+    """
+    try:
+        return _open_space(str(settings.COMBINATION_SPACE_DIR))
+    except FileNotFoundError:
+        raise ValueError(
+            'Espaço de combinações não encontrado; execute `manage.py build_combination_space`'
+        )
@@ -1,3 +1,554 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from lottery_engine import IngestError
+# Redis stand-in from the backend test tree (backend/ is on sys.path)
+from tests.local_redis import LocalRedisServer
+
+from .history import draw_histories
+from .models import Draw, LotteryConfiguration, LotteryType, NumberStatistics
+from .services import (
+    BacktestService,
+    CombinationGeneratorService,
+    DrawIngestService,
+    ExportService,
+    ResultCheckerService,
+    SimulationService,
+    StatisticsService,
+    WheelGeneratorService,
+)
+
+
+class LotteryTestCase(TestCase):
+    """Base test case with a small Lotofácil-like history."""
+
+    lottery_type = LotteryType.LOTOFACIL
+
+    @classmethod
+    def setUpTestData(cls):
+        LotteryConfiguration.objects.create(
+            lottery_type=cls.lottery_type,
+            total_numbers=25,
+            numbers_to_pick=15,
+            min_bet_numbers=15,
+            max_bet_numbers=20,
+        )
+        cls.history = {
+            1: list(range(1, 16)),
+            2: list(range(11, 26)),
+            4: list(range(1, 11)) + [21, 22, 23, 24, 25],
+        }
+        for contest, numbers in cls.history.items():
+            cls.create_draw(contest, numbers)
+
+    def setUp(self):
+        # Test transactions roll back without signals; start from a fresh snapshot
+        draw_histories.invalidate()
+        cache.clear()
+
+    @classmethod
+    def create_draw(cls, contest_number, numbers):
+        return Draw.objects.create(
+            lottery_type=cls.lottery_type,
+            contest_number=contest_number,
+            draw_date=date(2024, 1, 1) + timedelta(days=contest_number),
+            numbers=numbers,
+        )
+
+
+class StatisticsServiceTests(LotteryTestCase):
+
+    def test_calculate_statistics(self):
+        StatisticsService.calculate_statistics(self.lottery_type)
+
+        stats = {s.number: s for s in NumberStatistics.objects.filter(lottery_type=self.lottery_type)}
+        self.assertEqual(len(stats), 25)
+
+        # Drawn in 1 and 4
+        self.assertEqual(stats[1].frequency, 2)
+        self.assertEqual(stats[1].last_draw_contest, 4)
+        self.assertEqual(stats[1].delay, 0)
+        self.assertEqual(stats[1].max_delay, 3)
+        self.assertEqual(stats[1].average_delay, 3.0)
+
+        # Drawn in 1 and 2
+        self.assertEqual(stats[11].frequency, 2)
+        self.assertEqual(stats[11].delay, 2)
+        self.assertEqual(stats[11].max_delay, 1)
+
+        # Drawn in 2 and 4
+        self.assertEqual(stats[25].frequency, 2)
+        self.assertEqual(stats[25].average_delay, 2.0)
+
+    def test_apply_draw_matches_full_rebuild(self):
+        StatisticsService.calculate_statistics(self.lottery_type)
+
+        draw = self.create_draw(5, list(range(6, 21)))
+        StatisticsService.apply_draw(draw)
+
+        self.assertEqual(StatisticsService.verify_statistics(self.lottery_type), [])
+        stat = NumberStatistics.objects.get(lottery_type=self.lottery_type, number=11)
+        self.assertEqual(stat.frequency, 3)
+        self.assertEqual(stat.max_delay, 3)
+        self.assertEqual(stat.gap_count, 2)
+
+    def test_apply_draw_rebuilds_on_correction(self):
+        StatisticsService.calculate_statistics(self.lottery_type)
+
+        draw = Draw.objects.get(lottery_type=self.lottery_type, contest_number=2)
+        draw.numbers = list(range(1, 16))
+        draw.save()
+        StatisticsService.apply_draw(draw)
+
+        self.assertEqual(StatisticsService.verify_statistics(self.lottery_type), [])
+
+    def test_get_statistics_is_written_through(self):
+        StatisticsService.calculate_statistics(self.lottery_type)
+
+        # Published by the recompute: no query on read
+        with self.assertNumQueries(0):
+            stats = StatisticsService.get_statistics(self.lottery_type)
+        self.assertEqual([s.number for s in stats], list(range(1, 26)))
+        self.assertEqual(stats[0].frequency, 2)
+
+        StatisticsService.apply_draw(self.create_draw(5, list(range(1, 16))))
+        with self.assertNumQueries(0):
+            self.assertEqual(StatisticsService.get_statistics(self.lottery_type)[0].frequency, 3)
+
+    def test_get_statistics_builds_once_on_miss(self):
+        StatisticsService.calculate_statistics(self.lottery_type)
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            StatisticsService.get_statistics(self.lottery_type)
+            StatisticsService.get_statistics(self.lottery_type)
+
+
+class SharedCacheTests(LotteryTestCase):
+    """Statistics cache on Redis, against the in-process stand-in server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.redis = LocalRedisServer().start()
+        cls.redis_settings = override_settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                'LOCATION': cls.redis.url,
+                'KEY_PREFIX': 'lotofacil',
+                'KEY_FUNCTION': 'lottery_engine.cache.make_cache_key',
+            }
+        })
+        cls.redis_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.redis_settings.disable()
+        cls.redis.stop()
+
+    def test_recompute_is_visible_to_other_workers(self):
+        from .services import VersionedCache
+
+        StatisticsService.calculate_statistics(self.lottery_type)
+
+        # A second worker only shares the Redis server, not this process' locks
+        other_worker = VersionedCache(cache, namespace='stats')
+        self.assertIsNotNone(other_worker.get_or_build(self.lottery_type, self.fail))
+
+        with self.assertNumQueries(0):
+            stats = StatisticsService.get_statistics(self.lottery_type)
+        self.assertEqual(len(stats), 25)
+        self.assertEqual(stats[0].frequency, 2)
+        self.assertIsNotNone(stats[0].last_updated)
+
+    def test_django_writes_are_visible_to_the_async_store(self):
+        import asyncio
+        from redis.asyncio import Redis
+        from lottery_engine import AsyncRedisStore, AsyncVersionedCache, unpack_rows, validators_key
+        from .history import invalidate_lottery
+
+        StatisticsService.calculate_statistics(self.lottery_type)
+
+        async def read():
+            store = AsyncRedisStore(Redis.from_url(self.redis.url), prefix='lotofacil')
+            try:
+                stats = await AsyncVersionedCache(store, namespace='stats').get_or_build(
+                    self.lottery_type, self.fail
+                )
+                return stats, await store.get(validators_key(self.lottery_type))
+            finally:
+                await store.close()
+
+        # The FastAPI side reads the version counter and rows Django published
+        packed, validators = asyncio.run(read())
+        self.assertEqual(len(unpack_rows(packed)), 25)
+        self.assertIsNotNone(validators)
+
+        # ... and sees Django's invalidation
+        invalidate_lottery(self.lottery_type)
+        self.assertIsNone(asyncio.run(read())[1])
+
+
+class ConditionalGetTests(LotteryTestCase):
+    """ETag / Last-Modified revalidation of the read views."""
+
+    def url(self, name='lotteries:statistics'):
+        return reverse(name, kwargs={'lottery_type': self.lottery_type})
+
+    def test_unchanged_data_is_not_modified_without_queries(self):
+        StatisticsService.calculate_statistics(self.lottery_type)
+
+        response = self.client.get(self.url())
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertIn('-4-', etag)
+
+        for name in ('lotteries:statistics', 'lotteries:draws', 'lotteries:dashboard'):
+            with self.assertNumQueries(0):
+                response = self.client.get(self.url(name), HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get(self.url(), HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_draw_changes_the_etag(self):
+        StatisticsService.calculate_statistics(self.lottery_type)
+        etag = self.client.get(self.url())['ETag']
+
+        # Saved but not yet counted: validators are dropped, pages render in full
+        draw = self.create_draw(5, list(range(1, 16)))
+        response = self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+        StatisticsService.apply_draw(draw)
+        response = self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('-5-', response['ETag'])
+
+class DrawListViewTests(LotteryTestCase):
+    """Cursor pagination of the results page."""
+
+    def get_page(self, cursor=None):
+        from unittest import mock
+        from .views import DrawListView
+
+        url = reverse('lotteries:draws', kwargs={'lottery_type': self.lottery_type})
+        with mock.patch.object(DrawListView, 'paginate_by', 2), CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'cursor': cursor} if cursor else {})
+        self.assertEqual(response.status_code, 200)
+        # Range scan only: no COUNT(*) and no OFFSET
+        sql = ' '.join(query['sql'] for query in queries).upper()
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('OFFSET', sql)
+        return [d.contest_number for d in response.context['draws']], response.context['page_obj']
+
+    def test_walks_pages_by_cursor(self):
+        contests, first = self.get_page()
+        self.assertEqual(contests, [4, 2])
+        self.assertFalse(first.has_previous)
+
+        contests, second = self.get_page(first.next_cursor)
+        self.assertEqual(contests, [1])
+        self.assertFalse(second.has_next)
+
+        contests, back = self.get_page(second.prev_cursor)
+        self.assertEqual(contests, [4, 2])
+        self.assertFalse(back.has_previous)
+
+    def test_invalid_cursor_is_not_found(self):
+        url = reverse('lotteries:draws', kwargs={'lottery_type': self.lottery_type})
+        self.assertEqual(self.client.get(url, {'cursor': 'nope'}).status_code, 404)
+
+class ExportServiceTests(LotteryTestCase):
+
+    def test_exports_draws_in_contest_order(self):
+        data = b''.join(ExportService.export(self.lottery_type, 'draws', 'csv', chunk_rows=2))
+        rows = list(csv.DictReader(io.StringIO(data.decode())))
+        self.assertEqual([int(row['contest_number']) for row in rows], [1, 2, 4])
+        self.assertEqual(rows[0]['numbers'], ' '.join(map(str, self.history[1])))
+
+    def test_export_command_writes_every_lottery(self):
+        StatisticsService.calculate_statistics(self.lottery_type)
+        with tempfile.TemporaryDirectory() as directory:
+            call_command('export_data', format='ndjson', output=directory, stdout=io.StringIO())
+            files = {path.name for path in Path(directory).iterdir()}
+            self.assertEqual(len(files), 2 * len(LotteryType.choices))
+            lines = (Path(directory) / 'lotofacil_statistics.ndjson').read_text().splitlines()
+            self.assertEqual([json.loads(line)['number'] for line in lines], list(range(1, 26)))
+            self.assertEqual((Path(directory) / 'quina_draws.ndjson').read_text(), '')
+
+class DrawIngestServiceTests(LotteryTestCase):
+    """Bulk loading of official result files."""
+
+    HEADER = ['Concurso', 'Data Sorteio'] + [f'Bola{i}' for i in range(1, 16)] + [
+        'Ganhadores 15 acertos', 'Rateio 15 acertos', 'Acumulado 15 acertos',
+    ]
+
+    def result_file(self, rows):
+        lines = [';'.join(self.HEADER)]
+        for contest, numbers, *extra in rows:
+            day = date(2024, 1, 1) + timedelta(days=contest)
+            lines.append(';'.join(
+                [str(contest), day.strftime('%d/%m/%Y')] + [f'{n:02d}' for n in numbers]
+                + (extra or ['1', 'R$1.234.567,89', 'NÃO'])
+            ))
+        return io.BytesIO('\n'.join(lines).encode('utf-8'))
+
+    def test_new_contests_are_loaded_and_counted_incrementally(self):
+        StatisticsService.calculate_statistics(self.lottery_type)
+        result = DrawIngestService.ingest(self.lottery_type, self.result_file([
+            (5, list(range(6, 21))),
+            (6, list(range(11, 26)), '0', '0,00', 'SIM'),
+        ]))
+
+        self.assertEqual((result['rows'], result['loaded'], result['error_count']), (2, 2, 0))
+        draw = Draw.objects.get(lottery_type=self.lottery_type, contest_number=5)
+        self.assertEqual(draw.numbers, list(range(6, 21)))
+        self.assertEqual(str(draw.prize_amount), '1234567.89')
+        self.assertFalse(draw.accumulated)
+        self.assertTrue(Draw.objects.get(lottery_type=self.lottery_type, contest_number=6).accumulated)
+        self.assertEqual(list(Draw.objects.containing([6, 20]).values_list('contest_number', flat=True)), [5])
+
+        self.assertEqual(StatisticsService.verify_statistics(self.lottery_type), [])
+        self.assertEqual(StatisticsService.get_statistics(self.lottery_type)[10].frequency, 4)
+
+    def test_corrections_update_in_place_and_rebuild_statistics(self):
+        StatisticsService.calculate_statistics(self.lottery_type)
+        DrawIngestService.ingest(self.lottery_type, self.result_file([(2, list(range(1, 16)))]))
+
+        self.assertEqual(Draw.objects.filter(lottery_type=self.lottery_type).count(), 3)
+        draw = Draw.objects.get(lottery_type=self.lottery_type, contest_number=2)
+        self.assertEqual(draw.numbers, list(range(1, 16)))
+        self.assertEqual(StatisticsService.verify_statistics(self.lottery_type), [])
+        self.assertEqual(StatisticsService.get_statistics(self.lottery_type)[0].frequency, 3)
+
+    def test_invalid_rows_reject_the_file(self):
+        rows = [(5, list(range(6, 21))), (6, list(range(1, 15)) + [26])]
+        with self.assertRaises(IngestError) as raised:
+            DrawIngestService.ingest(self.lottery_type, self.result_file(rows))
+        self.assertEqual(raised.exception.report.errors[0][0], 3)
+        self.assertFalse(Draw.objects.filter(contest_number=5).exists())
+
+        result = DrawIngestService.ingest(self.lottery_type, self.result_file(rows), strict=False)
+        self.assertEqual((result['loaded'], result['error_count']), (1, 1))
+        self.assertTrue(Draw.objects.filter(contest_number=5).exists())
+
+    def test_full_history_loads_in_a_few_statements(self):
+        import random
+
+        rng = random.Random(1)
+        rows = [(contest, sorted(rng.sample(range(1, 26), 15))) for contest in range(1, 3201)]
+        with CaptureQueriesContext(connection) as queries:
+            result = DrawIngestService.ingest(self.lottery_type, self.result_file(rows))
+        self.assertEqual(result['loaded'], 3200)
+        # Batched statements, not one per contest (SQLite caps a statement at 999 parameters)
+        self.assertLess(len(queries), len(rows) // 25)
+        self.assertEqual(StatisticsService.verify_statistics(self.lottery_type), [])
+
+    def test_import_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'lotofacil.csv'
+            path.write_bytes(self.result_file([(5, list(range(6, 21)))]).getvalue())
+            out = io.StringIO()
+            call_command('import_draws', self.lottery_type, str(path), stdout=out)
+        self.assertIn('1 concursos importados', out.getvalue())
+        self.assertTrue(Draw.objects.filter(contest_number=5).exists())
+
+class DrawMaskTests(LotteryTestCase):
+
+    def test_masks_are_maintained_on_save(self):
+        draw = Draw.objects.get(lottery_type=self.lottery_type, contest_number=2)
+        self.assertEqual(draw.numbers_mask, sum(1 << (n - 1) for n in range(11, 26)))
+
+        draw.numbers = [1, 2, 3]
+        draw.save(update_fields=['numbers'])
+        draw.refresh_from_db()
+        self.assertEqual(draw.numbers_mask, 0b111)
+
+    def test_containing_filters_with_bitwise_and(self):
+        contests = Draw.objects.filter(lottery_type=self.lottery_type).containing([7, 13])
+        self.assertEqual(sorted(d.contest_number for d in contests), [1])
+
+        contests = Draw.objects.filter(lottery_type=self.lottery_type).containing([21, 25])
+        self.assertEqual(sorted(d.contest_number for d in contests), [2, 4])
+
+
+class ResultCheckerServiceTests(LotteryTestCase):
+
+    def test_check_latest_and_specific_contest(self):
+        result = ResultCheckerService.check_combination(self.lottery_type, list(range(1, 16)))
+        self.assertTrue(result['found'])
+        self.assertEqual(result['contest_number'], 4)
+        self.assertEqual(result['match_count'], 10)
+
+        result = ResultCheckerService.check_combination(self.lottery_type, list(range(1, 16)), 2)
+        self.assertEqual(result['matches'], [11, 12, 13, 14, 15])
+        self.assertFalse(result['is_winner'])
+
+        result = ResultCheckerService.check_combination(self.lottery_type, list(range(1, 16)), 3)
+        self.assertFalse(result['found'])
+
+    def test_multi_number_bet_scores_sub_games(self):
+        # 20 numbers, 11 of them drawn in contest 4
+        numbers = list(range(1, 11)) + list(range(12, 22))
+        result = ResultCheckerService.check_combination(self.lottery_type, numbers, 4)
+
+        self.assertEqual(result['match_count'], 11)
+        self.assertTrue(result['is_winner'])
+        self.assertEqual(result['sub_game_tiers']['11 acertos'], 126)  # C(9, 4) misses
+        self.assertEqual(result['sub_game_tiers']['12 acertos'], 0)
+
+    def test_bet_odds(self):
+        odds = ResultCheckerService.bet_odds(self.lottery_type, 20)
+
+        self.assertEqual(odds['sub_games'], 15504)
+        self.assertAlmostEqual(odds['tiers']['15 acertos']['one_in'], 3268760 / 15504)
+        with self.assertRaises(ValueError):
+            ResultCheckerService.bet_odds(self.lottery_type, 21)
+
+    def test_check_batch(self):
+        result = ResultCheckerService.check_batch(
+            self.lottery_type, [list(range(11, 26)), list(range(1, 16))], 2
+        )
+        self.assertEqual(result['hits'], [15, 5])
+        self.assertEqual(result['prize_tiers']['15 acertos'], 1)
+        self.assertEqual(result['winners'], 1)
+
+    def test_check_history(self):
+        result = ResultCheckerService.check_history(self.lottery_type, [list(range(1, 16))])
+        self.assertEqual(result['total_draws'], 3)
+
+        ticket = result['results'][0]
+        self.assertEqual(ticket['hit_histogram'][15], 1)
+        self.assertEqual(ticket['hit_histogram'][10], 1)
+        self.assertEqual(ticket['best_hits'], 15)
+        self.assertEqual(ticket['best_contests'], [1])
+        self.assertEqual([c['contest_number'] for c in ticket['prize_contests']], [1])
+
+    def test_new_draw_invalidates_snapshot(self):
+        ResultCheckerService.check_combination(self.lottery_type, list(range(1, 16)))
+        self.create_draw(5, list(range(1, 16)))
+
+        result = ResultCheckerService.check_combination(self.lottery_type, list(range(1, 16)))
+        self.assertEqual(result['contest_number'], 5)
+        self.assertEqual(result['match_count'], 15)
+
+
+class CombinationGeneratorServiceTests(LotteryTestCase):
+
+    def test_generate_with_fixed_numbers(self):
+        games = CombinationGeneratorService.generate_combinations(
+            self.lottery_type, 15, games_count=5, fixed_numbers=[1, 2, 3]
+        )
+        self.assertEqual(len(games), 5)
+        for game in games:
+            self.assertEqual(len(game), 15)
+            self.assertTrue({1, 2, 3} <= set(game))
+
+    def test_space_mode_only_covers_fifteen_number_games(self):
+        with self.assertRaises(ValueError):
+            CombinationGeneratorService.generate_combinations(
+                self.lottery_type, 16, mode='space'
+            )
+
+    def test_weighted_mode(self):
+        games = CombinationGeneratorService.generate_combinations(
+            self.lottery_type, 15, games_count=10, fixed_numbers=[7], mode='weighted', weighting='delay'
+        )
+        self.assertEqual(len(games), 10)
+        for game in games:
+            self.assertEqual(len(set(game)), 15)
+            self.assertIn(7, game)
+
+
+class ConstrainedSamplerServiceTests(LotteryTestCase):
+
+    def test_count_and_sample_under_filters(self):
+        filters = {'min_sum': 180, 'max_sum': 210, 'max_run': 4, 'excluded_numbers': [25]}
+        count = CombinationGeneratorService.count_combinations(self.lottery_type, 15, [1], filters)
+        games = CombinationGeneratorService.generate_combinations(
+            self.lottery_type, 15, 30, fixed_numbers=[1], mode='constrained', filters=filters,
+        )
+
+        self.assertGreater(count, 30)
+        self.assertEqual(len({tuple(game) for game in games}), 30)
+        for game in games:
+            self.assertTrue(180 <= sum(game) <= 210)
+            self.assertIn(1, game)
+            self.assertNotIn(25, game)
+
+    def test_rejects_unsupported_filters(self):
+        with self.assertRaises(ValueError):
+            CombinationGeneratorService.count_combinations(self.lottery_type, 15, filters={'min_primes': 3})
+
+
+class WheelGeneratorServiceTests(LotteryTestCase):
+
+    def test_generate_wheel(self):
+        numbers = list(range(3, 21))
+        result = WheelGeneratorService.generate_wheel(self.lottery_type, numbers, guarantee=14)
+
+        self.assertTrue(result['complete'])
+        self.assertLess(result['total_games'], 816)
+        for game in result['combinations']:
+            self.assertEqual(len(game), 15)
+            self.assertTrue(set(game) <= set(numbers))
+
+    def test_guarantee_cannot_exceed_game_size(self):
+        with self.assertRaises(ValueError):
+            WheelGeneratorService.generate_wheel(self.lottery_type, list(range(1, 19)), guarantee=16)
+
+
+class BacktestServiceTests(LotteryTestCase):
+
+    def test_frequent_strategy_scores_next_draw(self):
+        result = BacktestService.run_backtest(
+            self.lottery_type, numbers_count=20, games_per_contest=1,
+            strategies=['frequent'], workers=1,
+        )
+
+        self.assertEqual(result['contests'], 2)
+        self.assertEqual(result['first_contest'], 2)
+        # The 20 most frequent numbers hit 10 of the next draw both times
+        frequent = result['strategies']['frequent']
+        self.assertEqual(frequent['hit_histogram'][10], 2)
+        self.assertEqual(frequent['mean_hits'], 10.0)
+
+    def test_seed_makes_runs_reproducible(self):
+        first = BacktestService.run_backtest(self.lottery_type, seed=5, workers=1)
+        second = BacktestService.run_backtest(self.lottery_type, seed=5, workers=1)
+
+        self.assertEqual(first, second)
+
+
+class SimulationServiceTests(LotteryTestCase):
+
+    def test_simulate_ticket_set(self):
+        result = SimulationService.simulate(
+            self.lottery_type, [list(range(1, 16)), list(range(6, 22))],
+            draws=2000, seed=4, prize_values={'11 acertos': 6.0}, ticket_cost=51.0, workers=1,
+        )
+
+        self.assertEqual(result['total_tickets'], 2)
+        self.assertEqual(sum(result['hit_histogram'].values()), 4000)
+        self.assertEqual(sum(result['best_histogram'].values()), 2000)
+        self.assertIn('11 acertos', result['odds'])
+        self.assertGreater(result['expected_return'], 0)
+
+    def test_rejects_numbers_out_of_range(self):
+        with self.assertRaises(ValueError):
+            SimulationService.simulate(self.lottery_type, [list(range(12, 27))], draws=10)
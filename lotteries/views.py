@@ -1,9 +1,11 @@
 """
 Views for the lottery application.
 """
+from django.http import Http404
 from django.shortcuts import render, get_object_or_404
 from django.views.generic import ListView, DetailView, TemplateView
 from django.db.models import Count
+from lottery_engine import LAST_PAGE, decode_cursor, encode_cursor, keyset_page, scan_descending
 from .models import LotteryType, LotteryConfiguration, Draw, NumberStatistics
 
 
@@ -44,7 +46,7 @@ class LotteryDashboardView(DetailView):
 
 
 class DrawListView(ListView):
-    """List all draws for a lottery type."""
+    """List all draws for a lottery type, newest first, paginated by cursor."""
     model = Draw
     template_name = 'lotteries/draw_list.html'
     context_object_name = 'draws'
@@ -54,9 +56,33 @@ class DrawListView(ListView):
         lottery_type = self.kwargs.get('lottery_type')
         return Draw.objects.filter(lottery_type=lottery_type)
     
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Keyset pagination on (lottery_type, contest_number).
+        
+        Each page is an index range scan from the ``cursor`` query parameter,
+        so deep pages cost the same as the first and no COUNT(*) is run.
+        """
+        token = self.request.GET.get('cursor')
+        try:
+            cursor = decode_cursor(token) if token else None
+        except ValueError:
+            raise Http404('Página inválida')
+        
+        if scan_descending(cursor):
+            if cursor is not None:
+                queryset = queryset.filter(contest_number__lt=cursor.contest)
+            queryset = queryset.order_by('-contest_number')
+        else:
+            queryset = queryset.filter(contest_number__gt=cursor.contest).order_by('contest_number')
+        
+        page = keyset_page(list(queryset[:page_size + 1]), page_size, cursor)
+        return (None, page, page.items, page.has_next or page.has_previous)
+    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         lottery_type = self.kwargs.get('lottery_type')
+        context['last_page_cursor'] = encode_cursor(LAST_PAGE)
         context['lottery_config'] = get_object_or_404(
             LotteryConfiguration,
             lottery_type=lottery_type